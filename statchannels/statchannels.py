@@ -70,13 +70,20 @@ class StatChannels(commands.Cog):
     # ------------------------------------------------------------------ #
     # Stats + rendering
     # ------------------------------------------------------------------ #
-    @staticmethod
-    def _stats(guild: discord.Guild) -> dict:
-        humans = sum(1 for m in guild.members if not m.bot)
-        bots = sum(1 for m in guild.members if m.bot)
-        online = sum(
-            1 for m in guild.members if m.status is not discord.Status.offline and not m.bot
-        )
+    def _stats(self, guild: discord.Guild) -> dict:
+        # Counts from WebDashboardStats' presence tracker when that cog is loaded
+        # (no pass over all members); otherwise count here.
+        tracker = getattr(self.bot.get_cog("WebDashboardStats"), "presence", None)
+        if tracker is not None:
+            counts = tracker.get(guild).counts()
+            humans, bots = counts["humans"], counts["bots"]
+            online = counts["online"] + counts["idle"] + counts["dnd"]
+        else:
+            humans = sum(1 for m in guild.members if not m.bot)
+            bots = sum(1 for m in guild.members if m.bot)
+            online = sum(
+                1 for m in guild.members if m.status is not discord.Status.offline and not m.bot
+            )
         return {
             "members": guild.member_count or len(guild.members),
             "humans": humans,
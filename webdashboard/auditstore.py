@@ -0,0 +1,209 @@
+"""Append-only audit log store (SQLite in the cog's data folder).
+
+``append`` only queues the entry; a background task writes the queue in one
+transaction every ``flush_interval`` seconds (or as soon as ``batch_size``
+entries are waiting). All database work runs on one dedicated worker thread, so
+the event loop never blocks on disk I/O and the connection is never shared
+between threads.
+
+Retention is a row count: after each write, rows older than the newest
+``retention`` entries are deleted (a cheap range delete on the primary key).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger("red.dks.webdashboard.audit")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS audit ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " time REAL NOT NULL,"
+    " action TEXT NOT NULL,"
+    " user TEXT,"
+    " guild TEXT,"
+    " detail TEXT)",
+    "CREATE INDEX IF NOT EXISTS audit_time ON audit (time)",
+    "CREATE INDEX IF NOT EXISTS audit_user ON audit (user, id)",
+    "CREATE INDEX IF NOT EXISTS audit_guild ON audit (guild, id)",
+    "CREATE INDEX IF NOT EXISTS audit_action ON audit (action, id)",
+)
+
+
+class AuditStore:
+    def __init__(self, path: Path, *, retention: int = 50000,
+                 flush_interval: float = 2.0, batch_size: int = 200) -> None:
+        self.path = Path(path)
+        self.retention = int(retention)
+        self.flush_interval = float(flush_interval)
+        self.batch_size = int(batch_size)
+        self._pending: List[Tuple[float, str, Optional[str], Optional[str], str]] = []
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dks-audit")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+        self._task = asyncio.create_task(self._flusher())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        finally:
+            await self._run(self._close_sync)
+            self._executor.shutdown(wait=False)
+
+    def _open_sync(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            conn.execute(stmt)
+        conn.commit()
+        self._conn = conn
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Queues an audit entry (``{action, user, guild, detail, time}``)."""
+        self._pending.append(_row(entry))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Writes all queued entries (one transaction) and applies the retention."""
+        if not self._pending or self._conn is None:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await self._run(self._insert_sync, rows)
+        except Exception:
+            log.exception("Audit-Einträge konnten nicht geschrieben werden")
+            # keep them (ahead of newer entries) for the next flush
+            self._pending[:0] = rows
+
+    async def migrate(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Imports entries of the former Config ``audit_log`` list (oldest first)."""
+        rows = [_row(e) for e in entries if isinstance(e, dict)]
+        if rows:
+            await self._run(self._insert_sync, rows)
+        return len(rows)
+
+    def _insert_sync(self, rows: List[tuple]) -> None:
+        conn = self._conn
+        with conn:
+            conn.executemany(
+                "INSERT INTO audit (time, action, user, guild, detail) VALUES (?, ?, ?, ?, ?)", rows)
+            if self.retention > 0:
+                conn.execute(
+                    "DELETE FROM audit WHERE id <= (SELECT MAX(id) FROM audit) - ?", (self.retention,))
+
+    async def _flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    # ------------------------------------------------------------------ #
+    # Reading
+    # ------------------------------------------------------------------ #
+    async def query(self, *, limit: int = 200, cursor: Optional[str] = None,
+                    user: Optional[str] = None, guild: Optional[str] = None,
+                    action: Optional[str] = None, since: Optional[float] = None,
+                    until: Optional[float] = None) -> Dict[str, Any]:
+        """Newest-first page of entries.
+
+        ``cursor`` is the ``next_cursor`` of the previous page. Filters are exact
+        matches; ``action`` ending in ``*`` matches as prefix (e.g. ``slash.*``).
+        Returns ``{"entries", "next_cursor", "count"}`` (count = matching rows).
+        """
+        await self.flush()  # read-your-writes
+        where, args = [], []
+        if user:
+            where.append("user = ?"); args.append(str(user))
+        if guild:
+            where.append("guild = ?"); args.append(str(guild))
+        if action:
+            action = str(action)
+            if action.endswith("*"):
+                where.append("action >= ? AND action < ?")
+                prefix = action[:-1]
+                args += [prefix, prefix + "\uffff"]
+            else:
+                where.append("action = ?"); args.append(action)
+        if since is not None:
+            where.append("time >= ?"); args.append(float(since))
+        if until is not None:
+            where.append("time < ?"); args.append(float(until))
+        return await self._run(self._query_sync, where, args, int(limit), cursor)
+
+    def _query_sync(self, where: List[str], args: List[Any], limit: int,
+                    cursor: Optional[str]) -> Dict[str, Any]:
+        conn = self._conn
+        filt = " AND ".join(where) or "1"
+        count = conn.execute(f"SELECT COUNT(*) FROM audit WHERE {filt}", args).fetchone()[0]
+        page_where, page_args = list(where), list(args)
+        if cursor is not None and str(cursor).isdigit():
+            page_where.append("id < ?"); page_args.append(int(cursor))
+        rows = conn.execute(
+            "SELECT id, time, action, user, guild, detail FROM audit WHERE "
+            + (" AND ".join(page_where) or "1") + " ORDER BY id DESC LIMIT ?",
+            page_args + [limit + 1],
+        ).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        entries = []
+        for rid, t, action, user, guild, detail in rows:
+            try:
+                detail = json.loads(detail) if detail else {}
+            except ValueError:
+                detail = {}
+            entries.append({"id": rid, "time": t, "action": action,
+                            "user": user, "guild": guild, "detail": detail})
+        return {
+            "entries": entries,
+            "next_cursor": str(rows[-1][0]) if more and rows else None,
+            "count": count,
+        }
+
+
+def _row(entry: Dict[str, Any]) -> tuple:
+    user = entry.get("user")
+    guild = entry.get("guild")
+    return (
+        float(entry.get("time") or 0.0),
+        str(entry.get("action") or ""),
+        str(user) if user is not None else None,
+        str(guild) if guild is not None else None,
+        json.dumps(entry.get("detail") or {}, default=str),
+    )
@@ -0,0 +1,27 @@
+"""Loads gateway modules standalone (without Red/discord.py) for the benchmarks."""
+from __future__ import annotations
+
+import importlib
+import importlib.machinery
+import importlib.util
+import sys
+from pathlib import Path
+
+GATEWAY = Path(__file__).resolve().parent.parent / "gateway"
+
+
+_PACKAGE = "_dks_bench_gateway"
+
+
+def gateway_module(name: str):
+    """Imports ``gateway/<name>.py`` by path; only works for dependency-free modules.
+
+    The modules are loaded into a stand-in package, so relative imports between
+    dependency-free gateway modules (e.g. ``rpc`` -> ``limiter``) resolve.
+    """
+    if _PACKAGE not in sys.modules:
+        package = importlib.util.module_from_spec(
+            importlib.machinery.ModuleSpec(_PACKAGE, None, is_package=True))
+        package.__path__ = [str(GATEWAY)]
+        sys.modules[_PACKAGE] = package
+    return importlib.import_module(f"{_PACKAGE}.{name}")
@@ -0,0 +1,73 @@
+"""Benchmark: sequential vs. concurrent dispatch of a JSON-RPC batch.
+
+Simulates a stats page that batches 8 ``serverstats.*`` calls with different
+latencies and compares the wall-clock time of the old one-after-another loop
+with ``Dispatcher.dispatch_batch``. Run from the repo root::
+
+    python webdashboard/benchmarks/bench_batch.py
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from _load import gateway_module
+
+rpc = gateway_module("rpc")
+
+# method -> simulated handler latency in seconds
+LATENCIES = {
+    "serverstats.overview": 0.040,
+    "serverstats.messages": 0.080,
+    "serverstats.voice": 0.070,
+    "serverstats.heatmap": 0.120,
+    "serverstats.peaks": 0.030,
+    "serverstats.activity": 0.060,
+    "serverstats.commands": 0.050,
+    "serverstats.fail": 0.020,  # raises -> must not cancel its siblings
+}
+
+
+def _make_dispatcher() -> "rpc.Dispatcher":
+    d = rpc.Dispatcher()
+    for name, delay in LATENCIES.items():
+        async def handler(gateway, params, _delay=delay, _name=name):
+            await asyncio.sleep(_delay)
+            if _name.endswith("fail"):
+                raise rpc.RpcError(rpc.INVALID_PARAMS, "synthetic failure")
+            return {"method": _name}
+        d.register(name, handler)
+    return d
+
+
+def _batch():
+    return [{"jsonrpc": "2.0", "id": i, "method": m, "params": {}}
+            for i, m in enumerate(LATENCIES)]
+
+
+async def _sequential(d, batch):
+    return [r for r in [await d.dispatch(None, m) for m in batch] if r is not None]
+
+
+async def main(rounds: int = 5) -> None:
+    d = _make_dispatcher()
+    batch = _batch()
+    for label, run in (
+        ("sequential", lambda: _sequential(d, batch)),
+        ("concurrent (cap 8)", lambda: d.dispatch_batch(None, batch, concurrency=8)),
+        ("concurrent (cap 4)", lambda: d.dispatch_batch(None, batch, concurrency=4)),
+    ):
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            out = await run()
+            best = min(best, time.perf_counter() - t0)
+        ids = [r["id"] for r in out]
+        errors = sum(1 for r in out if "error" in r)
+        print(f"{label:<20} {best * 1000:7.1f} ms  responses={len(out)} errors={errors} ids={ids}")
+    print(f"{'sum of latencies':<20} {sum(LATENCIES.values()) * 1000:7.1f} ms")
+    print(f"{'max latency':<20} {max(LATENCIES.values()) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
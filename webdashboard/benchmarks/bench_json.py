@@ -0,0 +1,91 @@
+"""Benchmark: JSON encoders and compression on representative gateway payloads.
+
+Compares encode time of the stdlib ``json`` with orjson/ujson (whichever are
+installed) and shows the raw vs. gzip size of each payload. Run from the repo
+root::
+
+    python webdashboard/benchmarks/bench_json.py
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from _load import gateway_module
+
+jsonenc = gateway_module("jsonenc")
+
+ROUNDS = 50
+
+
+def _stats_payload() -> dict:
+    # serverstats.messages over 400 days: label array + several series
+    start = date(2025, 1, 1)
+    labels = [(start + timedelta(days=i)).isoformat() for i in range(400)]
+    return {
+        "labels": labels,
+        "series": {name: [random.randint(0, 5000) for _ in labels]
+                   for name in ("messages", "members", "voice_minutes", "joins")},
+        "top_channels": [{"id": str(10**17 + i), "name": f"channel-{i}", "value": random.randint(0, 10**5)}
+                         for i in range(25)],
+    }
+
+
+def _commands_payload() -> dict:
+    # core.commands of a bot with ~60 cogs
+    def entry(i: int) -> dict:
+        return {"name": f"cog{i % 60} command{i}", "description": "Does a thing " * 4,
+                "cog": f"Cog{i % 60}", "repo": "DKS_Redcogs", "category": "utility"}
+    return {"prefix": [entry(i) for i in range(900)],
+            "slash": [dict(entry(i), synced=True) for i in range(250)],
+            "counts": {"prefix": 900, "slash": 250}}
+
+
+def _rows_payload() -> dict:
+    # list.rows of a large managed list
+    return {"rows": [{"id": str(i), "cells": {"user": f"user{i}", "role": "Raider",
+                                              "joined": 1.7e9 + i, "note": "ok"}}
+                     for i in range(3000)],
+            "columns": [{"key": k, "label": k.title()} for k in ("user", "role", "joined", "note")]}
+
+
+def _encoders() -> dict:
+    encoders = {"json (stdlib)": json.dumps}
+    try:
+        import orjson
+        encoders["orjson"] = lambda o: orjson.dumps(o, option=orjson.OPT_NON_STR_KEYS).decode()
+    except ImportError:
+        pass
+    try:
+        import ujson
+        encoders["ujson"] = lambda o: ujson.dumps(o, escape_forward_slashes=False)
+    except ImportError:
+        pass
+    encoders[f"jsonenc ({jsonenc.BACKEND})"] = jsonenc.dumps
+    return encoders
+
+
+def main() -> None:
+    random.seed(1)
+    payloads = {"serverstats (400 d)": _stats_payload(),
+                "core.commands": _commands_payload(),
+                "list.rows (3000)": _rows_payload()}
+    encoders = _encoders()
+    for name, payload in payloads.items():
+        raw = jsonenc.dumps(payload).encode()
+        print(f"{name}: {len(raw) / 1024:.1f} KiB raw, {len(gzip.compress(raw, 6)) / 1024:.1f} KiB gzip")
+        for enc_name, enc in encoders.items():
+            t0 = time.perf_counter()
+            for _ in range(ROUNDS):
+                enc(payload)
+            ms = (time.perf_counter() - t0) * 1000 / ROUNDS
+            print(f"  {enc_name:<22} {ms:7.2f} ms/encode")
+    if len(encoders) == 2:
+        print("\n(orjson/ujson not installed – only the stdlib path was measured)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Circuit breaker per dashboard contribution (dependency-free).
+
+A contribution whose handler fails or times out ``threshold`` times in a row is
+"opened": for ``cooldown`` seconds its calls are short-circuited (the gateway
+answers with the last good value or a typed error) instead of tying up a request
+on a handler that is known to hang. After the cooldown a single trial call is let
+through ("half_open"); success closes the breaker, failure opens it again.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _State:
+    __slots__ = ("state", "failures", "opened_at", "trips", "last_error", "probing")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.last_error: Optional[str] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    def __init__(self, *, threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.threshold = max(1, int(threshold))
+        self.cooldown = float(cooldown)
+        self._states: Dict[str, _State] = {}
+
+    def allow(self, key: str) -> bool:
+        """True if a call of ``key`` may run now."""
+        st = self._states.get(key)
+        if st is None or st.state == CLOSED:
+            return True
+        if st.state == OPEN:
+            if time.monotonic() - st.opened_at < self.cooldown:
+                return False
+            st.state = HALF_OPEN
+            st.probing = False
+        # half open: exactly one trial call at a time
+        if st.probing:
+            return False
+        st.probing = True
+        return True
+
+    def retry_after(self, key: str) -> float:
+        st = self._states.get(key)
+        if st is None or st.state != OPEN:
+            return 0.0
+        return max(0.0, round(self.cooldown - (time.monotonic() - st.opened_at), 1))
+
+    def success(self, key: str) -> None:
+        st = self._states.get(key)
+        if st is None:
+            return
+        st.state = CLOSED
+        st.failures = 0
+        st.probing = False
+
+    def abort(self, key: str) -> None:
+        """A call ended without a verdict (cancelled); frees the half-open trial slot."""
+        st = self._states.get(key)
+        if st is not None:
+            st.probing = False
+
+    def failure(self, key: str, error: str) -> bool:
+        """Records a failure; returns True if the breaker (re)opened."""
+        st = self._states.setdefault(key, _State())
+        st.failures += 1
+        st.last_error = error
+        st.probing = False
+        if st.state == HALF_OPEN or st.failures >= self.threshold:
+            if st.state != OPEN:
+                st.trips += 1
+            st.state = OPEN
+            st.opened_at = time.monotonic()
+            return True
+        return False
+
+    def reset(self, prefix: str = "") -> None:
+        """Forgets the state of every key starting with ``prefix`` (all by default)."""
+        for key in [k for k in self._states if k.startswith(prefix)]:
+            del self._states[key]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Contributions that failed at least once (for ``system.info``)."""
+        out = []
+        for key, st in sorted(self._states.items()):
+            out.append({
+                "key": key,
+                "state": st.state,
+                "failures": st.failures,
+                "trips": st.trips,
+                "last_error": st.last_error,
+                "retry_after": self.retry_after(key),
+            })
+        return out
@@ -0,0 +1,200 @@
+"""Background job queue for long-running RPCs (dependency-free).
+
+Methods that can take minutes (repo updates, cog installs) accept
+``args.background``: instead of holding the request open they ``submit`` their
+work here and answer at once with the job (``id``, ``state``). A worker runs the
+queued jobs in order; every state change and progress step is pushed on the
+``jobs`` stream channel, and ``jobs.get`` / ``jobs.list`` return the same job
+objects for clients that poll or reconnect.
+
+The running job's code reports progress with :func:`progress`, a no-op when the
+code runs as a normal (foreground) call.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .rpc import INTERNAL_ERROR, RpcError
+
+log = logging.getLogger("red.dks.webdashboard.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_PROGRESS_KEEP = 50  # progress steps kept per job
+
+# (queue, job) of the job running in the current task, for progress()
+_current: contextvars.ContextVar[Optional[Tuple["JobQueue", "Job"]]] = \
+    contextvars.ContextVar("dks_job", default=None)
+
+
+class Job:
+    __slots__ = ("id", "kind", "user", "detail", "state", "stage", "progress", "result", "error",
+                 "created", "started", "finished", "_work")
+
+    def __init__(self, kind: str, work: Callable[[], Awaitable[Any]], *,
+                 user: Optional[str] = None, detail: Optional[Dict[str, Any]] = None) -> None:
+        self.id = uuid.uuid4().hex[:16]
+        self.kind = kind
+        self.user = user
+        self.detail = detail or {}
+        self.state = QUEUED
+        self.stage: Optional[str] = None
+        self.progress: Deque[Dict[str, Any]] = deque(maxlen=_PROGRESS_KEEP)
+        self.result: Any = None
+        self.error: Optional[Dict[str, Any]] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._work = work
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "user": self.user,
+            "detail": self.detail,
+            "state": self.state,
+            "stage": self.stage,
+            "progress": list(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobQueue:
+    def __init__(self, publish: Optional[Callable[[str, Any], Awaitable[None]]] = None, *,
+                 workers: int = 1, keep: int = 100) -> None:
+        self._publish = publish
+        self._workers = max(1, int(workers))
+        self._keep = max(1, int(keep))
+        self._queue: "asyncio.Queue[Job]" = asyncio.Queue()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+        # in-flight progress pushes; the loop only holds tasks weakly
+        self._pushes: Set[asyncio.Task] = set()
+        # workers currently running a job, and those left to finish it after stop()
+        self._busy: Set[asyncio.Task] = set()
+        self._draining: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    def stop(self) -> None:
+        """Drops the queued jobs; a running job is left to finish on its own.
+
+        Cancelling an install or repo update halfway through a Downloader write
+        could leave a broken cog behind, so busy workers only exit after their job.
+        """
+        for task in self._tasks:
+            if task in self._busy:
+                self._draining.add(task)
+                task.add_done_callback(self._draining.discard)
+            else:
+                task.cancel()
+        self._tasks = []
+        for job in self._jobs.values():
+            if job.state == QUEUED:
+                job.state = CANCELLED
+                job.finished = time.time()
+
+    def submit(self, kind: str, work: Callable[[], Awaitable[Any]], *,
+               user: Optional[str] = None, detail: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queues ``await work()``; returns the new job (``state`` = queued)."""
+        job = Job(kind, work, user=user, detail=detail)
+        self._jobs[job.id] = job
+        self._prune()
+        self._queue.put_nowait(job)
+        self.start()
+        self._emit(job)
+        return job.to_dict()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job is not None else None
+
+    def list(self, *, state: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest first."""
+        out = []
+        for job in reversed(self._jobs.values()):
+            if state and job.state != state:
+                continue
+            out.append(job.to_dict())
+            if len(out) >= limit:
+                break
+        return out
+
+    def _prune(self) -> None:
+        # Forget the oldest finished jobs beyond `keep`; queued/running ones stay.
+        excess = len(self._jobs) - self._keep
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished is not None][:excess]:
+            del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        me = asyncio.current_task()
+        while me in self._tasks:
+            job = await self._queue.get()
+            if job.state != QUEUED:
+                continue
+            self._busy.add(me)
+            job.state = RUNNING
+            job.started = time.time()
+            self._emit(job)
+            token = _current.set((self, job))
+            try:
+                job.result = await job._work()
+                job.state = DONE
+            except asyncio.CancelledError:
+                job.state = CANCELLED
+                raise
+            except RpcError as e:
+                job.state = FAILED
+                job.error = {"code": e.code, "message": e.message, "data": e.data}
+            except Exception as e:
+                log.exception("Hintergrund-Job %s (%s) fehlgeschlagen", job.id, job.kind)
+                job.state = FAILED
+                job.error = {"code": INTERNAL_ERROR, "message": str(e), "data": None}
+            finally:
+                _current.reset(token)
+                self._busy.discard(me)
+                job.finished = time.time()
+                job._work = None
+                self._emit(job)
+
+    def _emit(self, job: Job) -> None:
+        if self._publish is None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._publish("jobs", job.to_dict()))
+        except RuntimeError:  # no running loop (shutdown)
+            return
+        self._pushes.add(task)
+        task.add_done_callback(self._pushes.discard)
+
+    def _step(self, job: Job, stage: str, data: Dict[str, Any]) -> None:
+        job.stage = stage
+        job.progress.append({"time": time.time(), "stage": stage, **data})
+        self._emit(job)
+
+
+def progress(stage: str, **data: Any) -> None:
+    """Reports a progress step of the current background job (no-op otherwise)."""
+    current = _current.get()
+    if current is not None:
+        queue, job = current
+        queue._step(job, stage, data)
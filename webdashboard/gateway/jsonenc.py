@@ -0,0 +1,54 @@
+"""JSON encoding for the gateway: orjson or ujson when installed, else stdlib ``json``.
+
+Neither package is a requirement; the fast path is picked at import time. Values
+a fast encoder rejects (e.g. integers beyond 64 bit, unusual key types) fall back
+to the stdlib per call, so every backend yields the same values (formatting
+may differ: the fast encoders emit no spaces), only the speed differs.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+try:  # pragma: no cover - optional
+    import orjson
+except ImportError:  # pragma: no cover - optional
+    orjson = None
+
+try:  # pragma: no cover - optional
+    import ujson
+except ImportError:  # pragma: no cover - optional
+    ujson = None
+
+BACKEND = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except TypeError:  # orjson.JSONEncodeError is a TypeError
+            pass
+    elif ujson is not None and default is None:
+        try:
+            return ujson.dumps(obj, sort_keys=sort_keys, escape_forward_slashes=False)
+        except (TypeError, OverflowError, ValueError):
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, default=default)
+
+
+def etag(obj: Any, *, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Quoted HTTP ETag of ``obj``: sha1 of its key-sorted serialization."""
+    body = dumps(obj, sort_keys=True, default=default)
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def loads(text: Any) -> Any:
+    """Parses JSON; invalid input raises ``ValueError`` (as ``json.loads`` does)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    if ujson is not None:
+        return ujson.loads(text)
+    return json.loads(text)
@@ -0,0 +1,124 @@
+"""Fair concurrency limiter for RPC calls (dependency-free).
+
+All dashboard users share one event loop with the bot, so the gateway caps how
+many handlers run at once: at most ``global_limit`` overall and ``user_limit``
+per user. Calls over the limit wait in a FIFO queue per user; whenever a slot
+frees up, the users with waiting calls are served round-robin, so one session
+flooding the gateway only delays its own calls, not everyone else's.
+
+Queues are bounded (``user_queue`` per user, ``max_queue`` overall). A call
+that finds them full is rejected with :class:`Busy` immediately instead of
+piling up tasks.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable
+
+
+class Busy(Exception):
+    """Raised by :meth:`FairLimiter.acquire` when the queues are full."""
+
+
+class FairLimiter:
+    def __init__(self, *, global_limit: int = 32, user_limit: int = 4,
+                 max_queue: int = 256, user_queue: int = 64) -> None:
+        self.global_limit = max(1, int(global_limit))
+        self.user_limit = max(1, int(user_limit))
+        self.max_queue = max(0, int(max_queue))
+        self.user_queue = max(0, int(user_queue))
+        self.running = 0
+        self.queued = 0
+        self.rejected = 0
+        self._running: Dict[Hashable, int] = {}
+        # user -> waiting futures (FIFO); the dict order is the round-robin order
+        self._queues: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+    def _free(self, user: Hashable) -> bool:
+        return self.running < self.global_limit and self._running.get(user, 0) < self.user_limit
+
+    async def acquire(self, user: Hashable) -> float:
+        """Takes a slot for ``user``; returns the time spent waiting (seconds)."""
+        if self._free(user) and user not in self._queues:
+            self._take(user)
+            return 0.0
+        queue = self._queues.get(user)
+        if self.queued >= self.max_queue or len(queue or ()) >= self.user_queue:
+            self.rejected += 1
+            raise Busy()
+        if queue is None:
+            queue = self._queues[user] = deque()
+        fut = asyncio.get_running_loop().create_future()
+        queue.append(fut)
+        self.queued += 1
+        started = time.perf_counter()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(user)  # slot was granted just before the cancellation
+            else:
+                self._discard(user, fut)
+            raise
+        return time.perf_counter() - started
+
+    def release(self, user: Hashable) -> None:
+        left = self._running.get(user, 0) - 1
+        if left > 0:
+            self._running[user] = left
+        else:
+            self._running.pop(user, None)
+        self.running = max(0, self.running - 1)
+        self._wake()
+
+    def _take(self, user: Hashable) -> None:
+        self.running += 1
+        self._running[user] = self._running.get(user, 0) + 1
+
+    def _discard(self, user: Hashable, fut: asyncio.Future) -> None:
+        queue = self._queues.get(user)
+        if queue is None:
+            return
+        try:
+            queue.remove(fut)
+            self.queued -= 1
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[user]
+
+    def _wake(self) -> None:
+        """Hands free slots to waiting users, one call per user per round."""
+        progress = True
+        while progress and self.running < self.global_limit and self._queues:
+            progress = False
+            for user in list(self._queues):
+                if self.running >= self.global_limit:
+                    break
+                if self._running.get(user, 0) >= self.user_limit:
+                    continue
+                queue = self._queues[user]
+                fut = queue.popleft()
+                self.queued -= 1
+                if queue:
+                    self._queues.move_to_end(user)  # back of the round-robin line
+                else:
+                    del self._queues[user]
+                progress = True
+                if fut.done():
+                    continue  # cancelled while queued; nothing to hand over
+                self._take(user)
+                fut.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load (for ``system.info``)."""
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "waiting_users": len(self._queues),
+            "global_limit": self.global_limit,
+            "user_limit": self.user_limit,
+        }
@@ -4,22 +4,38 @@ The web dashboard's Log-Viewer reads from this. A single ``logging.Handler`` is
 attached to the root logger while the WebDashboard cog is loaded and keeps the
 last N records in memory (no disk writes, no extra dependencies). Detached again
 on cog unload so reloading the cog never stacks duplicate handlers.
+
+Every record gets a monotonically increasing ``seq``; clients pass the last one
+they saw as ``since`` and only receive newer records. The lowercase search key is
+computed once per record, and a deque per level lets level filters skip the
+records below the threshold instead of scanning them.
 """
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 from collections import deque
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 _LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
 
+# (seq, levelno, lowercase search key, public record)
+_Entry = Tuple[int, int, str, Dict[str, Any]]
+
 
 class _RingBufferHandler(logging.Handler):
-    def __init__(self, capacity: int = 500) -> None:
+    def __init__(self, capacity: int = 5000) -> None:
         super().__init__()
-        self._records: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self.capacity = max(1, int(capacity))
+        self._records: Deque[_Entry] = deque()
+        # levelno -> entries of that level (oldest first); always a subset of _records
+        self._by_level: Dict[int, Deque[_Entry]] = {}
+        self._seq = itertools.count(1)
+        self.last_seq = 0
 
     def emit(self, record: logging.LogRecord) -> None:
+        # Called under self.lock (logging.Handler.handle).
         try:
             exc: Optional[str] = None
             if record.exc_info:
@@ -27,43 +43,122 @@ class _RingBufferHandler(logging.Handler):
                     exc = logging.Formatter().formatException(record.exc_info)
                 except Exception:
                     exc = None
-            self._records.append(
-                {
-                    "time": record.created,
-                    "level": record.levelname,
-                    "levelno": record.levelno,
-                    "logger": record.name,
-                    "message": record.getMessage(),
-                    "exc": exc,
-                }
-            )
+            seq = next(self._seq)
+            message = record.getMessage()
+            rec = {
+                "seq": seq,
+                "time": record.created,
+                "level": record.levelname,
+                "levelno": record.levelno,
+                "logger": record.name,
+                "message": message,
+                "exc": exc,
+            }
+            entry = (seq, record.levelno, f"{message} {record.name}".lower(), rec)
+            if len(self._records) >= self.capacity:
+                self._evict()
+            self._records.append(entry)
+            self._by_level.setdefault(record.levelno, deque()).append(entry)
+            self.last_seq = seq
         except Exception:
             # Logging must never raise.
             pass
 
-    def snapshot(self, *, min_level: int = 0, query: str = "", limit: int = 300) -> List[Dict[str, Any]]:
+    def _evict(self) -> None:
+        # The globally oldest entry is also the oldest of its level.
+        old = self._records.popleft()
+        level = self._by_level.get(old[1])
+        if level:
+            level.popleft()
+
+    def resize(self, capacity: int) -> None:
+        self.acquire()
+        try:
+            self.capacity = max(1, int(capacity))
+            while len(self._records) > self.capacity:
+                self._evict()
+        finally:
+            self.release()
+
+    def snapshot(self, *, min_level: int = 0, query: str = "", limit: int = 300,
+                 since: int = 0) -> List[Dict[str, Any]]:
+        """Newest-first records with ``levelno >= min_level`` and ``seq > since``."""
         q = (query or "").lower().strip()
         out: List[Dict[str, Any]] = []
-        for r in reversed(self._records):  # newest first
-            if r["levelno"] < min_level:
-                continue
-            if q and q not in (f"{r['message']} {r['logger']}").lower():
-                continue
-            out.append(r)
-            if len(out) >= limit:
-                break
+        self.acquire()
+        try:
+            if min_level <= min(self._by_level, default=0):
+                entries = reversed(self._records)
+            else:
+                sources = [reversed(d) for lv, d in self._by_level.items() if lv >= min_level and d]
+                entries = heapq.merge(*sources, key=lambda e: e[0], reverse=True)
+            for seq, _levelno, key, rec in entries:
+                if seq <= since:
+                    break
+                if q and q not in key:
+                    continue
+                out.append(rec)
+                if len(out) >= limit:
+                    break
+        finally:
+            self.release()
         return out
 
+    def page(self, *, min_level: int = 0, query: str = "", limit: int = 300,
+             since: int = 0) -> Dict[str, Any]:
+        """Records for a polling client: ``{"records", "last_seq", "truncated"}``.
+
+        Without ``since`` these are the newest ``limit`` matches. With ``since``
+        the page starts right after it (oldest first), so a client that fell more
+        than ``limit`` records behind catches up over several calls instead of
+        skipping the middle; ``truncated`` says more records are waiting.
+        ``last_seq`` is the next ``since`` and is read under the same lock as the
+        records. ``records`` are newest first either way.
+        """
+        if not since:
+            self.acquire()
+            try:
+                cursor = self.last_seq
+                records = self.snapshot(min_level=min_level, query=query, limit=limit)
+            finally:
+                self.release()
+            return {"records": records, "last_seq": cursor, "truncated": False}
+        q = (query or "").lower().strip()
+        out: List[Dict[str, Any]] = []
+        self.acquire()
+        try:
+            cursor = self.last_seq
+            truncated = False
+            if min_level <= min(self._by_level, default=0):
+                entries = iter(self._records)
+            else:
+                sources = [d for lv, d in self._by_level.items() if lv >= min_level and d]
+                entries = heapq.merge(*sources, key=lambda e: e[0])
+            for seq, _levelno, key, rec in itertools.dropwhile(lambda e: e[0] <= since, entries):
+                if len(out) >= limit:
+                    truncated = True
+                    break
+                if q and q not in key:
+                    continue
+                out.append(rec)
+            if truncated:
+                cursor = out[-1]["seq"]
+        finally:
+            self.release()
+        out.reverse()
+        return {"records": out, "last_seq": cursor, "truncated": truncated}
+
 
 # Module-level singleton shared by the cog (install/uninstall) and the gateway
 # method (snapshot).
 _handler: Optional[_RingBufferHandler] = None
 
 
-def install(capacity: int = 500, level: int = logging.INFO) -> None:
-    """Attach the ring-buffer handler to the root logger (idempotent)."""
+def install(capacity: int = 5000, level: int = logging.INFO) -> None:
+    """Attach the ring-buffer handler to the root logger (idempotent; resizes if present)."""
     global _handler
     if _handler is not None:
+        _handler.resize(capacity)
         return
     _handler = _RingBufferHandler(capacity)
     _handler.setLevel(level)
@@ -85,7 +180,20 @@ def level_value(name: str) -> int:
     return _LEVELS.get((name or "").upper(), 0)
 
 
-def snapshot(*, min_level: int = 0, query: str = "", limit: int = 300) -> List[Dict[str, Any]]:
+def last_seq() -> int:
+    """``seq`` of the newest record (0 if none / not installed)."""
+    return _handler.last_seq if _handler is not None else 0
+
+
+def snapshot(*, min_level: int = 0, query: str = "", limit: int = 300,
+             since: int = 0) -> List[Dict[str, Any]]:
     if _handler is None:
         return []
-    return _handler.snapshot(min_level=min_level, query=query, limit=limit)
+    return _handler.snapshot(min_level=min_level, query=query, limit=limit, since=since)
+
+
+def page(*, min_level: int = 0, query: str = "", limit: int = 300,
+         since: int = 0) -> Dict[str, Any]:
+    if _handler is None:
+        return {"records": [], "last_seq": 0, "truncated": False}
+    return _handler.page(min_level=min_level, query=query, limit=limit, since=since)
@@ -0,0 +1,188 @@
+"""Event-loop lag monitor with blocking-call sampling.
+
+A small sensor task sleeps ``interval`` seconds in a loop and records how much
+later than requested it woke up: that delay is the time the loop spent running
+other callbacks without yielding. A watchdog thread watches the sensor's
+heartbeat; if the loop stalls longer than ``threshold_ms`` it grabs the loop
+thread's current stack (``sys._current_frames``) *while* the stall is happening,
+so the offending cog code is visible, not just the fact that something blocked.
+
+Stalls are attributed to the outermost frame outside the event loop and common
+libraries (discord.py, Red, aiohttp, ...), i.e. usually the cog callback that
+called into Pillow, file I/O or similar.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+log = logging.getLogger("red.dks.webdashboard.loop")
+
+# Top-level packages never blamed for a stall (they only call into the culprit).
+_LIBRARY_PREFIXES = (
+    "asyncio", "selectors", "threading", "concurrent", "contextlib", "functools",
+    "logging", "discord", "redbot", "aiohttp",
+)
+_STACK_DEPTH = 12
+
+
+class LoopMonitor:
+    def __init__(self, *, interval: float = 0.25, threshold_ms: float = 200.0,
+                 window: int = 2400) -> None:
+        self.interval = float(interval)
+        self.threshold_ms = float(threshold_ms)
+        self._lags: Deque[float] = deque(maxlen=window)  # ms, ~10 min at 0.25 s
+        self.stalls = 0
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=50)
+        # module -> {"count", "total_ms", "max_ms", "function"}
+        self.offenders: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._beat = time.monotonic()
+        # (beat the sample belongs to, sample) – written by the watchdog thread
+        self._sample: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._sensor())
+        if hasattr(sys, "_current_frames"):
+            self._thread = threading.Thread(target=self._watchdog, name="dks-loop-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._thread = None
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """``callback(stall)`` runs on the loop for every detected stall."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    # ------------------------------------------------------------------ #
+    # Sensor (event loop) + watchdog (thread)
+    # ------------------------------------------------------------------ #
+    async def _sensor(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.perf_counter() - started - self.interval) * 1000.0)
+            beat, self._beat = self._beat, time.monotonic()
+            self._lags.append(lag_ms)
+            if lag_ms >= self.threshold_ms:
+                sample = self._sample
+                self._record_stall(lag_ms, sample[1] if sample and sample[0] == beat else None)
+            self._sample = None
+
+    def _watchdog(self) -> None:
+        sampled_beat = None
+        while not self._stop.wait(max(0.01, self.threshold_ms / 2000.0)):
+            beat = self._beat
+            overdue_ms = (time.monotonic() - beat - self.interval) * 1000.0
+            if overdue_ms < self.threshold_ms or beat == sampled_beat:
+                continue
+            sampled_beat = beat
+            try:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._sample = (beat, _describe(frame))
+            except Exception:
+                pass
+
+    def _record_stall(self, lag_ms: float, sample: Optional[Dict[str, Any]]) -> None:
+        self.stalls += 1
+        stall = {
+            "time": time.time(),
+            "lag_ms": round(lag_ms, 1),
+            "module": sample["module"] if sample else None,
+            "function": sample["function"] if sample else None,
+            "stack": sample["stack"] if sample else [],
+        }
+        self.recent.append(stall)
+        module = stall["module"] or "?"
+        off = self.offenders.setdefault(module, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "function": None})
+        off["count"] += 1
+        off["total_ms"] += lag_ms
+        if lag_ms >= off["max_ms"]:
+            off["max_ms"] = lag_ms
+            off["function"] = stall["function"]
+        log.debug("Event-Loop %.0f ms blockiert (%s.%s)", lag_ms, module, stall["function"])
+        for callback in list(self._listeners):
+            try:
+                callback(stall)
+            except Exception:
+                log.debug("Loop-Listener fehlgeschlagen", exc_info=True)
+
+    # ------------------------------------------------------------------ #
+    # Output
+    # ------------------------------------------------------------------ #
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+
+        def pct(q: float) -> Optional[float]:
+            if not lags:
+                return None
+            return round(lags[min(len(lags) - 1, int(round(q * (len(lags) - 1))))], 1)
+
+        worst = sorted(self.offenders.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:top]
+        return {
+            "threshold_ms": self.threshold_ms,
+            "lag_ms": {"p50": pct(0.5), "p95": pct(0.95), "p99": pct(0.99),
+                       "max": round(lags[-1], 1) if lags else None},
+            "stalls": self.stalls,
+            "offenders": [
+                {"module": m, "count": o["count"], "total_ms": round(o["total_ms"], 1),
+                 "max_ms": round(o["max_ms"], 1), "function": o["function"]}
+                for m, o in worst
+            ],
+            "recent": list(self.recent)[-10:],
+        }
+
+
+def _describe(frame: Any) -> Dict[str, Any]:
+    """Stack (outermost first) of the loop thread, plus the frame to blame."""
+    frames = []
+    f = frame
+    while f is not None:
+        frames.append(f)
+        f = f.f_back
+    frames.reverse()
+    culprit = None
+    for f in frames:
+        module = str(f.f_globals.get("__name__", "?"))
+        if module.split(".")[0] not in _LIBRARY_PREFIXES and module != "__main__":
+            culprit = f
+            break
+    if culprit is None:
+        culprit = frames[-1]
+    stack = [
+        f"{f.f_globals.get('__name__', '?')}:{f.f_lineno} {f.f_code.co_name}"
+        for f in frames[-_STACK_DEPTH:]
+    ]
+    return {
+        "module": str(culprit.f_globals.get("__name__", "?")),
+        "function": culprit.f_code.co_name,
+        "stack": stack,
+    }
@@ -13,34 +13,44 @@ Discord OAuth2 login. Permissions are re-checked here on the server side.
 from __future__ import annotations
 
 import asyncio
+import base64
+import dataclasses
+import json
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from ..cache import TTLCache
 from ..integration.context import DashboardContext
-from ..permissions import Level, _level_value, has_permission, resolve_level
+from ..permissions import Level, _level_value, invalidate_levels, resolve_level
+from . import jsonenc
+from .jobs import progress as job_progress
 from .rpc import (
+    CIRCUIT_OPEN,
+    CONTRIBUTION_ERROR,
     FORBIDDEN,
     INTERNAL_ERROR,
     INVALID_PARAMS,
+    TIMEOUT,
     UNAUTHORIZED,
     Dispatcher,
     RpcError,
 )
+from .rwlock import RWLock
 
 log = logging.getLogger("red.dks.webdashboard.methods")
 
 dispatcher = Dispatcher()
 
-# Serialises all Downloader operations (install/update/uninstall AND the repo
-# listing read). The Downloader is not safe for concurrent access: an install
-# rewrites the repo working tree + Config, and reading repo.available_cogs /
-# _available_updates while that happens returns a PARTIAL scan (cogs/update flags
-# momentarily vanish). The read path therefore takes the same lock so a page
-# refresh never observes a mid-mutation state. asyncio.Lock is fair (FIFO) so
-# requests run in click order.
-_downloader_lock = asyncio.Lock()
+# Guards all Downloader operations. The Downloader is not safe for concurrent
+# access: an install rewrites the repo working tree + Config, and reading
+# repo.available_cogs / _available_updates while that happens returns a PARTIAL
+# scan (cogs/update flags momentarily vanish). Mutations (repo add/remove/update,
+# cog install/update/uninstall) take the write side, one at a time; the repo
+# listing takes the read side, so listings run concurrently with each other but
+# never observe a mid-mutation state. Waiters are served in click order (FIFO).
+_downloader_lock = RWLock()
 
 
 class _LightUser:
@@ -56,6 +66,52 @@ class _LightUser:
         self.bot = False
 
 
+# Users resolved via bot.fetch_user (i.e. not in the gateway cache, e.g. no shared
+# guild), so repeated calls of the same dashboard session don't hit the Discord API
+# every time. Failed lookups are cached as _LightUser for a short time (negative
+# cache). Concurrent lookups of the same id share one request.
+_user_cache = TTLCache(ttl=300, maxsize=2048)
+_USER_NEGATIVE_TTL = 30.0
+_user_fetches: Dict[int, asyncio.Future] = {}
+
+
+async def _resolve_user(gateway: Any, uid: int) -> Any:
+    bot = gateway.bot
+    user = bot.get_user(uid)
+    if user is not None:
+        return user
+    user = _user_cache.get(uid)
+    if user is not None:
+        return user
+    running = _user_fetches.get(uid)
+    if running is not None:
+        try:
+            return await asyncio.shield(running)
+        except asyncio.CancelledError:
+            if not running.cancelled():
+                raise
+            return await _resolve_user(gateway, uid)  # the first caller was cancelled
+
+    fut = asyncio.get_running_loop().create_future()
+    _user_fetches[uid] = fut
+    try:
+        try:
+            user = await bot.fetch_user(uid)
+            ttl = float(gateway.tuning.get("user_cache_ttl", 300))
+        except Exception:
+            # Not a hard error: id-based permission checks still work.
+            user = _LightUser(uid)
+            ttl = _USER_NEGATIVE_TTL
+        _user_cache.set(uid, user, ttl=ttl)
+        fut.set_result(user)
+        return user
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    finally:
+        _user_fetches.pop(uid, None)
+
+
 # --------------------------------------------------------------------------- #
 # Helpers
 # --------------------------------------------------------------------------- #
@@ -71,13 +127,7 @@ async def _build_context(gateway: Any, params: Dict[str, Any]) -> DashboardConte
     except (TypeError, ValueError):
         raise RpcError(INVALID_PARAMS, "Ungültige user_id")
 
-    user = bot.get_user(uid)
-    if user is None:
-        try:
-            user = await bot.fetch_user(uid)
-        except Exception:
-            # Not a hard error: id-based permission checks still work.
-            user = _LightUser(uid)
+    user = await _resolve_user(gateway, uid)
 
     guild = None
     member = None
@@ -97,7 +147,8 @@ async def _build_context(gateway: Any, params: Dict[str, Any]) -> DashboardConte
     )
 
 
-async def _require(gateway: Any, ctx: DashboardContext, permission: str) -> None:
+async def _require(gateway: Any, ctx: DashboardContext, permission: str) -> int:
+    """Enforces ``permission`` for ``ctx`` and returns the resolved level."""
     # Lock: if the dashboard is locked, only the bot owner may run protected calls.
     cog = gateway.bot.get_cog("WebDashboard")
     if cog is not None:
@@ -114,8 +165,44 @@ async def _require(gateway: Any, ctx: DashboardContext, permission: str) -> None
     required = permission
     if ctx.guild is not None and _level_value(permission) < int(Level.GUILD_MEMBER):
         required = "guild_member"
-    if not await has_permission(gateway.bot, ctx.user, required, ctx.guild):
+    level = await resolve_level(gateway.bot, ctx.user, ctx.guild)
+    if level < _level_value(required):
         raise RpcError(FORBIDDEN, f"Berechtigung '{permission}' erforderlich")
+    return int(level)
+
+
+def _widget_ttl(gateway: Any, contrib: Any) -> float:
+    """Cache TTL of a widget: its declared ``refresh`` interval, else the default."""
+    refresh = contrib.meta.extra.get("refresh")
+    try:
+        if refresh is not None:
+            return float(refresh)
+    except (TypeError, ValueError):
+        pass
+    return float(gateway.tuning.get("widget_cache_ttl", 30))
+
+
+async def _coalesce_key(gateway: Any, params: Dict[str, Any]) -> Optional[tuple]:
+    """Single-flight key for read-only methods: (guild, locale, args, level).
+
+    Calls are only merged when they would compute the same answer, i.e. same guild,
+    same arguments and the same permission level. Incomplete auth yields None (the
+    call runs on its own and reports its error itself).
+    """
+    auth = params.get("auth") or {}
+    try:
+        uid = int(auth.get("user_id"))
+    except (TypeError, ValueError):
+        return None
+    bot = gateway.bot
+    gid = auth.get("guild_id")
+    guild = bot.get_guild(int(gid)) if gid else None
+    if gid and guild is None:
+        return None
+    user = bot.get_user(uid) or _LightUser(uid)
+    level = await resolve_level(bot, user, guild)
+    args = json.dumps(params.get("args") or {}, sort_keys=True, default=str)
+    return (guild.id if guild is not None else None, auth.get("locale", "en-US"), args, int(level))
 
 
 # --------------------------------------------------------------------------- #
@@ -169,18 +256,24 @@ async def core_guild_detail(gateway: Any, params: Dict[str, Any]) -> Dict[str, A
     await _require(gateway, ctx, "guild_member")
     g = ctx.guild
 
+    # O(1) from the stats cog's presence tracker when it is loaded, else one pass.
     online = idle = dnd = offline = 0
+    tracker = getattr(_serverstats(gateway), "presence", None)
     try:
-        for m in g.members:
-            s = str(getattr(m, "status", "offline"))
-            if s == "online":
-                online += 1
-            elif s == "idle":
-                idle += 1
-            elif s == "dnd":
-                dnd += 1
-            else:
-                offline += 1
+        if tracker is not None:
+            counts = tracker.get(g).counts(include_bots=True)
+            online, idle, dnd, offline = counts["online"], counts["idle"], counts["dnd"], counts["offline"]
+        else:
+            for m in g.members:
+                s = str(getattr(m, "status", "offline"))
+                if s == "online":
+                    online += 1
+                elif s == "idle":
+                    idle += 1
+                elif s == "dnd":
+                    dnd += 1
+                else:
+                    offline += 1
     except Exception:
         pass
 
@@ -356,6 +449,47 @@ def _command_category(cmd) -> str:
     return _category_from_name(name)
 
 
+# Built command catalogues (core.commands per locale/orphans, slash.list per
+# locale) with their serialized form and ETag. Walking all commands, the repo map
+# and the i18n maps is far too expensive for a public landing-page endpoint, so
+# the result is kept until something changes: cogs (un)loaded (on_cog_add /
+# on_cog_remove), slash.sync / slash.set / slash.set_cog, Downloader updates and
+# Red's own `[p]slash` / `[p]cog` commands. The TTL is only a safety net for
+# changes that announce themselves nowhere (e.g. Discord-side registrations).
+_catalogue_cache = TTLCache(ttl=300, maxsize=64)
+
+
+def invalidate_catalogue() -> None:
+    """Drops the cached command catalogues (core.commands / slash.list)."""
+    _catalogue_cache.clear()
+
+
+def _if_none_match(params: Dict[str, Any]) -> Optional[str]:
+    return params.get("if_none_match") or (params.get("args") or {}).get("if_none_match")
+
+
+def _with_etag(payload: Dict[str, Any]) -> tuple:
+    """``(payload + etag, serialized payload, etag)`` for a catalogue payload."""
+    etag = jsonenc.etag(payload, default=str)
+    payload = dict(payload, etag=etag)
+    return payload, jsonenc.dumps(payload, default=str), etag
+
+
+async def command_catalogue(gateway: Any, params: Dict[str, Any]) -> tuple:
+    """Cached ``core.commands`` result: ``(payload, serialized payload, etag)``.
+
+    Shared by ``core.commands`` and the REST mirror ``GET /api/commands``.
+    """
+    locale = str(params.get("locale") or "en-US")
+    include_orphans = bool(params.get("include_orphans"))
+    key = ("commands", locale, include_orphans)
+    entry = _catalogue_cache.get(key)
+    if entry is None:
+        entry = _with_etag(await _build_core_commands(gateway.bot, locale, include_orphans))
+        _catalogue_cache.set(key, entry)
+    return entry
+
+
 @dispatcher.method("core.commands")
 async def core_commands(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     """List of active text and slash commands. Public (without user context).
@@ -363,11 +497,16 @@ async def core_commands(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     Only visible, enabled commands are returned (no hidden ones). Descriptions
     follow the dashboard language via ``params['locale']`` when a command provides
     a bilingual ``extras['i18n_desc']``; otherwise the plain description is used.
+    With ``if_none_match`` = the last ``etag`` the answer is ``{"not_modified": true}``.
     """
-    bot = gateway.bot
+    payload, _text, etag = await command_catalogue(gateway, params)
+    if _if_none_match(params) == etag:
+        return {"not_modified": True, "etag": etag}
+    return payload
+
+
+async def _build_core_commands(bot: Any, locale: str, include_orphans: bool) -> Dict[str, Any]:
     repo_map = await _repo_map(bot)
-    locale = params.get("locale") or "en-US"
-    include_orphans = bool(params.get("include_orphans"))
 
     # qualified_name -> bilingual i18n_desc dict, collected from the text/hybrid
     # side so the slash list can reuse it (hybrid app-commands don't reliably carry
@@ -559,9 +698,11 @@ async def core_stats(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
 # --------------------------------------------------------------------------- #
 # Manifest & contributions (widgets / panels / pages)
 # --------------------------------------------------------------------------- #
-@dispatcher.method("manifest.get")
-async def manifest_get(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Returns all contributions the user is allowed to see (filtered by permissions)."""
+async def manifest_for(gateway: Any, params: Dict[str, Any]) -> tuple:
+    """Cached manifest of the caller: ``(payload, serialized payload, etag)``.
+
+    Shared by ``manifest.get`` and the REST mirror ``GET /api/manifest``.
+    """
     ctx = await _build_context(gateway, params)
     # Resolve the permission level only ONCE and then compare (instead of an
     # expensive resolution per contribution – saves many config reads with many cogs).
@@ -569,26 +710,264 @@ async def manifest_get(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     # SECURITY: In a guild context, only members may see contributions of that
     # guild at all (otherwise an info leak of other servers for logged-in non-members).
     if ctx.guild is not None and level < int(Level.GUILD_MEMBER):
-        return {"contributions": []}
-    locale = getattr(ctx, "locale", None)
-    visible = [
-        contrib.manifest(locale)
-        for contrib in gateway.registry.all()
-        if level >= _level_value(contrib.meta.permission)
-    ]
-    return {"contributions": visible}
+        level = -1  # -> empty manifest
+    return gateway.registry.manifest_payload(int(level), getattr(ctx, "locale", None))
+
+
+@dispatcher.method("manifest.get")
+async def manifest_get(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns all contributions the user is allowed to see (filtered by permissions).
+
+    The payload only changes when a cog (un)registers, so it is built once per
+    registry version, level and locale. Pass ``args.if_none_match`` (the last
+    ``etag``) to get ``{"not_modified": true}`` instead of the full list.
+    """
+    payload, _text, etag = await manifest_for(gateway, params)
+    if (params.get("args") or {}).get("if_none_match") == etag:
+        return {"not_modified": True, "etag": etag}
+    return payload
+
+
+def _contrib_timeout(gateway: Any, contrib: Any) -> float:
+    """Time limit of a contribution: its declared ``timeout``, else the default."""
+    declared = getattr(contrib.meta, "timeout", None)
+    if declared:
+        return float(declared)
+    return float(gateway.tuning.get("contrib_timeout", 10.0))
+
+
+def _stale_or_raise(gateway: Any, stale_key: tuple, error: RpcError) -> Dict[str, Any]:
+    stale = gateway.stale_cache.get(stale_key)
+    if stale is None:
+        raise error
+    return dict(stale, stale=True, stale_reason=error.message)
+
+
+async def _run_contribution(gateway: Any, ctx: DashboardContext, contrib: Any, level: int,
+                            render: Callable[[], Awaitable[Dict[str, Any]]],
+                            variant: Any = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Runs a read handler of ``contrib`` with timeout and circuit breaker.
+
+    On timeout, failure or an open breaker the last good result for the same
+    (guild, level, locale) is returned with ``stale: true``; without one the call
+    fails with TIMEOUT / CONTRIBUTION_ERROR / CIRCUIT_OPEN. RpcErrors raised by
+    the handler itself are deliberate answers and don't count as failures.
+    ``variant`` separates results of the same contribution (e.g. list pages);
+    ``timeout`` may only shorten the contribution's own time limit.
+    """
+    breaker = gateway.breaker
+    stale_key = (contrib.key, ctx.guild.id if ctx.guild else None, level, ctx.locale, variant)
+    if not breaker.allow(contrib.key):
+        return _stale_or_raise(gateway, stale_key, RpcError(
+            CIRCUIT_OPEN, "Beitrag nach wiederholten Fehlern vorübergehend deaktiviert",
+            {"retry_after": breaker.retry_after(contrib.key)}))
+    try:
+        limit = _contrib_timeout(gateway, contrib)
+        if timeout is not None:
+            limit = min(limit, timeout)
+        result = await asyncio.wait_for(render(), limit)
+    except asyncio.CancelledError:
+        breaker.abort(contrib.key)
+        raise
+    except asyncio.TimeoutError:
+        if breaker.failure(contrib.key, "timeout"):
+            log.warning("Beitrag %s deaktiviert (Zeitüberschreitungen)", contrib.key)
+        return _stale_or_raise(gateway, stale_key, RpcError(TIMEOUT, "Zeitüberschreitung"))
+    except RpcError:
+        breaker.success(contrib.key)
+        raise
+    except Exception as e:
+        log.exception("Fehler im Dashboard-Beitrag %s", contrib.key)
+        if breaker.failure(contrib.key, f"{type(e).__name__}: {e}"[:200]):
+            log.warning("Beitrag %s deaktiviert (wiederholte Fehler)", contrib.key)
+        return _stale_or_raise(gateway, stale_key, RpcError(CONTRIBUTION_ERROR, str(e)))
+    breaker.success(contrib.key)
+    gateway.stale_cache.set(stale_key, result)
+    return result
+
+
+# Read-only rendering per contribution kind, shared by the single-item methods
+# (widget.data, panel.schema, page.schema, list.rows) and page.bundle. The caller
+# has already checked the permission; `level` is the resolved level.
+async def _render_widget(gateway: Any, ctx: DashboardContext, contrib: Any, level: int,
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
+    # Widgets declare how often they refresh; within that window every viewer with
+    # the same level/locale gets the same answer, so serve it from the cache.
+    cache_key = (contrib.key, ctx.guild.id if ctx.guild else None, level, ctx.locale)
+    cached = gateway.widget_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def render() -> Dict[str, Any]:
+        data = await contrib.handler(ctx)
+        return {"data": data.to_dict(getattr(ctx, "locale", None)) if hasattr(data, "to_dict") else data}
+
+    result = await _run_contribution(gateway, ctx, contrib, level, render, timeout=timeout)
+    if not result.get("stale"):
+        gateway.widget_cache.set(cache_key, result, ttl=_widget_ttl(gateway, contrib))
+    return result
+
+
+async def _render_schema(gateway: Any, ctx: DashboardContext, contrib: Any, level: int,
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
+    async def render() -> Dict[str, Any]:
+        schema = await contrib.handler(ctx)
+        return {"schema": schema.to_dict(getattr(ctx, "locale", None)) if hasattr(schema, "to_dict") else schema}
+
+    return await _run_contribution(gateway, ctx, contrib, level, render, timeout=timeout)
+
+
+# ----- List paging ---------------------------------------------------------- #
+# list.rows takes offset/limit/sort/order/filter (or the opaque `cursor` of the
+# previous answer). Handlers declared with `paginated=True` receive these in
+# ctx.params and return only the page; for all others the gateway sorts, filters
+# and slices the full row list itself. Either way at most `list_page_max` rows
+# (tuning) are sent.
+_LIST_ROWS_TTL = 10.0  # s; full rows of non-paginated lists, reused while paging
+_CURSOR_PREFIX = "o:"  # gateway (offset) cursors; anything else belongs to the handler
+
+
+def _encode_cursor(page: Dict[str, Any]) -> str:
+    raw = json.dumps(page, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return _CURSOR_PREFIX + base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _list_page_args(gateway: Any, args: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized paging arguments of a list.rows call."""
+    page_max = max(1, int(gateway.tuning.get("list_page_max", 500)))
+    cursor = args.get("cursor")
+    if isinstance(cursor, str) and cursor.startswith(_CURSOR_PREFIX):
+        try:
+            args = json.loads(base64.urlsafe_b64decode(cursor[len(_CURSOR_PREFIX):].encode("ascii")))
+        except (ValueError, TypeError):
+            args = None
+        if not isinstance(args, dict):
+            raise RpcError(INVALID_PARAMS, "Ungültiger Cursor")
+        cursor = None
+    try:
+        offset = max(0, int(args.get("offset") or 0))
+        limit = int(args.get("limit") or page_max)
+    except (TypeError, ValueError):
+        raise RpcError(INVALID_PARAMS, "Ungültige offset/limit")
+    flt = args.get("filter")
+    if not isinstance(flt, (str, dict)):
+        flt = None
+    return {
+        "offset": offset,
+        "limit": max(1, min(limit, page_max)),
+        "sort": str(args["sort"]) if args.get("sort") else None,
+        "order": "desc" if str(args.get("order", "")).lower() == "desc" else "asc",
+        "filter": flt or None,
+        "cursor": cursor,  # handler-native cursor (paginated handlers only)
+    }
 
 
-@dispatcher.method("widget.data")
+def _sort_value(value: Any) -> tuple:
+    if value is None:
+        return (2, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+def _row_matches(row: Dict[str, Any], flt: Any) -> bool:
+    cells = row.get("cells") or {}
+    if isinstance(flt, dict):
+        return all(str(needle).lower() in str(cells.get(col, "")).lower()
+                   for col, needle in flt.items() if needle not in (None, ""))
+    needle = str(flt).lower()
+    return any(needle in str(v).lower() for v in cells.values())
+
+
+def _page_rows(rows: List[Dict[str, Any]], page: Dict[str, Any]) -> Dict[str, Any]:
+    """Filter, sort and slice a full row list (for handlers without paging)."""
+    if page["filter"]:
+        rows = [r for r in rows if _row_matches(r, page["filter"])]
+    if page["sort"]:
+        col = page["sort"]
+        rows = sorted(rows, key=lambda r: _sort_value((r.get("cells") or {}).get(col)),
+                      reverse=page["order"] == "desc")
+    offset, limit = page["offset"], page["limit"]
+    return {"rows": rows[offset:offset + limit], "total": len(rows)}
+
+
+def _next_cursor(page: Dict[str, Any], returned: int, total: Optional[int]) -> Optional[str]:
+    end = page["offset"] + returned
+    if returned < page["limit"] or (total is not None and end >= total):
+        return None
+    nxt = {k: page[k] for k in ("limit", "sort", "order", "filter")}
+    nxt["offset"] = end
+    return _encode_cursor(nxt)
+
+
+async def _render_list(gateway: Any, ctx: DashboardContext, contrib: Any, level: int,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+    page = _list_page_args(gateway, ctx.params or {})
+    columns = contrib.meta.extra.get("columns", [])
+
+    if getattr(contrib.meta, "paginated", False):
+        page_ctx = dataclasses.replace(ctx, params={**(ctx.params or {}), **page})
+
+        async def render() -> Dict[str, Any]:
+            res = await contrib.handler(page_ctx)
+            if isinstance(res, dict):
+                rows, total, cursor = res.get("rows") or [], res.get("total"), res.get("next_cursor")
+            else:
+                rows, total, cursor = list(res or []), None, None
+            rows = rows[:page["limit"]]
+            return {
+                "rows": rows,
+                "columns": columns,
+                "total": total,
+                "offset": page["offset"],
+                "limit": page["limit"],
+                "next_cursor": cursor or _next_cursor(page, len(rows), total),
+            }
+
+        variant = json.dumps(page, sort_keys=True, default=str)
+        return await _run_contribution(gateway, ctx, contrib, level, render, variant, timeout)
+
+    # Full row list, kept briefly so paging through a big table runs the handler once.
+    cache_key = (contrib.key, ctx.guild.id if ctx.guild else None, level, ctx.locale, "rows")
+    full = gateway.widget_cache.get(cache_key)
+    if full is None:
+        async def render() -> Dict[str, Any]:
+            return {"rows": list(await contrib.handler(ctx) or [])}
+
+        full = await _run_contribution(gateway, ctx, contrib, level, render, timeout=timeout)
+        if not full.get("stale"):
+            gateway.widget_cache.set(cache_key, full, ttl=_LIST_ROWS_TTL)
+    sliced = _page_rows(full["rows"], page)
+    result = {
+        "rows": sliced["rows"],
+        "columns": columns,
+        "total": sliced["total"],
+        "offset": page["offset"],
+        "limit": page["limit"],
+        "next_cursor": _next_cursor(page, len(sliced["rows"]), sliced["total"]),
+    }
+    if full.get("stale"):
+        result.update(stale=True, stale_reason=full.get("stale_reason"))
+    return result
+
+
+_RENDERERS = {
+    "widget": _render_widget,
+    "panel": _render_schema,
+    "page": _render_schema,
+    "list": _render_list,
+}
+
+
+@dispatcher.method("widget.data", coalesce=_coalesce_key)
 async def widget_data(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     ctx = await _build_context(gateway, params)
     key = (params.get("args") or {}).get("key")
     contrib = gateway.registry.get(key)
     if contrib is None or contrib.kind != "widget":
         raise RpcError(INVALID_PARAMS, "Unbekanntes Widget")
-    await _require(gateway, ctx, contrib.meta.permission)
-    data = await contrib.handler(ctx)
-    return {"data": data.to_dict(getattr(ctx, "locale", None)) if hasattr(data, "to_dict") else data}
+    level = await _require(gateway, ctx, contrib.meta.permission)
+    return await _render_widget(gateway, ctx, contrib, level)
 
 
 @dispatcher.method("panel.schema")
@@ -598,9 +977,8 @@ async def panel_schema(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     contrib = gateway.registry.get(key)
     if contrib is None or contrib.kind != "panel":
         raise RpcError(INVALID_PARAMS, "Unbekanntes Panel")
-    await _require(gateway, ctx, contrib.meta.permission)
-    schema = await contrib.handler(ctx)
-    return {"schema": schema.to_dict(getattr(ctx, "locale", None)) if hasattr(schema, "to_dict") else schema}
+    level = await _require(gateway, ctx, contrib.meta.permission)
+    return await _render_schema(gateway, ctx, contrib, level)
 
 
 @dispatcher.method("panel.submit")
@@ -616,6 +994,8 @@ async def panel_submit(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     if contrib.submit is None:
         raise RpcError(INVALID_PARAMS, "Panel ist schreibgeschützt (kein on_submit)")
     result = await contrib.submit(ctx, data)
+    # The write most likely changed what this cog's widgets show.
+    gateway.invalidate_widgets(contrib.cog_name)
     gateway.audit("panel.submit", ctx, {"key": key})
     return {"result": result.to_dict(getattr(ctx, "locale", None)) if hasattr(result, "to_dict") else result}
 
@@ -627,24 +1007,79 @@ async def page_schema(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     contrib = gateway.registry.get(key)
     if contrib is None or contrib.kind != "page":
         raise RpcError(INVALID_PARAMS, "Unbekannte Seite")
-    await _require(gateway, ctx, contrib.meta.permission)
-    schema = await contrib.handler(ctx)
-    return {"schema": schema.to_dict(getattr(ctx, "locale", None)) if hasattr(schema, "to_dict") else schema}
+    level = await _require(gateway, ctx, contrib.meta.permission)
+    return await _render_schema(gateway, ctx, contrib, level)
+
+
+@dispatcher.method("page.bundle")
+async def page_bundle(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Widgets/panels/lists/pages of one page in a single round trip.
+
+    ``args.keys``: contribution keys, or ``{"key": ..., "args": {...}, "id": ...}``
+    for items that need their own arguments; ``id`` (default: the key) names the
+    item's result and must be unique, e.g. for two pages of one list. Context and permission level are resolved once,
+    the handlers run concurrently, each bounded by the tuning value
+    ``bundle_timeout`` (``args.timeout`` may only lower it) or its own shorter
+    time limit. Returns
+    ``{"results": {id: {"result": ...} | {"error": {"code", "message"}}}}``; one
+    failing or slow contribution never fails the whole bundle.
+    """
+    ctx = await _build_context(gateway, params)
+    args = params.get("args") or {}
+    items = args.get("keys")
+    if not isinstance(items, list) or len(items) > 100:
+        raise RpcError(INVALID_PARAMS, "keys muss eine Liste (max. 100) sein")
+    level = await _require(gateway, ctx, "authenticated")
+    timeout = float(gateway.tuning.get("bundle_timeout", 5.0))
+    try:
+        if args.get("timeout"):
+            timeout = min(timeout, max(0.1, float(args["timeout"])))
+    except (TypeError, ValueError):
+        raise RpcError(INVALID_PARAMS, "Ungültiges timeout")
+
+    async def _one(item: Any) -> Dict[str, Any]:
+        item_args = item.get("args") if isinstance(item, dict) else None
+        key = item.get("key") if isinstance(item, dict) else item
+        contrib = gateway.registry.get(key)
+        renderer = _RENDERERS.get(contrib.kind) if contrib is not None else None
+        if renderer is None:
+            raise RpcError(INVALID_PARAMS, "Unbekannter Beitrag")
+        if level < _level_value(contrib.meta.permission):
+            raise RpcError(FORBIDDEN, f"Berechtigung '{contrib.meta.permission}' erforderlich")
+        # Same ctx.params as the single-item call would see.
+        item_ctx = dataclasses.replace(ctx, params={**(item_args or {}), "key": key})
+        # The deadline goes to _run_contribution, so a slow item counts for the
+        # breaker and falls back to its stale value like a single call would.
+        return await renderer(gateway, item_ctx, contrib, level, timeout=timeout)
+
+    keys = [str(i.get("id") or i.get("key") if isinstance(i, dict) else i) for i in items]
+    if len(set(keys)) != len(keys):
+        raise RpcError(INVALID_PARAMS, "Doppelter Beitrag in keys (eindeutige id angeben)")
+    outcomes = await asyncio.gather(*(_one(i) for i in items), return_exceptions=True)
+    results: Dict[str, Any] = {}
+    for key, res in zip(keys, outcomes):
+        if isinstance(res, RpcError):
+            results[key] = {"error": {"code": res.code, "message": res.message}}
+        elif isinstance(res, BaseException):
+            log.error("page.bundle: Fehler bei %s", key, exc_info=res)
+            results[key] = {"error": {"code": INTERNAL_ERROR, "message": str(res)}}
+        else:
+            results[key] = {"result": res}
+    return {"results": results}
 
 
 # --------------------------------------------------------------------------- #
 # Cog management (bot owner only)
 # --------------------------------------------------------------------------- #
-@dispatcher.method("list.rows")
+@dispatcher.method("list.rows", coalesce=_coalesce_key)
 async def list_rows(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     ctx = await _build_context(gateway, params)
     key = (params.get("args") or {}).get("key")
     contrib = gateway.registry.get(key)
     if contrib is None or contrib.kind != "list":
         raise RpcError(INVALID_PARAMS, "Unbekannte Liste")
-    await _require(gateway, ctx, contrib.meta.permission)
-    rows = await contrib.handler(ctx)
-    return {"rows": rows, "columns": contrib.meta.extra.get("columns", [])}
+    level = await _require(gateway, ctx, contrib.meta.permission)
+    return await _render_list(gateway, ctx, contrib, level)
 
 
 @dispatcher.method("list.delete")
@@ -660,6 +1095,7 @@ async def list_delete(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     if contrib.delete is None:
         raise RpcError(INVALID_PARAMS, "Liste ist schreibgeschützt (kein on_delete)")
     result = await contrib.delete(ctx, item_id)
+    gateway.invalidate_widgets(contrib.cog_name)
     gateway.audit("list.delete", ctx, {"key": key, "id": item_id})
     return {"result": result.to_dict(getattr(ctx, "locale", None)) if hasattr(result, "to_dict") else result}
 
@@ -694,6 +1130,7 @@ async def list_edit(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     if contrib.edit is None:
         raise RpcError(INVALID_PARAMS, "Liste ist nicht bearbeitbar (kein on_edit)")
     result = await contrib.edit(ctx, item_id, data)
+    gateway.invalidate_widgets(contrib.cog_name)
     gateway.audit("list.edit", ctx, {"key": key, "id": item_id})
     return {"result": result.to_dict(getattr(ctx, "locale", None)) if hasattr(result, "to_dict") else result}
 
@@ -870,11 +1307,26 @@ async def cogs_set(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
 # --------------------------------------------------------------------------- #
 @dispatcher.method("slash.list")
 async def slash_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Top-level app commands with cog and enabled status (owner)."""
+    """Top-level app commands with cog and enabled status (owner).
+
+    Cached like ``core.commands`` (see ``_catalogue_cache``), incl. ``etag`` /
+    ``if_none_match``.
+    """
     ctx = await _build_context(gateway, params)
     await _require(gateway, ctx, "bot_owner")
-    bot = gateway.bot
-
+    locale = str(params.get("locale") or "en-US")
+    key = ("slash", locale)
+    entry = _catalogue_cache.get(key)
+    if entry is None:
+        entry = _with_etag(await _build_slash_list(gateway.bot, locale))
+        _catalogue_cache.set(key, entry)
+    payload, _text, etag = entry
+    if _if_none_match(params) == etag:
+        return {"not_modified": True, "etag": etag}
+    return payload
+
+
+async def _build_slash_list(bot: Any, locale: str) -> Dict[str, Any]:
     items = []
     seen = set()
 
@@ -1003,7 +1455,6 @@ async def slash_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     # 3) Discord registrations not backed by any loaded cog -> "(Not existent)"
     # ghosts, so they are visible here and can be cleared via a sync.
     try:
-        locale = params.get("locale") or "en-US"
         ghost_label = "(Nicht existierend)" if str(locale).lower().startswith("de") else "(Not existent)"
         present = {it["name"] for it in items}
         for ac in await _fetch_registered_commands(bot):
@@ -1037,6 +1488,7 @@ async def slash_sync(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         # immediately on the next read instead of after the cache TTL (~60 s).
         _registered_cmd_cache["t"] = 0.0
         _registered_cmd_cache["cmds"] = None
+        invalidate_catalogue()
         gateway.audit("slash.sync", ctx, {"count": len(synced)})
         return {"ok": True, "count": len(synced)}
     except Exception as e:
@@ -1067,6 +1519,7 @@ async def slash_set(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         raise
     except Exception as e:
         raise RpcError(INTERNAL_ERROR, f"Umschalten fehlgeschlagen: {e}")
+    invalidate_catalogue()
     gateway.audit("slash.set", ctx, {"name": name, "type": ctype, "enabled": enabled})
     return {"ok": True, "name": name, "enabled": enabled}
 
@@ -1102,6 +1555,7 @@ async def slash_set_cog(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
                 pass
     except Exception as e:
         raise RpcError(INTERNAL_ERROR, f"Cog-Umschalten fehlgeschlagen: {e}")
+    invalidate_catalogue()
     gateway.audit("slash.set_cog", ctx, {"cog": cog_name, "enabled": enabled, "changed": changed})
     return {"ok": True, "cog": cog_name, "enabled": enabled, "changed": changed}
 
@@ -1148,9 +1602,11 @@ async def _update_all_repos(dl):
     rm = dl._repo_manager
     # Newer Red versions: update_all_repos(); older ones: Repo.update() per repo.
     if hasattr(rm, "update_all_repos"):
+        job_progress("update_repos")
         await rm.update_all_repos()
     else:
         for repo in _iter_repos(dl):
+            job_progress("update_repo", repo=repo.name)
             try:
                 await repo.update()
             except Exception:
@@ -1158,6 +1614,43 @@ async def _update_all_repos(dl):
     return [r.name for r in _iter_repos(dl) if before.get(r.name) != getattr(r, "commit", None)]
 
 
+async def _maybe_background(gateway: Any, ctx: DashboardContext, params: Dict[str, Any], kind: str,
+                            work: Callable[[], Awaitable[Dict[str, Any]]],
+                            detail: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Runs ``work`` now, or – with ``args.background`` – as a job (see jobs.py).
+
+    In the background case the call answers at once with ``{"background": True,
+    "job": {...}}``; state changes and progress follow on the "jobs" channel.
+    """
+    if not (params.get("args") or {}).get("background"):
+        return await work()
+    user = str(ctx.user.id) if ctx.user is not None else None
+    job = gateway.jobs.submit(kind, work, user=user, detail=detail)
+    return {"background": True, "job": job}
+
+
+@dispatcher.method("jobs.get")
+async def jobs_get(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """State, progress and result of a background job (owner)."""
+    ctx = await _build_context(gateway, params)
+    await _require(gateway, ctx, "bot_owner")
+    job_id = str((params.get("args") or {}).get("id", "")).strip()
+    job = gateway.jobs.get(job_id) if job_id else None
+    if job is None:
+        raise RpcError(INVALID_PARAMS, "Job nicht gefunden")
+    return job
+
+
+@dispatcher.method("jobs.list")
+async def jobs_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Recent background jobs, newest first (owner); optional ``state`` filter."""
+    ctx = await _build_context(gateway, params)
+    await _require(gateway, ctx, "bot_owner")
+    args = params.get("args") or {}
+    limit = max(1, min(int(args.get("limit", 50) or 50), 100))
+    return {"jobs": gateway.jobs.list(state=args.get("state") or None, limit=limit)}
+
+
 @dispatcher.method("downloader.repos")
 async def downloader_repos(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     """Repos with installed and available cogs (owner)."""
@@ -1169,7 +1662,7 @@ async def downloader_repos(gateway: Any, params: Dict[str, Any]) -> Dict[str, An
     # Take the Downloader lock so the listing is never read mid-install/-update
     # (which would yield a partial scan: missing cogs / wrong update flags).
     try:
-        async with _downloader_lock:
+        async with _downloader_lock.read():
             installed = await _installed_cogs(dl)
             # Update detection can shell out to git per repo and occasionally
             # stalls (network, locked index). It is a non-essential adornment, so
@@ -1222,7 +1715,8 @@ async def downloader_repo_add(gateway: Any, params: Dict[str, Any]) -> Dict[str,
     if not name or not url:
         raise RpcError(INVALID_PARAMS, "name und url erforderlich")
     try:
-        await dl._repo_manager.add_repo(url=url, name=name, branch=branch)
+        async with _downloader_lock.write():
+            await dl._repo_manager.add_repo(url=url, name=name, branch=branch)
     except Exception as e:
         raise RpcError(INTERNAL_ERROR, f"Repo hinzufügen fehlgeschlagen: {e}")
     gateway.audit("downloader.repo_add", ctx, {"name": name, "url": url})
@@ -1239,14 +1733,15 @@ async def downloader_repo_remove(gateway: Any, params: Dict[str, Any]) -> Dict[s
     name = str((params.get("args") or {}).get("name", "")).strip()
     if not name:
         raise RpcError(INVALID_PARAMS, "name erforderlich")
-    # Safeguard: only remove if no cogs from this repo are still installed.
-    installed = await _installed_cogs(dl)
-    if any(getattr(m, "repo_name", None) == name for m in installed):
-        raise RpcError(INVALID_PARAMS, "Repo hat noch installierte Cogs – diese zuerst deinstallieren.")
-    try:
-        await dl._repo_manager.delete_repo(name)
-    except Exception as e:
-        raise RpcError(INTERNAL_ERROR, f"Repo entfernen fehlgeschlagen: {e}")
+    async with _downloader_lock.write():
+        # Safeguard: only remove if no cogs from this repo are still installed.
+        installed = await _installed_cogs(dl)
+        if any(getattr(m, "repo_name", None) == name for m in installed):
+            raise RpcError(INVALID_PARAMS, "Repo hat noch installierte Cogs – diese zuerst deinstallieren.")
+        try:
+            await dl._repo_manager.delete_repo(name)
+        except Exception as e:
+            raise RpcError(INTERNAL_ERROR, f"Repo entfernen fehlgeschlagen: {e}")
     gateway.audit("downloader.repo_remove", ctx, {"name": name})
     return {"ok": True}
 
@@ -1259,15 +1754,22 @@ async def downloader_update_check(gateway: Any, params: Dict[str, Any]) -> Dict[
     dl = _downloader(gateway)
     if dl is None:
         raise RpcError(INVALID_PARAMS, "Downloader-Cog ist nicht geladen")
-    try:
-        changed = await _update_all_repos(dl)
-        # After the repo update: which installed cogs now have an update?
-        installed = await _installed_cogs(dl)
-        cogs_update = sorted(await _cogs_with_updates(dl, installed))
-    except Exception as e:
-        raise RpcError(INTERNAL_ERROR, f"Update-Check fehlgeschlagen: {e}")
-    gateway.audit("downloader.update_check", ctx, {"changed": changed, "cogs": cogs_update})
-    return {"ok": True, "updated_repos": changed, "cogs_with_updates": cogs_update}
+
+    async def work() -> Dict[str, Any]:
+        async with _downloader_lock.write():
+            try:
+                changed = await _update_all_repos(dl)
+                # After the repo update: which installed cogs now have an update?
+                job_progress("check_cogs")
+                installed = await _installed_cogs(dl)
+                cogs_update = sorted(await _cogs_with_updates(dl, installed))
+            except Exception as e:
+                raise RpcError(INTERNAL_ERROR, f"Update-Check fehlgeschlagen: {e}")
+        invalidate_catalogue()
+        gateway.audit("downloader.update_check", ctx, {"changed": changed, "cogs": cogs_update})
+        return {"ok": True, "updated_repos": changed, "cogs_with_updates": cogs_update}
+
+    return await _maybe_background(gateway, ctx, params, "downloader.update_check", work)
 
 
 @dispatcher.method("downloader.cog_update")
@@ -1288,8 +1790,12 @@ async def downloader_cog_update(gateway: Any, params: Dict[str, Any]) -> Dict[st
     do_sync = bool((params.get("args") or {}).get("sync", False))
     # Serialise mutating Downloader work so rapid/parallel clicks queue (FIFO)
     # instead of racing the Downloader or running concurrent operations.
-    async with _downloader_lock:
-        return await _do_cog_update(gateway, dl, cog_name, ctx, do_sync)
+    async def work() -> Dict[str, Any]:
+        async with _downloader_lock.write():
+            return await _do_cog_update(gateway, dl, cog_name, ctx, do_sync)
+
+    return await _maybe_background(gateway, ctx, params, "downloader.cog_update", work,
+                                   {"cog": cog_name})
 
 
 async def _do_cog_update(
@@ -1322,6 +1828,7 @@ async def _do_cog_update(
             )
         if cog_obj is None:
             raise RpcError(INVALID_PARAMS, f"Cog '{cog_name}' nicht im Repo gefunden")
+        job_progress("install", cog=cog_name)
         installed_cogs, failed = await dl._install_cogs([cog_obj])
         if hasattr(dl, "_save_to_installed"):
             await dl._save_to_installed(installed_cogs)
@@ -1347,6 +1854,7 @@ async def _do_cog_update(
     reloaded = False
     reload_error = None
     if pkg in bot.extensions and pkg.lower() != own_pkg:
+        job_progress("reload", cog=cog_name)
         try:
             await bot.unload_extension(pkg)
             # Purge cached submodules so the freshly updated files are re-read.
@@ -1360,11 +1868,13 @@ async def _do_cog_update(
 
     synced = None
     if do_sync:
+        job_progress("sync")
         try:
             synced = len(await bot.tree.sync())
         except Exception:
             synced = None
 
+    invalidate_catalogue()
     gateway.audit("downloader.cog_update", ctx,
                   {"cog": cog_name, "reloaded": reloaded, "synced": synced})
     return {
@@ -1389,25 +1899,32 @@ async def downloader_cog_install(gateway: Any, params: Dict[str, Any]) -> Dict[s
     cog_name = str(args.get("cog", "")).strip()
     if not repo_name or not cog_name:
         raise RpcError(INVALID_PARAMS, "repo und cog erforderlich")
-    async with _downloader_lock:  # serialise with other Downloader operations
-        try:
-            repo = dl._repo_manager.get_repo(repo_name)
-            if repo is None:
-                raise RpcError(INVALID_PARAMS, f"Repo '{repo_name}' nicht gefunden")
-            cogs, message = await dl._filter_incorrect_cogs_by_names(repo, [cog_name])
-            if not cogs:
-                raise RpcError(INVALID_PARAMS, message or f"Cog '{cog_name}' nicht im Repo")
-            installed_cogs, failed = await dl._install_cogs(cogs)
-            if hasattr(dl, "_save_to_installed"):
-                await dl._save_to_installed(installed_cogs)
-            if failed:
-                raise RpcError(INTERNAL_ERROR, f"Installation fehlgeschlagen: {cog_name}")
-        except RpcError:
-            raise
-        except Exception as e:
-            raise RpcError(INTERNAL_ERROR, f"Installation fehlgeschlagen: {e}")
-    gateway.audit("downloader.cog_install", ctx, {"repo": repo_name, "cog": cog_name})
-    return {"ok": True, "cog": cog_name, "hint": "Mit cogs.set/load aktivieren."}
+
+    async def work() -> Dict[str, Any]:
+        async with _downloader_lock.write():  # serialise with other Downloader operations
+            try:
+                repo = dl._repo_manager.get_repo(repo_name)
+                if repo is None:
+                    raise RpcError(INVALID_PARAMS, f"Repo '{repo_name}' nicht gefunden")
+                cogs, message = await dl._filter_incorrect_cogs_by_names(repo, [cog_name])
+                if not cogs:
+                    raise RpcError(INVALID_PARAMS, message or f"Cog '{cog_name}' nicht im Repo")
+                job_progress("install", cog=cog_name)
+                installed_cogs, failed = await dl._install_cogs(cogs)
+                if hasattr(dl, "_save_to_installed"):
+                    await dl._save_to_installed(installed_cogs)
+                if failed:
+                    raise RpcError(INTERNAL_ERROR, f"Installation fehlgeschlagen: {cog_name}")
+            except RpcError:
+                raise
+            except Exception as e:
+                raise RpcError(INTERNAL_ERROR, f"Installation fehlgeschlagen: {e}")
+        invalidate_catalogue()
+        gateway.audit("downloader.cog_install", ctx, {"repo": repo_name, "cog": cog_name})
+        return {"ok": True, "cog": cog_name, "hint": "Mit cogs.set/load aktivieren."}
+
+    return await _maybe_background(gateway, ctx, params, "downloader.cog_install", work,
+                                   {"repo": repo_name, "cog": cog_name})
 
 
 @dispatcher.method("downloader.cog_uninstall")
@@ -1420,8 +1937,13 @@ async def downloader_cog_uninstall(gateway: Any, params: Dict[str, Any]) -> Dict
     cog_name = str((params.get("args") or {}).get("cog", "")).strip()
     if not cog_name:
         raise RpcError(INVALID_PARAMS, "cog erforderlich")
-    async with _downloader_lock:  # serialise with other Downloader operations
-        return await _do_cog_uninstall(gateway, dl, cog_name, ctx)
+
+    async def work() -> Dict[str, Any]:
+        async with _downloader_lock.write():  # serialise with other Downloader operations
+            return await _do_cog_uninstall(gateway, dl, cog_name, ctx)
+
+    return await _maybe_background(gateway, ctx, params, "downloader.cog_uninstall", work,
+                                   {"cog": cog_name})
 
 
 async def _do_cog_uninstall(gateway: Any, dl: Any, cog_name: str, ctx: Any) -> Dict[str, Any]:
@@ -1429,6 +1951,7 @@ async def _do_cog_uninstall(gateway: Any, dl: Any, cog_name: str, ctx: Any) -> D
     # 1) Disable slash commands: unloading removes the app commands from the tree;
     #    a sync follows afterwards. Use the real, case-correct extension key.
     pkg = _loaded_pkg_name(bot, cog_name) or cog_name
+    job_progress("unload", cog=cog_name)
     try:
         if pkg in bot.extensions:
             await bot.unload_extension(pkg)  # discord.py 2.x: coroutine!
@@ -1439,6 +1962,7 @@ async def _do_cog_uninstall(gateway: Any, dl: Any, cog_name: str, ctx: Any) -> D
     except Exception:
         pass
     # 2) Remove the installation record (critical part).
+    job_progress("remove", cog=cog_name)
     try:
         installed = await _installed_cogs(dl)
         target = [m for m in installed if m.name == cog_name]
@@ -1482,8 +2006,10 @@ async def _do_cog_uninstall(gateway: Any, dl: Any, cog_name: str, ctx: Any) -> D
             await bot.tree.sync()
         except Exception:
             pass
+        invalidate_catalogue()
 
     asyncio.ensure_future(_bg_sync())
+    invalidate_catalogue()
     gateway.audit("downloader.cog_uninstall", ctx, {"cog": cog_name})
     return {"ok": True, "cog": cog_name}
 
@@ -1564,8 +2090,10 @@ async def settings_set(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
             await g.me.edit(nick=(str(value) or None) if value else None)
         elif field == "admin_roles":
             await bot._config.guild(g).admin_role.set([int(x) for x in (value or [])])
+            invalidate_levels(guild_id=g.id)
         elif field == "mod_roles":
             await bot._config.guild(g).mod_role.set([int(x) for x in (value or [])])
+            invalidate_levels(guild_id=g.id)
         elif field == "embeds":
             await bot._config.guild(g).embeds.set(None if value is None else bool(value))
         else:
@@ -1610,10 +2138,16 @@ async def dashboard_branding(gateway: Any, params: Dict[str, Any]) -> Dict[str,
 
 @dispatcher.method("logs.list")
 async def logs_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Recent in-memory bot log records for the dashboard Log-Viewer (owner only)."""
+    """Recent in-memory bot log records for the dashboard Log-Viewer (owner only).
+
+    ``args.since`` = the ``last_seq`` of an earlier answer returns the records
+    after it, at most ``limit`` of them; with ``truncated: true`` more are
+    waiting and the viewer should call again with the new ``last_seq``. Live
+    updates arrive on the ``logs`` stream channel.
+    """
     ctx = await _build_context(gateway, params)
     await _require(gateway, ctx, "bot_owner")
-    from .logbuffer import level_value, snapshot
+    from .logbuffer import level_value, page
     args = params.get("args") or {}
     min_level = level_value(str(args.get("level", "") or ""))
     query = str(args.get("query", "") or "")
@@ -1622,7 +2156,16 @@ async def logs_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     except Exception:
         limit = 300
     limit = max(1, min(limit, 1000))
-    return {"logs": snapshot(min_level=min_level, query=query, limit=limit)}
+    try:
+        since = max(0, int(args.get("since", 0) or 0))
+    except Exception:
+        since = 0
+    result = page(min_level=min_level, query=query, limit=limit, since=since)
+    return {
+        "logs": result["records"],
+        "last_seq": result["last_seq"],
+        "truncated": result["truncated"],
+    }
 
 
 @dispatcher.method("dashboard.overview")
@@ -1776,21 +2319,48 @@ async def system_info(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         "memory_mb": memory_mb,
         "gateway_host": gateway.host,
         "gateway_port": gateway.port,
+        "gateway_socket": gateway.unix_socket,
+        "gateway_address": gateway.address,
+        "ws_clients": gateway.client_stats() if hasattr(gateway, "client_stats") else [],
+        "ws_subscribers": gateway.subscriber_counts() if hasattr(gateway, "subscriber_counts") else {},
+        "rpc": gateway.metrics.summary() if hasattr(gateway, "metrics") else None,
+        "breakers": gateway.breaker.stats() if hasattr(gateway, "breaker") else [],
+        "limiter": gateway.limiter.stats() if hasattr(gateway, "limiter") else None,
+        "loop": gateway.loop_monitor.summary() if getattr(gateway, "loop_monitor", None) else None,
     }
 
 
 @dispatcher.method("audit.list")
 async def audit_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Audit log (bot owner only): who changed what and when (newest first)."""
+    """Audit log (bot owner only): who changed what and when (newest first).
+
+    Paged via ``args.cursor`` (the ``next_cursor`` of the previous page); optional
+    filters ``user_id``, ``guild_id``, ``action`` (``slash.*`` = prefix), ``since``
+    and ``until`` (unix time).
+    """
     ctx = await _build_context(gateway, params)
     await _require(gateway, ctx, "bot_owner")
     cog = _dashboard_cog(gateway)
-    logs = list(await cog.config.audit_log()) if cog else []
+    store = getattr(cog, "audit_store", None)
+    if store is None:
+        return {"entries": [], "count": 0, "next_cursor": None}
     bot = gateway.bot
     args = params.get("args") or {}
     limit = max(1, min(int(args.get("limit", 200) or 200), 1000))
+    try:
+        page = await store.query(
+            limit=limit,
+            cursor=args.get("cursor"),
+            user=args.get("user_id"),
+            guild=args.get("guild_id"),
+            action=args.get("action"),
+            since=float(args["since"]) if args.get("since") else None,
+            until=float(args["until"]) if args.get("until") else None,
+        )
+    except (TypeError, ValueError):
+        raise RpcError(INVALID_PARAMS, "Ungültiger Filter")
     out = []
-    for e in reversed(logs[-limit:]):  # newest first
+    for e in page["entries"]:
         uid = e.get("user")
         gid = e.get("guild")
         uname = None
@@ -1810,7 +2380,7 @@ async def audit_list(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
             "detail": e.get("detail") or {},
             "time": e.get("time"),
         })
-    return {"entries": out, "count": len(logs)}
+    return {"entries": out, "count": page["count"], "next_cursor": page["next_cursor"]}
 
 
 # ----- Custom Pages -------------------------------------------------------- #
@@ -1920,37 +2490,37 @@ async def _stats_call(gateway: Any, params: Dict[str, Any], method_name: str, *e
     return await fn(*call_args)
 
 
-@dispatcher.method("serverstats.overview")
+@dispatcher.method("serverstats.overview", coalesce=_coalesce_key)
 async def serverstats_overview(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_overview")
 
 
-@dispatcher.method("serverstats.messages")
+@dispatcher.method("serverstats.messages", coalesce=_coalesce_key)
 async def serverstats_messages(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_messages")
 
 
-@dispatcher.method("serverstats.voice")
+@dispatcher.method("serverstats.voice", coalesce=_coalesce_key)
 async def serverstats_voice(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_voice")
 
 
-@dispatcher.method("serverstats.status")
+@dispatcher.method("serverstats.status", coalesce=_coalesce_key)
 async def serverstats_status(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_status")
 
 
-@dispatcher.method("serverstats.invites")
+@dispatcher.method("serverstats.invites", coalesce=_coalesce_key)
 async def serverstats_invites(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_invites")
 
 
-@dispatcher.method("serverstats.activity")
+@dispatcher.method("serverstats.activity", coalesce=_coalesce_key)
 async def serverstats_activity(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_activity")
 
 
-@dispatcher.method("serverstats.commands")
+@dispatcher.method("serverstats.commands", coalesce=_coalesce_key)
 async def serverstats_commands(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_commands")
 
@@ -2026,7 +2596,7 @@ async def announce_send(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return {"ok": True, "message_id": str(msg.id)}
 
 
-@dispatcher.method("serverstats.member_drilldown")
+@dispatcher.method("serverstats.member_drilldown", coalesce=_coalesce_key)
 async def serverstats_member_drilldown(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     args = params.get("args") or {}
     mid = args.get("member_id")
@@ -2041,7 +2611,7 @@ async def serverstats_member_drilldown(gateway: Any, params: Dict[str, Any]) ->
     return await cog.stats_member_drilldown(ctx.guild, member_id, int(args.get("days", 30) or 30))
 
 
-@dispatcher.method("serverstats.channel_drilldown")
+@dispatcher.method("serverstats.channel_drilldown", coalesce=_coalesce_key)
 async def serverstats_channel_drilldown(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     args = params.get("args") or {}
     cid = args.get("channel_id")
@@ -2068,12 +2638,12 @@ async def _stats_guild_only(gateway: Any, params: Dict[str, Any], method_name: s
     return await getattr(cog, method_name)(ctx.guild)
 
 
-@dispatcher.method("serverstats.peaks")
+@dispatcher.method("serverstats.peaks", coalesce=_coalesce_key)
 async def serverstats_peaks(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_call(gateway, params, "stats_peaks")
 
 
-@dispatcher.method("serverstats.heatmap")
+@dispatcher.method("serverstats.heatmap", coalesce=_coalesce_key)
 async def serverstats_heatmap(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     ctx = await _build_context(gateway, params)
     if ctx.guild is None:
@@ -2087,17 +2657,17 @@ async def serverstats_heatmap(gateway: Any, params: Dict[str, Any]) -> Dict[str,
     return await cog.stats_heatmap(ctx.guild, int(args.get("days", 30) or 30), metric)
 
 
-@dispatcher.method("serverstats.now")
+@dispatcher.method("serverstats.now", coalesce=_coalesce_key)
 async def serverstats_now(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_guild_only(gateway, params, "stats_now")
 
 
-@dispatcher.method("serverstats.leaderboard")
+@dispatcher.method("serverstats.leaderboard", coalesce=_coalesce_key)
 async def serverstats_leaderboard(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_guild_only(gateway, params, "stats_leaderboard")
 
 
-@dispatcher.method("serverstats.retention")
+@dispatcher.method("serverstats.retention", coalesce=_coalesce_key)
 async def serverstats_retention(gateway: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     return await _stats_guild_only(gateway, params, "stats_retention")
 
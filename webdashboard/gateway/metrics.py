@@ -0,0 +1,205 @@
+"""RPC metrics of the gateway (dependency-free).
+
+``Dispatcher.dispatch`` reports every call here: count, errors by JSON-RPC code,
+latency (fixed histogram buckets plus a small reservoir of recent samples for
+p50/p95/p99) and the number of calls currently in flight. Time spent waiting for
+a limiter slot is recorded separately (``queue_wait``); the latency includes it. ``render`` produces the
+Prometheus text format for ``GET /api/metrics``, ``summary`` the compact view for
+``system.info``.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds (Prometheus `le`), +Inf is implicit.
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+# Recent samples kept per method for the percentiles.
+RESERVOIR = 1024
+
+
+class _MethodStats:
+    __slots__ = ("count", "timed", "errors", "buckets", "total", "samples", "inflight", "coalesced",
+                 "waited", "wait_buckets", "wait_total", "wait_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.timed = 0  # calls that reached a handler (have a latency)
+        self.errors: Dict[int, int] = {}
+        self.buckets = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=RESERVOIR)
+        self.inflight = 0
+        self.coalesced = 0  # calls answered by another in-flight call (single-flight)
+        self.waited = 0  # handler executions that went through the limiter
+        self.wait_buckets = [0] * len(BUCKETS)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def quantiles(self) -> Dict[float, Optional[float]]:
+        if not self.samples:
+            return {q: None for q in QUANTILES}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(round(q * last)))] for q in QUANTILES}
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._methods: Dict[str, _MethodStats] = {}
+        self.started_at = time.time()
+
+    def _stats(self, method: str) -> _MethodStats:
+        st = self._methods.get(method)
+        if st is None:
+            st = self._methods[method] = _MethodStats()
+        return st
+
+    # ------------------------------------------------------------------ #
+    # Recording (called by the dispatcher)
+    # ------------------------------------------------------------------ #
+    def started(self, method: str) -> float:
+        self._stats(method).inflight += 1
+        return time.perf_counter()
+
+    def finished(self, method: str, started: float, error_code: Optional[int] = None) -> None:
+        elapsed = time.perf_counter() - started
+        st = self._stats(method)
+        st.inflight = max(0, st.inflight - 1)
+        st.count += 1
+        st.timed += 1
+        st.total += elapsed
+        st.samples.append(elapsed)
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                st.buckets[i] += 1
+                break
+        if error_code is not None:
+            st.errors[error_code] = st.errors.get(error_code, 0) + 1
+
+    def error(self, method: str, code: int) -> None:
+        """Counts a call that failed before reaching a handler (e.g. unknown method)."""
+        st = self._stats(method)
+        st.count += 1
+        st.errors[code] = st.errors.get(code, 0) + 1
+
+    def coalesced(self, method: str) -> None:
+        self._stats(method).coalesced += 1
+
+    def queue_wait(self, method: str, seconds: float) -> None:
+        """Time a call waited for a limiter slot (0 if it got one right away)."""
+        st = self._stats(method)
+        st.waited += 1
+        st.wait_total += seconds
+        st.wait_max = max(st.wait_max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                st.wait_buckets[i] += 1
+                break
+
+    # ------------------------------------------------------------------ #
+    # Output
+    # ------------------------------------------------------------------ #
+    def summary(self) -> Dict[str, Any]:
+        """Per-method overview for ``system.info`` (latencies in ms)."""
+        methods = {}
+        for name, st in sorted(self._methods.items()):
+            qs = st.quantiles()
+            methods[name] = {
+                "count": st.count,
+                "errors": sum(st.errors.values()),
+                "inflight": st.inflight,
+                "coalesced": st.coalesced,
+                "wait_avg_ms": _ms(st.wait_total / st.waited) if st.waited else None,
+                "wait_max_ms": _ms(st.wait_max) if st.waited else None,
+                "p50_ms": _ms(qs[0.5]),
+                "p95_ms": _ms(qs[0.95]),
+                "p99_ms": _ms(qs[0.99]),
+            }
+        return {
+            "since": self.started_at,
+            "calls": sum(m["count"] for m in methods.values()),
+            "errors": sum(m["errors"] for m in methods.values()),
+            "inflight": sum(m["inflight"] for m in methods.values()),
+            "methods": methods,
+        }
+
+    def render(self, *, ws_clients: int = 0,
+               subscribers: Optional[Dict[str, int]] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        out: List[str] = []
+        items = sorted(self._methods.items())
+
+        out += ["# HELP dks_dashboard_rpc_requests_total RPC calls per method.",
+                "# TYPE dks_dashboard_rpc_requests_total counter"]
+        out += [f'dks_dashboard_rpc_requests_total{{method="{_esc(n)}"}} {st.count}' for n, st in items]
+
+        out += ["# HELP dks_dashboard_rpc_errors_total RPC errors per method and JSON-RPC code.",
+                "# TYPE dks_dashboard_rpc_errors_total counter"]
+        for n, st in items:
+            for code, cnt in sorted(st.errors.items()):
+                out.append(f'dks_dashboard_rpc_errors_total{{method="{_esc(n)}",code="{code}"}} {cnt}')
+
+        out += ["# HELP dks_dashboard_rpc_coalesced_total RPC calls served by an identical in-flight call.",
+                "# TYPE dks_dashboard_rpc_coalesced_total counter"]
+        out += [f'dks_dashboard_rpc_coalesced_total{{method="{_esc(n)}"}} {st.coalesced}' for n, st in items]
+
+        out += ["# HELP dks_dashboard_rpc_inflight RPC calls currently being processed.",
+                "# TYPE dks_dashboard_rpc_inflight gauge"]
+        out += [f'dks_dashboard_rpc_inflight{{method="{_esc(n)}"}} {st.inflight}' for n, st in items]
+
+        out += ["# HELP dks_dashboard_rpc_duration_seconds RPC handler latency.",
+                "# TYPE dks_dashboard_rpc_duration_seconds histogram"]
+        for n, st in items:
+            label = _esc(n)
+            cumulative = 0
+            for bound, cnt in zip(BUCKETS, st.buckets):
+                cumulative += cnt
+                out.append(f'dks_dashboard_rpc_duration_seconds_bucket{{method="{label}",le="{bound}"}} {cumulative}')
+            out.append(f'dks_dashboard_rpc_duration_seconds_bucket{{method="{label}",le="+Inf"}} {st.timed}')
+            out.append(f'dks_dashboard_rpc_duration_seconds_sum{{method="{label}"}} {st.total:.6f}')
+            out.append(f'dks_dashboard_rpc_duration_seconds_count{{method="{label}"}} {st.timed}')
+
+        out += ["# HELP dks_dashboard_rpc_queue_wait_seconds Time RPC calls waited for a limiter slot.",
+                "# TYPE dks_dashboard_rpc_queue_wait_seconds histogram"]
+        for n, st in items:
+            if not st.waited:
+                continue
+            label = _esc(n)
+            cumulative = 0
+            for bound, cnt in zip(BUCKETS, st.wait_buckets):
+                cumulative += cnt
+                out.append(f'dks_dashboard_rpc_queue_wait_seconds_bucket{{method="{label}",le="{bound}"}} {cumulative}')
+            out.append(f'dks_dashboard_rpc_queue_wait_seconds_bucket{{method="{label}",le="+Inf"}} {st.waited}')
+            out.append(f'dks_dashboard_rpc_queue_wait_seconds_sum{{method="{label}"}} {st.wait_total:.6f}')
+            out.append(f'dks_dashboard_rpc_queue_wait_seconds_count{{method="{label}"}} {st.waited}')
+
+        out += ["# HELP dks_dashboard_rpc_latency_seconds RPC latency percentiles (recent calls).",
+                "# TYPE dks_dashboard_rpc_latency_seconds summary"]
+        for n, st in items:
+            label = _esc(n)
+            for q, v in st.quantiles().items():
+                if v is not None:
+                    out.append(f'dks_dashboard_rpc_latency_seconds{{method="{label}",quantile="{q}"}} {v:.6f}')
+            if st.timed:
+                out.append(f'dks_dashboard_rpc_latency_seconds_sum{{method="{label}"}} {st.total:.6f}')
+                out.append(f'dks_dashboard_rpc_latency_seconds_count{{method="{label}"}} {st.timed}')
+
+        out += ["# HELP dks_dashboard_ws_clients Connected WebSocket clients.",
+                "# TYPE dks_dashboard_ws_clients gauge",
+                f"dks_dashboard_ws_clients {ws_clients}",
+                "# HELP dks_dashboard_ws_subscribers WebSocket subscribers per stream channel.",
+                "# TYPE dks_dashboard_ws_subscribers gauge"]
+        for channel, cnt in sorted((subscribers or {}).items()):
+            out.append(f'dks_dashboard_ws_subscribers{{channel="{_esc(channel)}"}} {cnt}')
+        return "\n".join(out) + "\n"
+
+
+def _ms(v: Optional[float]) -> Optional[float]:
+    return None if v is None else round(v * 1000.0, 2)
+
+
+def _esc(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
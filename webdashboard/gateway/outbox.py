@@ -0,0 +1,156 @@
+"""Per-connection outbound queue for the ``/rpc`` WebSocket.
+
+Every connection gets an ``Outbox``: a bounded queue of pre-serialized frames and
+its own writer task. ``Gateway.publish`` only enqueues, so a slow or stalled
+client never delays other subscribers or the publisher itself.
+
+When a client falls behind, the overflow policy decides what happens to stream
+frames (RPC replies are never dropped):
+
+- ``drop_oldest``: discard the oldest queued stream frame
+- ``coalesce``: discard older queued frames of the same channel (latest wins)
+- ``disconnect``: close the connection
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+log = logging.getLogger("red.dks.webdashboard.gateway")
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+_ids = itertools.count(1)
+
+
+class Outbox:
+    def __init__(self, ws: Any, *, maxsize: int = 256, overflow: str = "drop_oldest",
+                 remote: Optional[str] = None) -> None:
+        self.ws = ws
+        self.id = next(_ids)
+        self.remote = remote
+        self.maxsize = max(1, int(maxsize))
+        self.overflow = overflow if overflow in OVERFLOW_POLICIES else "drop_oldest"
+        # (channel or None for replies, serialized frame)
+        self._queue: Deque[Tuple[Optional[str], str]] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.closed = False
+        # counters (exposed via Gateway.client_stats / system.info)
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self._task = asyncio.create_task(self._writer())
+        # ws.close() started by the "disconnect" policy (referenced until it finishes)
+        self._closer: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------ #
+    # Enqueue
+    # ------------------------------------------------------------------ #
+    def put_reply(self, text: str) -> None:
+        """Queues an RPC response. Never dropped (bounded by ws_max_inflight)."""
+        self._push(None, text)
+
+    def put_stream(self, channel: str, text: str) -> bool:
+        """Queues a stream frame, applying the overflow policy when full.
+
+        Returns False if the client was disconnected because of the policy.
+        """
+        if self.closed:
+            return False
+        if len(self._queue) >= self.maxsize:
+            if self.overflow == "disconnect":
+                log.info("WS-Client %s zu langsam (%d Frames offen) – getrennt",
+                         self.id, len(self._queue))
+                self.dropped += len(self._queue)
+                self._queue.clear()
+                self._closer = asyncio.create_task(self._close_ws())
+                self.closed = True
+                return False
+            if self.overflow == "coalesce":
+                before = len(self._queue)
+                self._queue = deque(item for item in self._queue if item[0] != channel)
+                self.coalesced += before - len(self._queue)
+            if len(self._queue) >= self.maxsize:
+                self._drop_oldest_stream()
+        self._push(channel, text)
+        return True
+
+    def _drop_oldest_stream(self) -> None:
+        for i, (channel, _text) in enumerate(self._queue):
+            if channel is not None:
+                del self._queue[i]
+                self.dropped += 1
+                return
+
+    def _push(self, channel: Optional[str], text: str) -> None:
+        if self.closed:
+            return
+        self._queue.append((channel, text))
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._idle.clear()
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------ #
+    # Writer
+    # ------------------------------------------------------------------ #
+    async def _writer(self) -> None:
+        try:
+            while True:
+                if not self._queue:
+                    self._idle.set()
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _channel, text = self._queue.popleft()
+                await self.ws.send_str(text)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            log.debug("WS-Writer %s beendet", self.id, exc_info=True)
+            self.closed = True
+            self._queue.clear()
+            self._idle.set()
+
+    async def _close_ws(self) -> None:
+        try:
+            await self.ws.close()
+        except Exception:
+            pass
+
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Waits until everything queued so far has been written."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def close(self) -> None:
+        self.closed = True
+        self._queue.clear()
+        self._task.cancel()
+
+    # ------------------------------------------------------------------ #
+    # Introspection
+    # ------------------------------------------------------------------ #
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "remote": self.remote,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "overflow": self.overflow,
+        }
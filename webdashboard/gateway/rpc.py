@@ -2,11 +2,24 @@
 
 Supports request/response as well as server-side notifications (for push streams
 such as live logs). Methods are registered as ``async def handler(gateway, ctx, params)``.
+
+Read-only methods can opt into single-flight coalescing with
+``@dispatcher.method(name, coalesce=key_func)``: ``await key_func(gateway, params)``
+returns a hashable key (or None to run normally), and concurrent calls with the
+same key share one execution and its result (or error).
+
+If the gateway has a ``limiter`` (:class:`~.limiter.FairLimiter`), every handler
+execution takes one of its slots, keyed by ``params["auth"]["user_id"]``; calls
+that would overflow its queues fail with ``BUSY``. Coalesced followers run no
+handler and therefore take no slot.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from .limiter import Busy
 
 log = logging.getLogger("red.dks.webdashboard.rpc")
 
@@ -19,8 +32,13 @@ INTERNAL_ERROR = -32603
 # application-specific
 UNAUTHORIZED = -32000
 FORBIDDEN = -32001
+TIMEOUT = -32002
+CONTRIBUTION_ERROR = -32003  # a cog's dashboard handler raised
+CIRCUIT_OPEN = -32004        # contribution short-circuited after repeated failures
+BUSY = -32005                # RPC queues full, retry later
 
 Handler = Callable[..., Awaitable[Any]]
+KeyFunc = Callable[[Any, Dict[str, Any]], Awaitable[Optional[Hashable]]]
 
 
 class RpcError(Exception):
@@ -34,15 +52,23 @@ class RpcError(Exception):
 class Dispatcher:
     def __init__(self) -> None:
         self._methods: Dict[str, Handler] = {}
+        # method name -> coalescing key function (opt-in, read-only methods only)
+        self._coalesce: Dict[str, KeyFunc] = {}
+        # coalescing key -> future of the running ("leader") call
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
 
-    def method(self, name: str) -> Callable[[Handler], Handler]:
+    def method(self, name: str, *, coalesce: Optional[KeyFunc] = None) -> Callable[[Handler], Handler]:
         def deco(func: Handler) -> Handler:
-            self._methods[name] = func
+            self.register(name, func, coalesce=coalesce)
             return func
         return deco
 
-    def register(self, name: str, func: Handler) -> None:
+    def register(self, name: str, func: Handler, *, coalesce: Optional[KeyFunc] = None) -> None:
         self._methods[name] = func
+        if coalesce is not None:
+            self._coalesce[name] = coalesce
+        else:
+            self._coalesce.pop(name, None)
 
     async def dispatch(self, gateway: Any, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Processes a single JSON-RPC message and returns the response."""
@@ -55,22 +81,126 @@ class Dispatcher:
         method_name = message["method"]
         params = message.get("params") or {}
         handler = self._methods.get(method_name)
+        metrics = getattr(gateway, "metrics", None)
         if handler is None:
+            if metrics is not None:
+                # one bucket for all unknown names (label cardinality)
+                metrics.error("<unknown>", METHOD_NOT_FOUND)
             return _error(req_id, METHOD_NOT_FOUND, f"Methode '{method_name}' unbekannt")
 
+        started = metrics.started(method_name) if metrics is not None else 0.0
+        error_code: Optional[int] = None
         try:
-            result = await handler(gateway, params)
+            result = await self._call(method_name, handler, gateway, params)
         except RpcError as e:
+            error_code = e.code
             log.debug("RPC-Fehler bei %s: %s", method_name, e.message)
             return _error(req_id, e.code, e.message, e.data)
         except Exception as e:  # pragma: no cover - defensive
+            error_code = INTERNAL_ERROR
             log.exception("Interner Fehler bei Methode %s", method_name)
             return _error(req_id, INTERNAL_ERROR, str(e))
+        finally:
+            if metrics is not None:
+                metrics.finished(method_name, started, error_code)
 
         if is_notification:
             return None
         return {"jsonrpc": "2.0", "id": req_id, "result": result}
 
+    async def _call(self, method_name: str, handler: Handler, gateway: Any,
+                    params: Dict[str, Any]) -> Any:
+        key_func = self._coalesce.get(method_name)
+        key = None
+        if key_func is not None:
+            try:
+                key = await key_func(gateway, params)
+            except Exception:
+                key = None  # no key -> run on its own; the handler reports errors
+        if key is None:
+            return await self._run(method_name, handler, gateway, params)
+        key = (method_name, key)
+
+        running = self._inflight.get(key)
+        if running is not None:
+            metrics = getattr(gateway, "metrics", None)
+            if metrics is not None:
+                metrics.coalesced(method_name)
+            try:
+                return await asyncio.shield(running)
+            except asyncio.CancelledError:
+                if not running.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                return await self._run(method_name, handler, gateway, params)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await self._run(method_name, handler, gateway, params)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved: without followers nobody awaits it
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    async def _run(self, method_name: str, handler: Handler, gateway: Any,
+                   params: Dict[str, Any]) -> Any:
+        """Runs the handler inside a limiter slot (if the gateway has a limiter)."""
+        limiter = getattr(gateway, "limiter", None)
+        if limiter is None:
+            return await handler(gateway, params)
+        auth = params.get("auth") if isinstance(params, dict) else None
+        user = auth.get("user_id") if isinstance(auth, dict) else None
+        if user is not None:
+            user = str(user)  # 123 and "123" are the same user (one bucket)
+        try:
+            waited = await limiter.acquire(user)
+        except Busy:
+            raise RpcError(BUSY, "Dashboard ausgelastet, bitte später erneut versuchen",
+                           {"retry_after": 1})
+        try:
+            metrics = getattr(gateway, "metrics", None)
+            if metrics is not None:
+                metrics.queue_wait(method_name, waited)
+            return await handler(gateway, params)
+        finally:
+            limiter.release(user)
+
+    async def dispatch_batch(
+        self, gateway: Any, messages: List[Any], *, concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Processes a JSON-RPC batch concurrently (at most ``concurrency`` at a time).
+
+        Responses keep the order of the requests (each carries its own ``id``);
+        notifications produce none. A failing call only yields its own error
+        response and never cancels its siblings.
+        """
+        sem = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def _one(message: Any) -> Optional[Dict[str, Any]]:
+            if not isinstance(message, dict):
+                return _error(None, INVALID_REQUEST, "Ungültige JSON-RPC-2.0-Anfrage")
+            async with sem:
+                return await self.dispatch(gateway, message)
+
+        results = await asyncio.gather(*(_one(m) for m in messages), return_exceptions=True)
+        out: List[Dict[str, Any]] = []
+        for message, res in zip(messages, results):
+            if isinstance(res, BaseException):  # pragma: no cover - dispatch catches all
+                req_id = message.get("id") if isinstance(message, dict) else None
+                out.append(_error(req_id, INTERNAL_ERROR, str(res)))
+            elif res is not None:
+                out.append(res)
+        return out
+
 
 def _error(req_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
     err = {"code": code, "message": message}
@@ -0,0 +1,90 @@
+"""Reader/writer lock for asyncio (dependency-free).
+
+Any number of readers may hold the lock together; a writer holds it alone.
+Waiters are served in arrival order: a reader that arrives while a writer is
+waiting queues behind that writer, so writers are never starved and a read
+issued after a click on "install" sees the installed state.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from typing import AsyncIterator, Deque, Tuple
+
+
+class RWLock:
+    def __init__(self) -> None:
+        self._readers = 0
+        self._writer = False
+        # (is_writer, future) in arrival order
+        self._waiters: Deque[Tuple[bool, asyncio.Future]] = deque()
+
+    @property
+    def locked(self) -> bool:
+        """True while a writer holds the lock."""
+        return self._writer
+
+    @contextlib.asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        await self._acquire(False)
+        try:
+            yield
+        finally:
+            self._readers -= 1
+            self._wake()
+
+    @contextlib.asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        await self._acquire(True)
+        try:
+            yield
+        finally:
+            self._writer = False
+            self._wake()
+
+    async def _acquire(self, writer: bool) -> None:
+        if not self._waiters and not self._writer and (not writer or self._readers == 0):
+            self._grant(writer)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        entry = (writer, fut)
+        self._waiters.append(entry)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # granted just before the cancellation: hand it back
+                if writer:
+                    self._writer = False
+                else:
+                    self._readers -= 1
+            else:
+                try:
+                    self._waiters.remove(entry)
+                except ValueError:
+                    pass  # already dropped by _wake
+            self._wake()
+            raise
+
+    def _grant(self, writer: bool) -> None:
+        if writer:
+            self._writer = True
+        else:
+            self._readers += 1
+
+    def _wake(self) -> None:
+        # Admit the head of the line: one writer, or every reader up to the next writer.
+        while self._waiters and not self._writer:
+            writer, fut = self._waiters[0]
+            if fut.done():
+                # cancelled while queued; its task cleans up on its own
+                self._waiters.popleft()
+                continue
+            if writer and self._readers:
+                return
+            self._waiters.popleft()
+            self._grant(writer)
+            fut.set_result(None)
+            if writer:
+                return
@@ -3,49 +3,105 @@
 - WebSocket ``/rpc``  : JSON-RPC 2.0 (request/response + server push for streams)
 - REST ``/api/health``: liveness without auth
 - REST ``/api/manifest``: convenient GET mirror of ``manifest.get``
+- stream channel ``logs``: new log records, batched (see ``_log_publisher``)
+- stream channel ``loop``: event-loop stalls + lag summary (see ``loopmon.py``)
+- stream channel ``jobs``: state/progress of background jobs (see ``jobs.py``)
 
 Auth between BFF and gateway via a shared secret (constant-time comparison).
-Default binding: 127.0.0.1 (localhost only).
+Default binding: 127.0.0.1 (localhost only). Alternatively a Unix domain socket
+(``unix_socket``) for a BFF on the same host: no TCP port at all, access is
+controlled by the socket file's mode.
 """
 from __future__ import annotations
 
 import asyncio
 import hmac
-import json
 import logging
+import os
+import socket
+import stat
 import time
-from typing import Any, Dict, Optional, Set
+from typing import Any, Coroutine, Dict, Optional, Set
 
 from aiohttp import WSMsgType, web
 
-from .methods import dispatcher
-from .rpc import UNAUTHORIZED
+from ..cache import TTLCache
+from . import jsonenc, logbuffer
+from .breaker import CircuitBreaker
+from .jobs import JobQueue
+from .limiter import FairLimiter
+from .methods import command_catalogue, dispatcher, manifest_for
+from .metrics import Metrics
+from .outbox import Outbox
+from .rpc import UNAUTHORIZED, RpcError
 
 log = logging.getLogger("red.dks.webdashboard.gateway")
 
+# Max. log records per "logs" stream frame (the rest is reported as truncated).
+_LOG_BATCH = 200
+
 
 class Gateway:
     def __init__(self, bot: Any, registry: Any, *, token: str, host: str = "127.0.0.1",
-                 port: int = 6970, audit_sink=None) -> None:
+                 port: int = 6970, audit_sink=None, tuning: Optional[Dict[str, Any]] = None,
+                 loop_monitor: Any = None, unix_socket: Optional[str] = None,
+                 unix_mode: int = 0o660) -> None:
         self.bot = bot
         self.registry = registry
         self.token = token
         self.host = host
         self.port = port
+        # Serve on this Unix socket path instead of host:port (see start).
+        self.unix_socket = unix_socket
+        self.unix_mode = unix_mode
         self._audit_sink = audit_sink
+        # Runtime knobs (see WebDashboard.DEFAULT_TUNING / `[p]dksdashboard tune`).
+        self.tuning: Dict[str, Any] = dict(tuning or {})
+        # widget.data results: (contribution key, guild id, level, locale) -> response.
+        # TTL per entry = the widget's `refresh`, else tuning["widget_cache_ttl"].
+        self.widget_cache = TTLCache(ttl=float(self.tuning.get("widget_cache_ttl", 30)), maxsize=4096)
+        # Per-method call counts, errors and latencies (filled by Dispatcher.dispatch).
+        self.metrics = Metrics()
+        # Timeouts/failures per contribution + last good read result (see methods._run_contribution)
+        self.breaker = CircuitBreaker(
+            threshold=int(self.tuning.get("breaker_threshold", 5)),
+            cooldown=float(self.tuning.get("breaker_cooldown", 30)),
+        )
+        self.stale_cache = TTLCache(ttl=3600, maxsize=4096)
+        # Concurrent handler executions, per user and overall, with fair queuing (see rpc._run)
+        self.limiter = FairLimiter(
+            global_limit=int(self.tuning.get("rpc_global_limit", 32)),
+            user_limit=int(self.tuning.get("rpc_user_limit", 4)),
+            max_queue=int(self.tuning.get("rpc_queue_max", 256)),
+            user_queue=int(self.tuning.get("rpc_user_queue", 64)),
+        )
 
         self.app = web.Application(middlewares=[self._auth_middleware])
         self.app.add_routes([
             web.get("/api/health", self._health),
             web.get("/api/manifest", self._manifest_rest),
+            web.get("/api/commands", self._commands_rest),
+            web.get("/api/metrics", self._metrics_rest),
             web.post("/rpc", self._rpc_post),   # request/response (BFF)
             web.get("/rpc", self._ws_handler),  # streams/push (live logs, stats)
         ])
         self._runner: Optional[web.AppRunner] = None
         self.started_at: Optional[float] = None
         self._ws_clients: Set[web.WebSocketResponse] = set()
+        # Outbound queue + writer task per WebSocket (see outbox.py)
+        self._outboxes: Dict[web.WebSocketResponse, Outbox] = {}
         # Channel subscriptions: channel -> set(ws)
         self._subscriptions: Dict[str, Set[web.WebSocketResponse]] = {}
+        # Calls of disconnected WebSockets, left to finish (their replies are dropped)
+        self._detached: Set[asyncio.Task] = set()
+        # Fire-and-forget tasks (see _spawn); the loop only holds tasks weakly
+        self._background: Set[asyncio.Task] = set()
+        self._log_task: Optional[asyncio.Task] = None
+        # Event-loop lag monitor owned by the cog (see loopmon.py); streamed on "loop".
+        self.loop_monitor = loop_monitor
+        self._loop_task: Optional[asyncio.Task] = None
+        # Long-running RPCs submitted with args.background; pushed on "jobs".
+        self.jobs = JobQueue(self.publish)
 
     # ------------------------------------------------------------------ #
     # Lifecycle
@@ -53,12 +109,31 @@ class Gateway:
     async def start(self) -> None:
         self._runner = web.AppRunner(self.app)
         await self._runner.setup()
-        site = web.TCPSite(self._runner, self.host, self.port)
-        await site.start()
+        if self.unix_socket:
+            _remove_stale_socket(self.unix_socket)
+            sock = _bind_unix_socket(self.unix_socket, self.unix_mode)
+            site = web.SockSite(self._runner, sock)
+            await site.start()
+        else:
+            site = web.TCPSite(self._runner, self.host, self.port)
+            await site.start()
         self.started_at = time.time()
-        log.info("RPC-Gateway läuft auf http://%s:%s", self.host, self.port)
+        self._log_task = asyncio.create_task(self._log_publisher())
+        if self.loop_monitor is not None:
+            self.loop_monitor.add_listener(self._on_loop_stall)
+            self._loop_task = asyncio.create_task(self._loop_publisher())
+        log.info("RPC-Gateway läuft auf %s", self.address)
 
     async def stop(self) -> None:
+        self.jobs.stop()
+        if self._log_task is not None:
+            self._log_task.cancel()
+            self._log_task = None
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            self._loop_task = None
+        if self.loop_monitor is not None:
+            self.loop_monitor.remove_listener(self._on_loop_stall)
         for ws in list(self._ws_clients):
             try:
                 await ws.close()
@@ -66,8 +141,17 @@ class Gateway:
                 pass
         if self._runner is not None:
             await self._runner.cleanup()
+        if self.unix_socket:
+            _remove_stale_socket(self.unix_socket)
         log.info("RPC-Gateway gestoppt")
 
+    @property
+    def address(self) -> str:
+        """Where the gateway listens, for logs and status output."""
+        if self.unix_socket:
+            return f"unix:{self.unix_socket}"
+        return f"http://{self.host}:{self.port}"
+
     # ------------------------------------------------------------------ #
     # Auth
     # ------------------------------------------------------------------ #
@@ -91,6 +175,17 @@ class Gateway:
     # ------------------------------------------------------------------ #
     # REST
     # ------------------------------------------------------------------ #
+    def _json_response(self, payload: Any = None, *, text: Optional[str] = None, status: int = 200,
+                       headers: Optional[Dict[str, str]] = None) -> web.Response:
+        """JSON response via jsonenc; bodies from `gzip_min_bytes` on are compressed
+        (gzip/deflate, whichever the client accepts)."""
+        if text is None:
+            text = jsonenc.dumps(payload)
+        resp = web.Response(text=text, status=status, content_type="application/json", headers=headers)
+        if len(text) >= int(self.tuning.get("gzip_min_bytes", 4096)):
+            resp.enable_compression()
+        return resp
+
     async def _health(self, request: web.Request) -> web.Response:
         return web.json_response({
             "status": "ok",
@@ -102,82 +197,163 @@ class Gateway:
         # auth already handled via middleware; user context via query/header
         user_id = request.headers.get("X-User-Id")
         guild_id = request.headers.get("X-Guild-Id")
-        params = {"auth": {"user_id": user_id, "guild_id": guild_id}}
-        result = await dispatcher.dispatch(self, {
-            "jsonrpc": "2.0", "id": 1, "method": "manifest.get", "params": params,
-        })
-        return web.json_response(result)
+        auth = {"user_id": user_id, "guild_id": guild_id}
+        locale = request.headers.get("X-Locale") or request.query.get("locale")
+        if locale:
+            auth["locale"] = locale
+        try:
+            _payload, text, etag = await manifest_for(self, {"auth": auth})
+        except RpcError as e:
+            return self._json_response({"jsonrpc": "2.0", "id": 1,
+                                        "error": {"code": e.code, "message": e.message}})
+        # Conditional GET: the BFF sends the last ETag and gets a bodyless 304.
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        # Pre-serialized payload, only wrapped into the JSON-RPC envelope.
+        return self._json_response(
+            text='{"jsonrpc": "2.0", "id": 1, "result": ' + text + "}",
+            headers={"ETag": etag},
+        )
+
+    async def _commands_rest(self, request: web.Request) -> web.Response:
+        # REST mirror of core.commands (cached catalogue, conditional GET like /api/manifest)
+        params = {
+            "locale": request.headers.get("X-Locale") or request.query.get("locale"),
+            "include_orphans": request.query.get("include_orphans") in ("1", "true"),
+        }
+        _payload, text, etag = await command_catalogue(self, params)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return self._json_response(
+            text='{"jsonrpc": "2.0", "id": 1, "result": ' + text + "}",
+            headers={"ETag": etag},
+        )
+
+    async def _metrics_rest(self, request: web.Request) -> web.Response:
+        # Prometheus scrape target; token-protected like every /api/* route.
+        return web.Response(
+            text=self.metrics.render(ws_clients=len(self._ws_clients),
+                                     subscribers=self.subscriber_counts()),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
 
     async def _rpc_post(self, request: web.Request) -> web.Response:
         """HTTP variant of the JSON-RPC dispatcher (request/response).
 
-        Expects a single JSON-RPC 2.0 request in the body. Auth via middleware.
+        Expects a single JSON-RPC 2.0 request or a batch (array) in the body.
+        Auth via middleware.
         """
         try:
-            data = await request.json()
+            data = await request.json(loads=jsonenc.loads)
         except Exception:
-            return web.json_response(
+            return self._json_response(
                 {"jsonrpc": "2.0", "id": None,
                  "error": {"code": -32700, "message": "parse error"}}, status=400)
-        if isinstance(data, list):  # Batch
-            results = [r for r in
-                       [await dispatcher.dispatch(self, m) for m in data] if r is not None]
-            return web.json_response(results)
+        if isinstance(data, list):  # Batch – dispatched concurrently, capped per batch
+            results = await dispatcher.dispatch_batch(
+                self, data, concurrency=int(self.tuning.get("batch_concurrency", 8)))
+            return self._json_response(results)
         response = await dispatcher.dispatch(self, data)
-        return web.json_response(response if response is not None else {})
+        return self._json_response(response if response is not None else {})
 
     # ------------------------------------------------------------------ #
     # WebSocket / JSON-RPC
     # ------------------------------------------------------------------ #
     async def _ws_handler(self, request: web.Request) -> web.WebSocketResponse:
-        ws = web.WebSocketResponse(heartbeat=30)
+        # permessage-deflate is negotiated when the client offers it (tuning ws_compress).
+        ws = web.WebSocketResponse(heartbeat=30, compress=bool(self.tuning.get("ws_compress", True)))
         await ws.prepare(request)
 
         authenticated = False
         self._ws_clients.add(ws)
+        # All frames of this connection (replies + stream pushes) go through its
+        # outbox; the writer task puts them on the wire one at a time.
+        outbox = Outbox(
+            ws,
+            maxsize=int(self.tuning.get("ws_queue_size", 256)),
+            overflow=str(self.tuning.get("ws_overflow", "drop_oldest")),
+            remote=request.remote,
+        )
+        self._outboxes[ws] = outbox
+        # Pipelining: every request frame is dispatched as its own task, so one slow
+        # call (downloader.*, serverstats.retention) no longer blocks cheap ones
+        # behind it. Responses carry the request's JSON-RPC id and may therefore
+        # arrive out of order. At most `ws_max_inflight` calls run per connection;
+        # reading pauses while that limit is reached.
+        inflight = asyncio.Semaphore(max(1, int(self.tuning.get("ws_max_inflight", 16))))
+        pending: Set[asyncio.Task] = set()
+
+        async def send(payload: Any) -> None:
+            outbox.put_reply(jsonenc.dumps(payload))
+
+        async def run(data: Any) -> None:
+            try:
+                if isinstance(data, list):
+                    response = await dispatcher.dispatch_batch(
+                        self, data, concurrency=int(self.tuning.get("batch_concurrency", 8)))
+                else:
+                    response = await dispatcher.dispatch(self, data)
+                if response and not ws.closed:
+                    await send(response)
+            except Exception:
+                log.debug("WS-Antwort konnte nicht gesendet werden", exc_info=True)
+            finally:
+                inflight.release()
+
         try:
             async for msg in ws:
                 if msg.type != WSMsgType.TEXT:
                     continue
                 try:
-                    data = json.loads(msg.data)
-                except json.JSONDecodeError:
-                    await ws.send_json({"jsonrpc": "2.0", "id": None,
-                                        "error": {"code": -32700, "message": "parse error"}})
+                    data = jsonenc.loads(msg.data)
+                except ValueError:
+                    await send({"jsonrpc": "2.0", "id": None,
+                                "error": {"code": -32700, "message": "parse error"}})
                     continue
+                frame = data if isinstance(data, dict) else {}
 
                 # first frame must be connection_init with token
                 if not authenticated:
-                    if data.get("method") == "connection_init" and \
-                            self._check_token((data.get("params") or {}).get("token")):
+                    if frame.get("method") == "connection_init" and \
+                            self._check_token((frame.get("params") or {}).get("token")):
                         authenticated = True
-                        await ws.send_json({"jsonrpc": "2.0", "id": data.get("id"),
-                                            "result": {"ok": True}})
+                        await send({"jsonrpc": "2.0", "id": frame.get("id"),
+                                    "result": {"ok": True}})
                         continue
-                    await ws.send_json({"jsonrpc": "2.0", "id": data.get("id"),
-                                        "error": {"code": UNAUTHORIZED, "message": "unauthorized"}})
+                    await send({"jsonrpc": "2.0", "id": frame.get("id"),
+                                "error": {"code": UNAUTHORIZED, "message": "unauthorized"}})
+                    await outbox.flush()
                     await ws.close()
                     break
 
-                # subscription control for push streams
-                method = data.get("method")
+                # subscription control for push streams – handled inline, i.e. strictly
+                # in the order the frames arrive
+                method = frame.get("method")
                 if method == "subscribe":
-                    channel = (data.get("params") or {}).get("channel")
+                    channel = (frame.get("params") or {}).get("channel")
                     self._subscriptions.setdefault(channel, set()).add(ws)
-                    await ws.send_json({"jsonrpc": "2.0", "id": data.get("id"),
-                                        "result": {"subscribed": channel}})
+                    await send({"jsonrpc": "2.0", "id": frame.get("id"),
+                                "result": {"subscribed": channel}})
                     continue
                 if method == "unsubscribe":
-                    channel = (data.get("params") or {}).get("channel")
+                    channel = (frame.get("params") or {}).get("channel")
                     self._subscriptions.get(channel, set()).discard(ws)
-                    await ws.send_json({"jsonrpc": "2.0", "id": data.get("id"),
-                                        "result": {"unsubscribed": channel}})
+                    await send({"jsonrpc": "2.0", "id": frame.get("id"),
+                                "result": {"unsubscribed": channel}})
                     continue
 
-                response = await dispatcher.dispatch(self, data)
-                if response is not None:
-                    await ws.send_json(response)
+                await inflight.acquire()
+                task = asyncio.create_task(run(data))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
         finally:
+            # Don't cancel in-flight calls on disconnect: a panel.submit or install cut
+            # off mid-write is worse than a finished one nobody reads the reply of.
+            for task in pending:
+                self._detached.add(task)
+                task.add_done_callback(self._detached.discard)
+            outbox.close()
+            self._outboxes.pop(ws, None)
             self._ws_clients.discard(ws)
             for subs in self._subscriptions.values():
                 subs.discard(ws)
@@ -187,20 +363,109 @@ class Gateway:
     # Push / streams (e.g. live logs, stats)
     # ------------------------------------------------------------------ #
     async def publish(self, channel: str, payload: Any) -> None:
-        """Sends a notification to all subscribers of a channel."""
+        """Sends a notification to all subscribers of a channel.
+
+        Serializes the frame once and only enqueues it per subscriber; delivery
+        happens in each connection's writer task, so this never waits on a
+        slow client.
+        """
         subs = self._subscriptions.get(channel)
         if not subs:
             return
         message = {"jsonrpc": "2.0", "method": "stream", "params":
                    {"channel": channel, "data": payload}}
-        dead = []
-        for ws in subs:
+        text = jsonenc.dumps(message)
+        for ws in list(subs):
+            outbox = self._outboxes.get(ws)
+            if outbox is None or outbox.closed or ws.closed:
+                subs.discard(ws)
+                continue
+            if not outbox.put_stream(channel, text):
+                subs.discard(ws)
+
+    async def _log_publisher(self) -> None:
+        """Pushes new log records to the "logs" channel, batched once per interval.
+
+        Frame data: ``{"records": [...oldest first], "last_seq", "truncated"}``;
+        ``last_seq`` is the ``since`` cursor for a later ``logs.list``.
+        """
+        interval = max(0.1, float(self.tuning.get("log_stream_interval", 1.0)))
+        last = logbuffer.last_seq()
+        while True:
+            await asyncio.sleep(interval)
+            newest = logbuffer.last_seq()
+            if newest <= last:
+                continue
+            if not self._subscriptions.get("logs"):
+                last = newest  # nobody listening: don't build up a backlog
+                continue
+            records = logbuffer.snapshot(since=last, limit=_LOG_BATCH)
+            if not records:
+                last = newest
+                continue
+            records.reverse()
+            newest = records[-1]["seq"]
             try:
-                await ws.send_json(message)
+                await self.publish("logs", {
+                    "records": records,
+                    "last_seq": newest,
+                    "truncated": records[0]["seq"] > last + 1,
+                })
             except Exception:
-                dead.append(ws)
-        for ws in dead:
-            subs.discard(ws)
+                log.debug("Log-Stream fehlgeschlagen", exc_info=True)
+            last = newest
+
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Runs ``coro`` in the background, keeping the task referenced until done."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _on_loop_stall(self, stall: Dict[str, Any]) -> None:
+        if self._subscriptions.get("loop"):
+            self._spawn(self.publish("loop", {"stall": stall}))
+
+    async def _loop_publisher(self) -> None:
+        """Pushes the loop-lag summary to the "loop" channel every 5 s (stalls immediately)."""
+        while True:
+            await asyncio.sleep(5)
+            if self._subscriptions.get("loop"):
+                try:
+                    await self.publish("loop", {"summary": self.loop_monitor.summary()})
+                except Exception:
+                    log.debug("Loop-Stream fehlgeschlagen", exc_info=True)
+
+    def subscriber_counts(self) -> Dict[str, int]:
+        """Number of WebSocket subscribers per stream channel."""
+        return {str(ch): len(subs) for ch, subs in self._subscriptions.items() if subs}
+
+    def client_stats(self) -> list:
+        """Queue counters of every connected WebSocket client."""
+        out = []
+        for ws, outbox in list(self._outboxes.items()):
+            entry = outbox.stats()
+            entry["subscriptions"] = sorted(
+                str(ch) for ch, subs in self._subscriptions.items() if ws in subs)
+            out.append(entry)
+        return out
+
+    # ------------------------------------------------------------------ #
+    # Caches
+    # ------------------------------------------------------------------ #
+    def invalidate_widgets(self, cog_name: str, identifier: Optional[str] = None) -> int:
+        """Drops cached widget data (and stale fallbacks) of a cog or one of its widgets."""
+        if identifier is not None:
+            key = f"{cog_name}:{identifier}"
+
+            def match(k: Any) -> bool:
+                return k[0] == key
+        else:
+            prefix = f"{cog_name}:"
+
+            def match(k: Any) -> bool:
+                return str(k[0]).startswith(prefix)
+        self.stale_cache.invalidate(match)
+        return self.widget_cache.invalidate(match)
 
     # ------------------------------------------------------------------ #
     # Audit
@@ -216,6 +481,35 @@ class Gateway:
         log.info("AUDIT %s", entry)
         if self._audit_sink is not None:
             try:
-                asyncio.create_task(self._audit_sink(entry))
+                self._spawn(self._audit_sink(entry))
             except Exception:
                 pass
+
+
+def _bind_unix_socket(path: str, mode: int) -> socket.socket:
+    """Binds (but doesn't listen on) a Unix socket that has ``mode`` from the start.
+
+    The umask is tightened only for the synchronous bind and the mode is set
+    before SockSite starts listening, so there is no moment in which the socket
+    accepts connections under the process umask.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o777 & ~mode)
+    try:
+        sock.bind(path)
+    except BaseException:
+        sock.close()
+        raise
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, mode)
+    return sock
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Deletes a socket file left behind by a previous run (never a regular file)."""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
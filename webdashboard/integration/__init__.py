@@ -6,7 +6,8 @@ Third-party cogs import from here::
         DashboardIntegration, dashboard_widget, dashboard_panel, dashboard_page,
         DashboardContext, WidgetData, PanelSchema, PageSchema,
         Field, Component, SubmitResult,
-        register_dashboard, unregister_dashboard, DASHBOARD_AVAILABLE,
+        register_dashboard, unregister_dashboard, invalidate_dashboard,
+        DASHBOARD_AVAILABLE,
     )
 """
 from .base import DashboardIntegration
@@ -36,6 +37,7 @@ from .models import (
 from .registry import Contribution, Registry
 from .dropin import (
     DASHBOARD_AVAILABLE,
+    invalidate_dashboard,
     register_dashboard,
     unregister_dashboard,
 )
@@ -65,5 +67,6 @@ __all__ = [
     "Contribution",
     "register_dashboard",
     "unregister_dashboard",
+    "invalidate_dashboard",
     "DASHBOARD_AVAILABLE",
 ]
@@ -27,6 +27,7 @@ class _ContributionMeta:
         description: Optional[str] = None,
         icon: Optional[str] = None,
         extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
     ) -> None:
         self.kind = kind
         self.identifier = identifier
@@ -35,12 +36,16 @@ class _ContributionMeta:
         self.description = description
         self.icon = icon
         self.extra = extra or {}
+        # time limit of the read handler in seconds (None = gateway default)
+        self.timeout = timeout
         # set for panels
         self.submit_handler: Optional[Callable] = None
         # set for lists
         self.delete_handler: Optional[Callable] = None
         self.edit_handler: Optional[Callable] = None
         self.edit_form_handler: Optional[Callable] = None
+        # lists: handler pages/sorts/filters itself (see dashboard_list)
+        self.paginated = False
 
     def manifest(self, locale: Optional[str] = None) -> dict:
         # name/description may be localized (str or {locale: str}); resolve against
@@ -67,13 +72,14 @@ def dashboard_widget(
     scope: str = "guild",        # guild | global
     description: Optional[str] = None,
     icon: Optional[str] = None,
+    timeout: Optional[float] = None,  # s; handler time limit (default: gateway tuning)
 ) -> Callable:
     """Registers a method as a board widget."""
 
     def decorator(func: Callable) -> Callable:
         meta = _ContributionMeta(
             "widget", identifier, name,
-            permission=permission, description=description, icon=icon,
+            permission=permission, description=description, icon=icon, timeout=timeout,
             extra={"size": size, "refresh": refresh, "scope": scope},
         )
         setattr(func, WIDGET_ATTR, meta)
@@ -92,6 +98,7 @@ def dashboard_panel(
     description: Optional[str] = None,
     icon: Optional[str] = None,
     order: int = 100,  # tab order within the module (smaller = further left)
+    timeout: Optional[float] = None,  # s; handler time limit (default: gateway tuning)
 ) -> Callable:
     """Registers a method as a contextual panel (form).
 
@@ -101,7 +108,7 @@ def dashboard_panel(
     def decorator(func: Callable) -> Callable:
         meta = _ContributionMeta(
             "panel", identifier, name,
-            permission=permission, description=description, icon=icon,
+            permission=permission, description=description, icon=icon, timeout=timeout,
             extra={"mount": mount, "scope": scope, "order": order},
         )
         setattr(func, PANEL_ATTR, meta)
@@ -128,19 +135,28 @@ def dashboard_list(
     description: Optional[str] = None,
     icon: Optional[str] = None,
     order: int = 100,  # tab order within the module (smaller = further left)
+    timeout: Optional[float] = None,  # s; handler time limit (default: gateway tuning)
+    paginated: bool = False,  # handler reads offset/limit/sort/order/filter itself
 ) -> Callable:
     """Registers a method as a managed list (table with delete).
 
     The method returns rows ``[{"id": "...", "cells": {col_key: value, ...}}]``.
     The delete handler is set via ``@<list>.on_delete`` and receives ``(ctx, id)``.
+
+    By default the gateway sorts, filters and pages the returned rows. Large lists
+    can set ``paginated=True``: ``ctx.params`` then carries ``offset``, ``limit``,
+    ``sort``, ``order`` (asc/desc), ``filter`` (str or ``{col: str}``) and ``cursor``
+    (its own, from a previous answer), and the method returns only that page,
+    either as a row list or as ``{"rows": [...], "total": n, "next_cursor": ...}``.
     """
 
     def decorator(func: Callable) -> Callable:
         meta = _ContributionMeta(
             "list", identifier, name,
-            permission=permission, description=description, icon=icon,
+            permission=permission, description=description, icon=icon, timeout=timeout,
             extra={"mount": mount, "scope": scope, "columns": columns or [], "order": order},
         )
+        meta.paginated = paginated
         setattr(func, LIST_ATTR, meta)
 
         def on_delete(delete_func: Callable) -> Callable:
@@ -174,13 +190,14 @@ def dashboard_page(
     description: Optional[str] = None,
     icon: Optional[str] = None,
     nav: bool = True,  # show in the side navigation?
+    timeout: Optional[float] = None,  # s; handler time limit (default: gateway tuning)
 ) -> Callable:
     """Registers a method as a full standalone page (component-tree schema)."""
 
     def decorator(func: Callable) -> Callable:
         meta = _ContributionMeta(
             "page", identifier, name,
-            permission=permission, description=description, icon=icon,
+            permission=permission, description=description, icon=icon, timeout=timeout,
             extra={"scope": scope, "nav": nav},
         )
         setattr(func, PAGE_ATTR, meta)
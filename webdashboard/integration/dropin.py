@@ -115,3 +115,17 @@ def unregister_dashboard(cog) -> None:
             dashboard.unregister_third_party(cog)
         except Exception:
             pass
+
+
+def invalidate_dashboard(cog) -> None:
+    """Drop the cached widget data of ``cog`` after changing what its widgets show.
+
+    Dashboard submits/edits already invalidate automatically; call this when the
+    data changes elsewhere (commands, listeners). Safe without WebDashboard loaded.
+    """
+    dashboard = cog.bot.get_cog("WebDashboard")
+    if dashboard is not None and hasattr(dashboard, "invalidate_widgets"):
+        try:
+            dashboard.invalidate_widgets(cog)
+        except Exception:
+            pass
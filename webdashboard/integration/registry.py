@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .decorators import iter_contributions
 
@@ -40,6 +40,16 @@ class Contribution:
 @dataclass
 class Registry:
     _contribs: Dict[str, Contribution] = field(default_factory=dict)
+    # Bumped on every (un)registration; invalidates the manifest cache.
+    version: int = 0
+    # (level, locale) -> (payload, serialized payload, etag) for the current version
+    _manifest_cache: Dict[Tuple[int, str], Tuple[Dict[str, Any], str, str]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._manifest_cache.clear()
 
     # --- registration ----------------------------------------------------- #
     def register_cog(self, cog: Any) -> int:
@@ -73,6 +83,7 @@ class Registry:
             )
             self._contribs[contrib.key] = contrib
             count += 1
+        self._changed()
         log.info("Registriert: %d Beiträge von Cog %s", count, cog_name)
         return count
 
@@ -80,6 +91,7 @@ class Registry:
         cog_name = type(cog).__name__
         for key in [k for k, c in self._contribs.items() if c.cog_name == cog_name]:
             del self._contribs[key]
+        self._changed()
         log.info("Beiträge von Cog %s entfernt", cog_name)
 
     # --- query ------------------------------------------------------------ #
@@ -94,3 +106,28 @@ class Registry:
 
     def manifest(self) -> List[Dict[str, Any]]:
         return [c.manifest() for c in self._contribs.values()]
+
+    def manifest_payload(self, level: int, locale: Optional[str]) -> Tuple[Dict[str, Any], str, str]:
+        """``manifest.get`` result for a permission level + locale, built once per version.
+
+        Returns ``(payload, serialized payload, etag)``. A negative ``level``
+        yields the empty manifest (e.g. non-members in a guild context).
+        """
+        loc = str(locale or "en-US")
+        key = (int(level), loc)
+        cached = self._manifest_cache.get(key)
+        if cached is not None:
+            return cached
+        from ..gateway import jsonenc
+        from ..permissions import _level_value
+
+        visible = [
+            c.manifest(loc)
+            for c in self._contribs.values()
+            if level >= 0 and level >= _level_value(c.meta.permission)
+        ]
+        etag = jsonenc.etag(visible)
+        payload = {"contributions": visible, "etag": etag}
+        entry = (payload, jsonenc.dumps(payload), etag)
+        self._manifest_cache[key] = entry
+        return entry
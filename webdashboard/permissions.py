@@ -2,12 +2,19 @@
 
 All access is enforced **server-side** in the gateway. Frontend filtering
 serves UX only.
+
+Resolved levels are cached per (user, guild) for a few seconds. The WebDashboard
+cog drops entries as soon as something relevant changes (member roles, role
+permissions, guild owner, Red's admin/mod roles), so the TTL only bounds how
+long a change Red does not announce (e.g. a new bot owner) can go unnoticed.
 """
 from __future__ import annotations
 
 from enum import IntEnum
 from typing import TYPE_CHECKING, Optional
 
+from .cache import TTLCache
+
 if TYPE_CHECKING:
     import discord
     from redbot.core.bot import Red
@@ -39,12 +46,50 @@ def _level_value(name: str) -> int:
         return Level.BOT_OWNER  # unknown -> most restrictive level
 
 
+# (user_id, guild_id | None) -> Level
+_level_cache = TTLCache(ttl=10.0, maxsize=8192)
+
+
+def configure_level_cache(ttl: float) -> None:
+    """Sets the TTL of cached levels (0 disables caching) and drops all entries."""
+    _level_cache.ttl = max(0.0, float(ttl))
+    _level_cache.clear()
+
+
+def invalidate_levels(*, user_id: Optional[int] = None, guild_id: Optional[int] = None) -> int:
+    """Drops cached levels of a user and/or a guild (no arguments = everything)."""
+    if user_id is None and guild_id is None:
+        n = len(_level_cache)
+        _level_cache.clear()
+        return n
+    return _level_cache.invalidate(
+        lambda k: (user_id is None or k[0] == user_id) and (guild_id is None or k[1] == guild_id)
+    )
+
+
 async def resolve_level(
     bot: "Red",
     user: "discord.abc.User",
     guild: "Optional[discord.Guild]" = None,
+    *,
+    use_cache: bool = True,
 ) -> int:
     """Determines the highest level that ``user`` satisfies (optionally in ``guild``)."""
+    key = (user.id, guild.id if guild is not None else None)
+    if use_cache:
+        cached = _level_cache.get(key)
+        if cached is not None:
+            return cached
+    level = await _resolve_level_uncached(bot, user, guild)
+    _level_cache.set(key, level)
+    return level
+
+
+async def _resolve_level_uncached(
+    bot: "Red",
+    user: "discord.abc.User",
+    guild: "Optional[discord.Guild]" = None,
+) -> int:
     # Bot owner
     if await bot.is_owner(user):
         return Level.BOT_OWNER
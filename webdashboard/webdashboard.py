@@ -13,12 +13,17 @@ import discord
 from discord import app_commands
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils.chat_formatting import box
 
+from .auditstore import AuditStore
 from .gateway import Gateway
+from .gateway.loopmon import LoopMonitor
+from .gateway.methods import invalidate_catalogue
 from .integration.base import DashboardIntegration
 from .integration.registry import Registry
+from .permissions import configure_level_cache, invalidate_levels
 
 log = logging.getLogger("red.dks.webdashboard")
 _ = Translator("WebDashboard", __file__)
@@ -26,6 +31,33 @@ _ = Translator("WebDashboard", __file__)
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 6970
 
+# Gateway knobs adjustable via `[p]dksdashboard tune` (stored in Config `tuning`,
+# applied on the next gateway start). The type of the default is the value type.
+DEFAULT_TUNING = {
+    "widget_cache_ttl": 30,  # s; widget.data cache for widgets without `refresh`
+    "batch_concurrency": 8,  # max. calls of one JSON-RPC batch running at once
+    "bundle_timeout": 5.0,   # s; per-contribution limit in page.bundle
+    "list_page_max": 500,    # max. rows per list.rows answer
+    "contrib_timeout": 10.0,  # s; widget/panel/list handlers without their own `timeout`
+    "breaker_threshold": 5,  # failures/timeouts in a row that disable a contribution
+    "breaker_cooldown": 30,  # s; until a disabled contribution is tried again
+    "lag_threshold_ms": 200,  # event-loop delay counted as a stall (stack is sampled)
+    "rpc_global_limit": 32,  # max. RPC handlers running at once (all users)
+    "rpc_user_limit": 4,     # max. RPC handlers running at once per dashboard user
+    "rpc_queue_max": 256,    # calls waiting for a slot, overall; beyond: BUSY error
+    "rpc_user_queue": 64,    # calls waiting for a slot, per user; beyond: BUSY error
+    "ws_max_inflight": 16,   # max. concurrent calls per /rpc WebSocket connection
+    "ws_queue_size": 256,    # outbound frames queued per WebSocket client
+    "ws_overflow": "drop_oldest",  # full queue: drop_oldest | coalesce | disconnect
+    "ws_compress": True,     # negotiate permessage-deflate on /rpc
+    "gzip_min_bytes": 4096,  # REST bodies from this size on are gzip/deflate-compressed
+    "level_cache_ttl": 10,   # s; cached permission level per (user, guild)
+    "user_cache_ttl": 300,   # s; users fetched from the Discord API (not in the bot cache)
+    "audit_retention": 50000,  # audit log entries kept (audit.sqlite3)
+    "log_capacity": 5000,    # log records kept in memory for the Log-Viewer
+    "log_stream_interval": 1.0,  # s; batching interval of the "logs" stream channel
+}
+
 
 @cog_i18n(_)
 class WebDashboard(commands.Cog):
@@ -42,6 +74,8 @@ class WebDashboard(commands.Cog):
             token=None,
             host=DEFAULT_HOST,
             port=DEFAULT_PORT,
+            unix_socket=None,   # path; when set, served there instead of host:port
+            unix_mode="660",    # octal file mode of the socket
             autostart=True,
             # Branding / UI
             ui={
@@ -56,10 +90,13 @@ class WebDashboard(commands.Cog):
             locked=False,
             session_epoch=0,
             custom_pages=[],  # [{slug, title, html, nav}]
-            audit_log=[],     # [{action, user, guild, detail, time}] – last 1000
+            audit_log=[],     # legacy; migrated once into audit.sqlite3 (see AuditStore)
+            tuning={},        # overrides of DEFAULT_TUNING
         )
         self.registry = Registry()
         self.gateway: Optional[Gateway] = None
+        self.audit_store: Optional[AuditStore] = None
+        self.loop_monitor = LoopMonitor()
 
     # ------------------------------------------------------------------ #
     # Lifecycle
@@ -67,7 +104,7 @@ class WebDashboard(commands.Cog):
     async def cog_load(self) -> None:
         # Capture recent log records in memory for the dashboard Log-Viewer.
         from .gateway.logbuffer import install as _install_logbuffer
-        _install_logbuffer()
+        _install_logbuffer(capacity=int((await self._tuning())["log_capacity"]))
         # Collect already-loaded third-party cogs – regardless of whether they use
         # the DashboardIntegration mixin or merely decorated methods and would have
         # registered later. This way any load order works.
@@ -75,6 +112,9 @@ class WebDashboard(commands.Cog):
         for cog in self.bot.cogs.values():
             if isinstance(cog, DashboardIntegration) or iter_contributions(cog):
                 self.registry.register_cog(cog)
+        await self._open_audit_store()
+        self.loop_monitor.threshold_ms = float((await self._tuning())["lag_threshold_ms"])
+        self.loop_monitor.start()
         if await self.config.autostart():
             await self._start_gateway()
 
@@ -82,6 +122,12 @@ class WebDashboard(commands.Cog):
         from .gateway.logbuffer import uninstall as _uninstall_logbuffer
         _uninstall_logbuffer()
         await self._stop_gateway()
+        self.loop_monitor.stop()
+        if self.audit_store is not None:
+            await self.audit_store.close()
+            self.audit_store = None
+        invalidate_levels()
+        invalidate_catalogue()
 
     async def _start_gateway(self) -> None:
         if self.gateway is not None:
@@ -92,9 +138,19 @@ class WebDashboard(commands.Cog):
             await self.config.token.set(token)
         host = await self.config.host()
         port = await self.config.port()
+        unix_socket = await self.config.unix_socket()
+        unix_mode = int(await self.config.unix_mode(), 8)
+        tuning = await self._tuning()
+        configure_level_cache(tuning["level_cache_ttl"])
+        from .gateway.logbuffer import install as _install_logbuffer
+        _install_logbuffer(capacity=int(tuning["log_capacity"]))  # resizes the ring
+        if self.audit_store is not None:
+            self.audit_store.retention = int(tuning["audit_retention"])
+        self.loop_monitor.threshold_ms = float(tuning["lag_threshold_ms"])
         self.gateway = Gateway(
             self.bot, self.registry, token=token, host=host, port=port,
-            audit_sink=self._persist_audit,
+            audit_sink=self._persist_audit, tuning=tuning, loop_monitor=self.loop_monitor,
+            unix_socket=unix_socket, unix_mode=unix_mode,
         )
         try:
             await self.gateway.start()
@@ -111,21 +167,115 @@ class WebDashboard(commands.Cog):
     # ------------------------------------------------------------------ #
     # Public integration API (used by DashboardIntegration)
     # ------------------------------------------------------------------ #
-    async def _persist_audit(self, entry: dict) -> None:
-        """Audit sink: appends each logged operation to the audit log (capped)."""
+    async def _open_audit_store(self) -> None:
+        tuning = await self._tuning()
+        store = AuditStore(cog_data_path(self) / "audit.sqlite3",
+                           retention=int(tuning["audit_retention"]))
         try:
-            async with self.config.audit_log() as logs:
-                logs.append(entry)
-                del logs[:-1000]  # keep only the last 1000 entries
+            await store.open()
         except Exception:
-            log.debug("Audit-Persistierung fehlgeschlagen", exc_info=True)
+            log.exception("Audit-Datenbank konnte nicht geöffnet werden")
+            return
+        self.audit_store = store
+        # One-time migration of the former Config list (max. 1000 entries).
+        legacy = await self.config.audit_log()
+        if legacy:
+            try:
+                count = await store.migrate(legacy)
+            except Exception:
+                log.exception("Audit-Migration fehlgeschlagen")
+            else:
+                await self.config.audit_log.set([])
+                log.info("%d Audit-Einträge aus der Config übernommen", count)
+
+    async def _persist_audit(self, entry: dict) -> None:
+        """Audit sink: queues each logged operation for the audit store (batched)."""
+        if self.audit_store is not None:
+            self.audit_store.append(entry)
+
+    async def _tuning(self) -> dict:
+        """DEFAULT_TUNING merged with the stored overrides."""
+        stored = await self.config.tuning()
+        return {k: stored.get(k, v) for k, v in DEFAULT_TUNING.items()}
 
     def register_third_party(self, cog: Any) -> int:
         """Registers the dashboard contributions of a third-party cog."""
+        self.invalidate_widgets(cog)  # a reloaded cog must not serve old widget data
+        if self.gateway is not None:
+            self.gateway.breaker.reset(f"{type(cog).__name__}:")  # ...nor inherit its breaker
         return self.registry.register_cog(cog)
 
     def unregister_third_party(self, cog: Any) -> None:
         self.registry.unregister_cog(cog)
+        self.invalidate_widgets(cog)
+
+    def invalidate_widgets(self, cog: Any, identifier: Optional[str] = None) -> int:
+        """Drops the cached ``widget.data`` results of a cog (instance or class name).
+
+        Cogs call this after changing data their widgets show outside of a
+        dashboard submit (those invalidate automatically), e.g. from a command.
+        """
+        if self.gateway is None:
+            return 0
+        cog_name = cog if isinstance(cog, str) else type(cog).__name__
+        return self.gateway.invalidate_widgets(cog_name, identifier)
+
+    # ------------------------------------------------------------------ #
+    # Listeners: keep the permission-level cache honest
+    # ------------------------------------------------------------------ #
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.roles != after.roles:
+            invalidate_levels(user_id=after.id, guild_id=after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        invalidate_levels(user_id=member.id, guild_id=member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        invalidate_levels(user_id=member.id, guild_id=member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        invalidate_levels(guild_id=after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        invalidate_levels(guild_id=role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        if before.owner_id != after.owner_id:
+            invalidate_levels(guild_id=after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        invalidate_levels(guild_id=guild.id)
+
+    @commands.Cog.listener()
+    async def on_cog_add(self, cog: commands.Cog) -> None:
+        invalidate_catalogue()
+
+    @commands.Cog.listener()
+    async def on_cog_remove(self, cog: commands.Cog) -> None:
+        invalidate_catalogue()
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context) -> None:
+        # Red's admin/mod role settings (`[p]set roles addadminrole` & co.) fire no
+        # event of their own; owner changes (`[p]set ...owner`) affect every guild.
+        name = getattr(ctx.command, "qualified_name", "") or ""
+        # `[p]slash enable/disable/sync`, `[p]cog install/update/uninstall` change the
+        # command catalogue (core.commands / slash.list) outside the dashboard.
+        if name.startswith(("slash", "cog ", "load", "unload", "reload")):
+            invalidate_catalogue()
+        if not name.startswith("set "):
+            return
+        if "owner" in name:
+            invalidate_levels()
+        elif ("adminrole" in name or "modrole" in name) and ctx.guild is not None:
+            invalidate_levels(guild_id=ctx.guild.id)
 
     # ------------------------------------------------------------------ #
     # Commands (bot owner only)
@@ -156,11 +306,17 @@ class WebDashboard(commands.Cog):
         running = self.gateway is not None
         host = await self.config.host()
         port = await self.config.port()
+        unix_socket = await self.config.unix_socket()
         contribs = len(self.registry.all())
         cogs = len({c.cog_name for c in self.registry.all()})
+        if unix_socket:
+            address = _("Adresse: unix:{path} (Modus {mode})").format(
+                path=unix_socket, mode=await self.config.unix_mode())
+        else:
+            address = _("Adresse: http://{host}:{port}").format(host=host, port=port)
         lines = [
             _("Status: {state}").format(state=_("läuft") if running else _("gestoppt")),
-            _("Adresse: http://{host}:{port}").format(host=host, port=port),
+            address,
             _("Registrierte Beiträge: {n} (aus {c} Cogs)").format(n=contribs, c=cogs),
         ]
         await ctx.send(box("\n".join(lines)))
@@ -200,17 +356,84 @@ class WebDashboard(commands.Cog):
             "en-US": "Set the gateway host and port (restart required).",
         }},
     )
-    @app_commands.describe(host="Listen address (e.g. 127.0.0.1)", port="Listen port (e.g. 6970)")
-    async def dashboard_bind(self, ctx: commands.Context, host: str, port: int) -> None:
+    @app_commands.describe(
+        host="Listen address (e.g. 127.0.0.1) or unix:/path/to/socket[:mode]",
+        port="Listen port (e.g. 6970); not used for unix:",
+    )
+    async def dashboard_bind(self, ctx: commands.Context, host: str, port: Optional[int] = None) -> None:
         """Set the host and port (restart required).
 
+        `unix:/path/to/gateway.sock[:mode]` serves the gateway on a Unix socket
+        instead (mode as octal digits, default 660), for a BFF on the same host.
+
         Note: For security reasons the gateway should listen only on 127.0.0.1
         and be exposed externally through a reverse proxy or tunnel.
         """
+        if host.startswith("unix:"):
+            path, mode = host[len("unix:"):], "660"
+            head, sep, tail = path.rpartition(":")
+            if sep and tail and len(tail) <= 4 and all(c in "01234567" for c in tail):
+                path, mode = head, tail
+            if not path.startswith("/"):
+                await ctx.send(_("Ungültig. Beispiel: unix:/run/dks/gateway.sock:660"))
+                return
+            await self.config.unix_socket.set(path)
+            await self.config.unix_mode.set(mode)
+            await ctx.send(_("Gespeichert: unix:{path} (Modus {mode}). Bitte neu starten.").format(
+                path=path, mode=mode))
+            return
+        if port is None:
+            await ctx.send(_("Bitte einen Port angeben."))
+            return
         await self.config.host.set(host)
         await self.config.port.set(port)
+        await self.config.unix_socket.set(None)
         await ctx.send(_("Gespeichert: {host}:{port}. Bitte neu starten.").format(host=host, port=port))
 
+    @dashboard_group.command(
+        name="tune", description="Show or change gateway tuning values (restart required).",
+        extras={"i18n_desc": {
+            "de-DE": "Zeigt oder ändert Tuning-Werte des Gateways (Neustart erforderlich).",
+            "en-US": "Show or change gateway tuning values (restart required).",
+        }},
+    )
+    @app_commands.describe(key="Tuning key (empty = list all)", value="New value (empty = reset to default)")
+    async def dashboard_tune(
+        self, ctx: commands.Context, key: Optional[str] = None, *, value: Optional[str] = None
+    ) -> None:
+        """Show or change gateway tuning values (restart required).
+
+        Without arguments all keys are listed with their current value. Without a
+        value the key is reset to its default.
+        """
+        if key is None:
+            current = await self._tuning()
+            lines = [f"{k} = {v!r}" + ("" if v == DEFAULT_TUNING[k] else " *")
+                     for k, v in current.items()]
+            await ctx.send(box("\n".join(lines)))
+            return
+        if key not in DEFAULT_TUNING:
+            await ctx.send(_("Unbekannter Schlüssel. Gültig: {keys}").format(
+                keys=", ".join(sorted(DEFAULT_TUNING))))
+            return
+        async with self.config.tuning() as tuning:
+            if value is None:
+                tuning.pop(key, None)
+            else:
+                default = DEFAULT_TUNING[key]
+                try:
+                    if isinstance(default, bool):
+                        parsed = value.strip().lower() in ("1", "true", "yes", "on", "ja")
+                    elif isinstance(default, (int, float)):
+                        parsed = int(float(value)) if isinstance(default, int) else float(value)
+                    else:
+                        parsed = value.strip()
+                except ValueError:
+                    await ctx.send(_("Ungültiger Wert für {key}.").format(key=key))
+                    return
+                tuning[key] = parsed
+        await ctx.send(_("Gespeichert. Bitte das Gateway neu starten."))
+
     @dashboard_group.command(
         name="token", description="Send the gateway token via DM (for configuring the web app).",
         extras={"i18n_desc": {
@@ -0,0 +1,160 @@
+"""Live presence counters per guild, kept up to date from gateway events.
+
+Counting online members or "who is playing what" used to be a full pass over
+``guild.members`` in every consumer (snapshot loop, ``stats_now``, the
+gateway's ``core.guild_detail``, StatChannels). The tracker does that pass once
+per guild (lazily, on the first read) and afterwards only applies the delta of
+each presence/member/voice event, so reads are O(1) (activity tallies: O(distinct
+names)).
+
+Per member only the last seen ``(status, activities)`` is remembered, so a
+missed event is corrected by the member's next one instead of drifting. A guild
+seeded before its member list was complete (not yet chunked) is seeded again
+once it is.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Set, Tuple
+
+import discord
+
+STATUSES = ("online", "idle", "dnd", "offline")
+
+# (status, ((kind, name), ...)) as last seen for a member
+_State = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def member_status(member: discord.Member) -> str:
+    """``online``/``idle``/``dnd``/``offline`` (invisible/unknown count as offline)."""
+    st = str(getattr(member, "status", "offline"))
+    return st if st in STATUSES else "offline"
+
+
+def member_activities(member: discord.Member) -> Tuple[Tuple[str, str], ...]:
+    """The member's named activities as ``(kind, name)`` (kinds as in ACTIVITY_KINDS)."""
+    out = []
+    for act in getattr(member, "activities", []) or []:
+        nm = getattr(act, "name", None)
+        if not nm:
+            continue
+        atype = getattr(act, "type", None)
+        if isinstance(act, discord.Game) or atype == discord.ActivityType.playing:
+            out.append(("playing", nm))
+        elif atype == discord.ActivityType.streaming:
+            out.append(("streaming", nm))
+        elif atype == discord.ActivityType.listening:
+            out.append(("listening", nm))
+        elif atype == discord.ActivityType.watching:
+            out.append(("watching", nm))
+    return tuple(out)
+
+
+class GuildPresence:
+    """Counters of one guild. Status/activity counts cover humans only;
+    ``bot_status`` holds the bots' statuses separately."""
+
+    __slots__ = ("status", "bot_status", "humans", "bots", "activities", "voice", "chunked", "_members")
+
+    def __init__(self) -> None:
+        self.status: Dict[str, int] = dict.fromkeys(STATUSES, 0)
+        self.bot_status: Dict[str, int] = dict.fromkeys(STATUSES, 0)
+        self.humans = 0
+        self.bots = 0
+        self.activities: Dict[str, Dict[str, int]] = {}  # kind -> {name: members}
+        self.voice: Set[int] = set()  # human member ids in a voice channel
+        self.chunked = False
+        self._members: Dict[int, Tuple[bool, _State]] = {}
+
+    def _apply(self, bot: bool, state: _State, sign: int) -> None:
+        status, acts = state
+        if bot:
+            self.bot_status[status] += sign
+            self.bots += sign
+            return
+        self.status[status] += sign
+        self.humans += sign
+        for kind, nm in acts:
+            names = self.activities.setdefault(kind, {})
+            left = names.get(nm, 0) + sign
+            if left > 0:
+                names[nm] = left
+            else:
+                names.pop(nm, None)
+
+    def put(self, member: discord.Member) -> None:
+        state: _State = (member_status(member), member_activities(member))
+        old = self._members.get(member.id)
+        if old is not None:
+            if old[1] == state:
+                return
+            self._apply(old[0], old[1], -1)
+        self._members[member.id] = (member.bot, state)
+        self._apply(member.bot, state, +1)
+
+    def drop(self, member_id: int) -> None:
+        old = self._members.pop(member_id, None)
+        if old is not None:
+            self._apply(old[0], old[1], -1)
+        self.voice.discard(member_id)
+
+    def counts(self, *, include_bots: bool = False) -> Dict[str, int]:
+        """``{online, idle, dnd, offline, humans, bots, voice}``."""
+        out = dict(self.status)
+        if include_bots:
+            for st, n in self.bot_status.items():
+                out[st] += n
+        out.update(humans=self.humans, bots=self.bots, voice=len(self.voice))
+        return out
+
+
+class PresenceTracker:
+    def __init__(self) -> None:
+        self._guilds: Dict[int, GuildPresence] = {}
+
+    def get(self, guild: discord.Guild) -> GuildPresence:
+        """The guild's counters; the first read (or the first after chunking) seeds them."""
+        gp = self._guilds.get(guild.id)
+        if gp is None or (not gp.chunked and getattr(guild, "chunked", True)):
+            gp = self.seed(guild)
+        return gp
+
+    def seed(self, guild: discord.Guild) -> GuildPresence:
+        """Counts the guild from scratch (one pass over members and voice channels)."""
+        gp = GuildPresence()
+        gp.chunked = bool(getattr(guild, "chunked", True))
+        for m in guild.members:
+            gp.put(m)
+        for vc in guild.voice_channels:
+            for m in vc.members:
+                if not m.bot:
+                    gp.voice.add(m.id)
+        self._guilds[guild.id] = gp
+        return gp
+
+    def forget(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
+
+    def _tracked(self, guild: Optional[discord.Guild]) -> Optional[GuildPresence]:
+        # Events for guilds nobody has read yet are ignored; the first read seeds them.
+        return self._guilds.get(guild.id) if guild is not None else None
+
+    # Event deltas (forwarded by the cog's listeners)
+    def member_update(self, member: discord.Member) -> None:
+        """Presence change or join: re-records the member's status and activities."""
+        gp = self._tracked(getattr(member, "guild", None))
+        if gp is not None:
+            gp.put(member)
+
+    def member_remove(self, member: discord.Member) -> None:
+        gp = self._tracked(getattr(member, "guild", None))
+        if gp is not None:
+            gp.drop(member.id)
+
+    def voice_update(self, member: discord.Member, after: discord.VoiceState) -> None:
+        gp = self._tracked(getattr(member, "guild", None))
+        if gp is None or member.bot:
+            return
+        if after.channel is not None:
+            gp.voice.add(member.id)
+        else:
+            gp.voice.discard(member.id)
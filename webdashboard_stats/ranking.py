@@ -0,0 +1,55 @@
+"""Top-N selection and cached per-window rankings for the stats read API.
+
+A leaderboard only needs the best few of possibly tens of thousands of ids, so
+``top_items`` selects them with a heap (O(n log k)) instead of sorting
+everything. :class:`Ranking` keeps the totals of one dimension over one day
+window; the cog caches them for the common windows (7/30 days) and adds each
+flush's rows to them, so a dashboard refresh reads the cached ranking instead
+of querying and ranking the store again.
+"""
+from __future__ import annotations
+
+import heapq
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+
+def top_items(totals: Dict[str, float], n: int) -> List[Tuple[str, float]]:
+    """The ``n`` largest ``(id, value)`` pairs, largest first."""
+    return heapq.nlargest(n, totals.items(), key=itemgetter(1))
+
+
+class Ranking:
+    """Totals ``{id: value}`` of one window; treat ``totals`` as read-only."""
+
+    __slots__ = ("totals", "total", "_top", "_ranks")
+
+    def __init__(self, totals: Dict[str, float]) -> None:
+        self.totals = totals
+        self.total = sum(totals.values())
+        self._top: List[Tuple[str, float]] = []
+        self._ranks: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def add(self, id_: str, value: float) -> None:
+        """Adds a freshly flushed value (drops the derived order)."""
+        self.totals[id_] = self.totals.get(id_, 0) + value
+        self.total += value
+        self._top = []
+        self._ranks.clear()
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        if len(self._top) < min(n, len(self.totals)):
+            self._top = top_items(self.totals, n)
+        return self._top[:n]
+
+    def rank(self, id_: str) -> Optional[int]:
+        """1-based rank (ties share a rank), None if ``id_`` has no value."""
+        if id_ not in self.totals:
+            return None
+        if id_ not in self._ranks:
+            value = self.totals[id_]
+            self._ranks[id_] = 1 + sum(1 for v in self.totals.values() if v > value)
+        return self._ranks[id_]
@@ -0,0 +1,298 @@
+"""Time-series store for the daily statistics buckets (SQLite in the cog's data folder).
+
+Every value is one row keyed by ``(guild, dim, day, id)``: ``dim`` is the former
+Config group (``msg_members``, ``voice_hourly``, ...), ``day`` the ``YYYY-MM-DD``
+bucket and ``id`` the member/channel/command/hour the value belongs to. Writes
+are upserts (add, overwrite or keep-the-maximum) and touch only the rows that
+changed; reads are range scans on the primary key instead of loading the whole
+per-guild blob.
+
+Counters (values written with ``add``) are also rolled up into weekly (bucket =
+Monday) and monthly (bucket = 1st) totals as they are written. ``totals`` covers a
+day range with the coarsest buckets that fit inside it – whole months, then whole
+weeks, then single days at the edges – so a year-long query reads about a dozen
+rollup rows per id instead of 365 day rows. Gauges (values written with ``set`` /
+``max``, e.g. the member count) have no rollups.
+
+All database work runs on one dedicated worker thread, so the event loop never
+blocks on disk I/O and the connection is never shared between threads.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+# (dim, day, id, value)
+Row = Tuple[str, str, str, float]
+Dims = Union[str, Sequence[str]]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS ts ("
+    " guild INTEGER NOT NULL,"
+    " dim TEXT NOT NULL,"
+    " day TEXT NOT NULL,"
+    " id TEXT NOT NULL,"
+    " value REAL NOT NULL,"
+    " PRIMARY KEY (guild, dim, day, id)) WITHOUT ROWID",
+    # per-id series (drilldowns) without scanning every id of each day
+    "CREATE INDEX IF NOT EXISTS ts_id ON ts (guild, dim, id, day)",
+    # grain: "w" (bucket = Monday) or "m" (bucket = 1st of the month)
+    "CREATE TABLE IF NOT EXISTS ts_rollup ("
+    " guild INTEGER NOT NULL,"
+    " dim TEXT NOT NULL,"
+    " grain TEXT NOT NULL,"
+    " bucket TEXT NOT NULL,"
+    " id TEXT NOT NULL,"
+    " value REAL NOT NULL,"
+    " PRIMARY KEY (guild, dim, grain, bucket, id)) WITHOUT ROWID",
+)
+# Bumped when the rollups need a rebuild from the daily rows (PRAGMA user_version).
+_ROLLUP_VERSION = 1
+
+_ROLLUP_ADD = (
+    "INSERT INTO ts_rollup (guild, dim, grain, bucket, id, value) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (guild, dim, grain, bucket, id) DO UPDATE SET value = value + excluded.value"
+)
+
+_UPSERT = {
+    "add": "INSERT INTO ts (guild, dim, day, id, value) VALUES (?, ?, ?, ?, ?) "
+           "ON CONFLICT (guild, dim, day, id) DO UPDATE SET value = value + excluded.value",
+    "set": "INSERT INTO ts (guild, dim, day, id, value) VALUES (?, ?, ?, ?, ?) "
+           "ON CONFLICT (guild, dim, day, id) DO UPDATE SET value = excluded.value",
+    "max": "INSERT INTO ts (guild, dim, day, id, value) VALUES (?, ?, ?, ?, ?) "
+           "ON CONFLICT (guild, dim, day, id) DO UPDATE SET value = MAX(value, excluded.value)",
+}
+
+
+class TimeSeriesStore:
+    def __init__(self, path: Path, *, gauges: Iterable[Tuple[str, Optional[str]]] = ()) -> None:
+        """``gauges``: ``(dim, id)`` pairs (id None = whole dim) that are levels, not
+        counters; they get no rollups even if written with ``add``."""
+        self.path = Path(path)
+        self._gauge_dims: Set[str] = {d for d, i in gauges if i is None}
+        self._gauge_ids: Set[Tuple[str, str]] = {(d, i) for d, i in gauges if i is not None}
+        # dims with at least one gauge id: their totals come from the daily rows
+        self._daily_only = self._gauge_dims | {d for d, _ in self._gauge_ids}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dks-stats")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+    async def open(self) -> None:
+        await self._run(self._open_sync)
+
+    async def close(self) -> None:
+        try:
+            await self._run(self._close_sync)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def _open_sync(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            conn.execute(stmt)
+        conn.commit()
+        self._conn = conn
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _ROLLUP_VERSION:
+            self._rebuild_rollups_sync(None)
+            with conn:
+                conn.execute(f"PRAGMA user_version = {_ROLLUP_VERSION}")
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+    async def apply(self, guild_id: int, *, add: Iterable[Row] = (), set: Iterable[Row] = (),
+                    max: Iterable[Row] = ()) -> None:
+        """Upserts rows of one guild in a single transaction.
+
+        ``add`` increments, ``set`` overwrites, ``max`` keeps the larger value.
+        """
+        batches = [(mode, [(guild_id, d, day, str(i), float(v)) for d, day, i, v in rows])
+                   for mode, rows in (("add", add), ("set", set), ("max", max))]
+        batches = [(mode, rows) for mode, rows in batches if rows]
+        if batches:
+            await self._run(self._apply_sync, batches)
+
+    def _apply_sync(self, batches: List[Tuple[str, List[tuple]]]) -> None:
+        with self._conn as conn:
+            for mode, rows in batches:
+                conn.executemany(_UPSERT[mode], rows)
+                if mode == "add":
+                    conn.executemany(_ROLLUP_ADD, self._rollup_rows(rows))
+
+    def _is_gauge(self, dim: str, id_: str) -> bool:
+        return dim in self._gauge_dims or (dim, id_) in self._gauge_ids
+
+    def _rollup_rows(self, rows: List[tuple]) -> List[tuple]:
+        out = []
+        buckets: Dict[str, Tuple[str, str]] = {}
+        for guild, dim, day, id_, value in rows:
+            if self._is_gauge(dim, id_):
+                continue
+            if day not in buckets:
+                d = date.fromisoformat(day)
+                buckets[day] = ((d - timedelta(days=d.weekday())).isoformat(), d.replace(day=1).isoformat())
+            week, month = buckets[day]
+            out.append((guild, dim, "w", week, id_, value))
+            out.append((guild, dim, "m", month, id_, value))
+        return out
+
+    async def rebuild_rollups(self, guild_id: int) -> None:
+        """Recomputes the guild's rollups from the daily rows (after a bulk ``set`` import)."""
+        await self._run(self._rebuild_rollups_sync, guild_id)
+
+    def _rebuild_rollups_sync(self, guild_id: Optional[int]) -> None:
+        where, args = ("WHERE guild = ?", (guild_id,)) if guild_id is not None else ("", ())
+        with self._conn as conn:
+            conn.execute(f"DELETE FROM ts_rollup {where}", args)
+            cur = conn.execute(f"SELECT guild, dim, day, id, value FROM ts {where}", args)
+            while True:
+                rows = cur.fetchmany(5000)
+                if not rows:
+                    break
+                conn.executemany(_ROLLUP_ADD, self._rollup_rows(rows))
+
+    async def prune(self, guild_id: int, before: str) -> None:
+        """Deletes the guild's buckets older than day ``before``.
+
+        Rollup buckets go once they end before that day; the bucket straddling
+        the cutoff stays until it is entirely out of range.
+        """
+        await self._run(self._prune_sync, guild_id, before)
+
+    def _prune_sync(self, guild_id: int, before: str) -> None:
+        cutoff = date.fromisoformat(before)
+        with self._conn as conn:
+            conn.execute("DELETE FROM ts WHERE guild = ? AND day < ?", (guild_id, before))
+            conn.execute("DELETE FROM ts_rollup WHERE guild = ? AND grain = 'w' AND bucket < ?",
+                         (guild_id, (cutoff - timedelta(days=6)).isoformat()))
+            conn.execute("DELETE FROM ts_rollup WHERE guild = ? AND grain = 'm' AND bucket < ?",
+                         (guild_id, cutoff.replace(day=1).isoformat()))
+
+    # ------------------------------------------------------------------ #
+    # Reading
+    # ------------------------------------------------------------------ #
+    async def range(self, guild_id: int, dim: str, start: str, end: str) -> Dict[str, Dict[str, Any]]:
+        """``{day: {id: value}}`` of one dimension for ``start <= day <= end``."""
+        rows = await self._run(
+            self._fetch, "SELECT day, id, value FROM ts WHERE guild = ? AND dim = ? AND day BETWEEN ? AND ?",
+            (guild_id, dim, start, end))
+        out: Dict[str, Dict[str, Any]] = {}
+        for day, id_, value in rows:
+            out.setdefault(day, {})[id_] = _num(value)
+        return out
+
+    async def totals(self, guild_id: int, dims: Dims, start: Optional[str] = None,
+                     end: Optional[str] = None) -> Dict[str, Any]:
+        """``{id: sum}`` over the day range ``start..end`` (open ends = all stored days),
+        summed across ``dims``.
+
+        Counter dims are read from the coarsest rollups covering the range, gauge
+        dims from the daily rows.
+        """
+        dims = (dims,) if isinstance(dims, str) else tuple(dims)
+        rows = await self._run(self._totals_sync, guild_id, dims, start, end)
+        return {id_: _num(value) for id_, value in rows}
+
+    def _totals_sync(self, guild_id: int, dims: Tuple[str, ...], start: Optional[str],
+                     end: Optional[str]) -> List[tuple]:
+        in_dims = f"dim IN ({', '.join('?' * len(dims))})"
+        # Clamping to the stored days also keeps pruned days out: a rollup bucket
+        # straddling the prune cutoff starts before the oldest day, so it is never used.
+        lo, hi = self._conn.execute(f"SELECT MIN(day), MAX(day) FROM ts WHERE guild = ? AND {in_dims}",
+                                    (guild_id, *dims)).fetchone()
+        if lo is None:
+            return []
+        start = lo if start is None else max(start, lo)
+        end = hi if end is None else min(end, hi)
+        if start > end:
+            return []
+        daily = f"SELECT id, value FROM ts WHERE guild = ? AND {in_dims} AND day BETWEEN ? AND ?"
+        if any(d in self._daily_only for d in dims):
+            parts, args = [daily], [guild_id, *dims, start, end]
+        else:
+            parts, args = [], []
+            days, weeks, months = _cover(date.fromisoformat(start), date.fromisoformat(end))
+            for lo, hi in days:
+                parts.append(daily)
+                args += [guild_id, *dims, lo, hi]
+            for grain, buckets in (("w", weeks), ("m", months)):
+                if buckets:
+                    parts.append(f"SELECT id, value FROM ts_rollup WHERE guild = ? AND {in_dims} "
+                                 f"AND grain = '{grain}' AND bucket IN ({', '.join('?' * len(buckets))})")
+                    args += [guild_id, *dims, *buckets]
+        sql = "SELECT id, SUM(value) FROM (" + " UNION ALL ".join(parts) + ") GROUP BY id"
+        return self._conn.execute(sql, tuple(args)).fetchall()
+
+    async def series(self, guild_id: int, dim: str, id_: str, start: str, end: str) -> Dict[str, Any]:
+        """``{day: value}`` of a single id (e.g. one member) in the day range."""
+        rows = await self._run(
+            self._fetch,
+            "SELECT day, value FROM ts WHERE guild = ? AND dim = ? AND id = ? AND day BETWEEN ? AND ?",
+            (guild_id, dim, str(id_), start, end))
+        return {day: _num(value) for day, value in rows}
+
+    def _fetch(self, sql: str, args: tuple) -> List[tuple]:
+        return self._conn.execute(sql, args).fetchall()
+
+
+def _num(value: float) -> Any:
+    # Counts go in as ints and should come out as ints (JSON shows 3, not 3.0).
+    return int(value) if float(value).is_integer() else value
+
+
+def _add_month(d: date, months: int) -> date:
+    """First day of the month ``months`` after the month of ``d``."""
+    m = d.year * 12 + d.month - 1 + months
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def _cover(start: date, end: date) -> Tuple[List[Tuple[str, str]], List[str], List[str]]:
+    """Splits ``start..end`` into whole months, whole weeks and leftover day runs.
+
+    Returns ``(day ranges [(lo, hi)], week buckets, month buckets)``. Months win
+    over weeks: a week is only used if it does not cut into a whole month that
+    fits the range.
+    """
+    day_runs: List[Tuple[str, str]] = []
+    weeks: List[str] = []
+    months: List[str] = []
+    run_start: Optional[date] = None
+    d = start
+    while d <= end:
+        next_month = _add_month(d, 1)
+        if d.day == 1 and next_month - timedelta(days=1) <= end:
+            step, target = next_month, months
+        elif d.weekday() == 0 and d + timedelta(days=6) <= end and (
+                d + timedelta(days=6) < next_month
+                or _add_month(next_month, 1) - timedelta(days=1) > end):
+            step, target = d + timedelta(days=7), weeks
+        else:
+            if run_start is None:
+                run_start = d
+            d += timedelta(days=1)
+            continue
+        if run_start is not None:
+            day_runs.append((run_start.isoformat(), (d - timedelta(days=1)).isoformat()))
+            run_start = None
+        target.append(d.isoformat())
+        d = step
+    if run_start is not None:
+        day_runs.append((run_start.isoformat(), end.isoformat()))
+    return day_runs, weeks, months
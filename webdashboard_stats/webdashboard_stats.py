@@ -1,12 +1,15 @@
 """WebDashboardStats – collects server statistics for the DKS web dashboard.
 
-Data is stored in daily buckets (and for status/activity in hourly samples) in the
-Red config and queried by the WebDashboard gateway via public read methods
+Data is stored in daily buckets in a SQLite time-series store in the cog's data
+folder (see ``tsstore.py``); status samples, invites and the invite log stay in
+the Red config. The WebDashboard gateway queries it via public read methods
 (``stats_*``). The chart rendering happens in the web app.
 
 Notes:
 - Bots are ignored for messages/voice/activity (user type = users).
 - Status/activity require the presence and member intents for complete data.
+  Live status/voice/activity counts come from the event-driven ``PresenceTracker``
+  (``self.presence``, see ``presence.py``), which other cogs may read as well.
 - Old buckets are removed automatically after RETENTION_DAYS.
 """
 from __future__ import annotations
@@ -15,18 +18,37 @@ import asyncio
 import logging
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import discord
 from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
+
+from .presence import PresenceTracker
+from .ranking import Ranking, top_items
+from .tsstore import TimeSeriesStore
 
 log = logging.getLogger("red.dks.webdashboard_stats")
 
 RETENTION_DAYS = 400          # how long daily buckets are kept
 SAMPLE_MINUTES = 30           # interval of the status/activity snapshots
 STATUS_RETENTION = 60 * 24 * 60 // SAMPLE_MINUTES  # ~60 days of status samples
+ACTIVITY_KINDS = ("playing", "streaming", "listening", "watching")
+
+# Former Config groups of {daykey: {id: value}} now kept in the time-series store
+# (dim = group name; "activities" is split into one dim per kind: "activities:playing", ...).
+DAILY_GROUPS = (
+    "days", "msg_channels", "msg_members", "voice_channels", "voice_members", "activity",
+    "invite_daily", "commands", "command_errors", "msg_hourly", "voice_hourly", "peaks",
+)
+# Levels rather than counters (written with set/max): no weekly/monthly rollups.
+GAUGES = (("days", "members"), ("peaks", None))
+# Window lengths (days) whose rankings are cached and kept current by _flush,
+# for the dims _flush writes.
+RANK_WINDOWS = (7, 30)
+RANKED_DIMS = ("msg_members", "msg_channels", "voice_members", "voice_channels", "commands", "command_errors")
 
 
 def _utcnow() -> datetime:
@@ -47,8 +69,11 @@ class WebDashboardStats(commands.Cog):
         self.config = Config.get_conf(
             self, identifier=0x57_57_53_01, force_registration=True, cog_name="WebServerStats"
         )
+        # The daily groups (days ... activities) are legacy: migrated once into the
+        # time-series store (ts_migrated) and emptied; see _migrate_config.
         self.config.register_guild(
             enabled=True,
+            ts_migrated=False,
             days={},            # {daykey: {messages, joins, leaves, members, voice_minutes}}
             msg_channels={},     # {daykey: {channel_id: count}}
             msg_members={},      # {daykey: {member_id: count}}
@@ -75,11 +100,35 @@ class WebDashboardStats(commands.Cog):
         self._msg_buf: Dict[Tuple[int, str], Dict[str, Any]] = {}
         # Command usage: {(guild_id, daykey): {"cmds": {name: n}, "errs": {name: n}}}
         self._cmd_buf: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        # Voice minutes, same idea: {(guild_id, daykey): {"minutes", "channels", "members", "hours"}}.
+        # _voice_writing holds the batch a running _flush is committing (still counted as live).
+        self._voice_buf: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self._voice_writing: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        # Held by _flush while a guild's batch goes from _voice_writing into the store,
+        # and by stats_voice around its store reads + live snapshot, so a reader sees
+        # each batch exactly once.
+        self._voice_lock = asyncio.Lock()
         self._enabled_cache: Dict[int, bool] = {}
-        self._snapshot_loop.start()
-        self._flush_loop.start()
+        self.store: Optional[TimeSeriesStore] = None
+        self.presence = PresenceTracker()
+        # Cached window totals: {(guild_id, dim, first_day, last_day): Ranking}, dropped
+        # at the day change. _rank_gen changes around every flush write; a ranking
+        # read from the store while a flush ran is not cached (it may miss the rows).
+        self._rankings: Dict[Tuple[int, str, str, str], Ranking] = {}
+        self._rank_gen = 0
+        self._rank_day = _daykey()
+        # Display names: {(guild_id, "member"|"channel"): {id: name}}, invalidated by
+        # the rename/leave/delete listeners.
+        self._names: Dict[Tuple[int, str], Dict[str, str]] = {}
 
     async def cog_load(self) -> None:
+        self.store = TimeSeriesStore(cog_data_path(self) / "stats.sqlite3", gauges=GAUGES)
+        await self.store.open()
+        await self._migrate_config()
+        # Loops only after the store is ready (on a reload the bot is already ready
+        # and they would run immediately).
+        self._snapshot_loop.start()
+        self._flush_loop.start()
         # Reseed currently-open voice sessions + the enabled cache on (re)load.
         # IMPORTANT: on_ready does NOT fire on a cog reload (the bot is already
         # ready), so without this a [p]reload would lose all running voice sessions
@@ -101,32 +150,60 @@ class WebDashboardStats(commands.Cog):
     def cog_unload(self) -> None:
         self._snapshot_loop.cancel()
         self._flush_loop.cancel()
-        # Write out buffered counters + open voice sessions (best effort).
+        # Write out buffered counters + open voice sessions (best effort), then close the store.
         try:
             asyncio.create_task(self._final_flush())
         except Exception:
             pass
 
+    async def _migrate_config(self) -> None:
+        """One-time import of the daily Config groups into the time-series store.
+
+        Values are written with overwrite semantics, so an import interrupted
+        before ``ts_migrated`` is set can simply run again on the next load.
+        """
+        try:
+            all_guilds = await self.config.all_guilds()
+        except Exception:
+            log.exception("Statistik-Migration: Config nicht lesbar")
+            return
+        for gid, data in all_guilds.items():
+            if data.get("ts_migrated"):
+                continue
+            rows = []
+            for group in DAILY_GROUPS:
+                for dk, day in (data.get(group) or {}).items():
+                    if isinstance(day, dict):
+                        rows += [(group, dk, str(i), v) for i, v in day.items() if _is_number(v)]
+            for dk, day in (data.get("activities") or {}).items():
+                for kind, names in (day or {}).items() if isinstance(day, dict) else ():
+                    if isinstance(names, dict):
+                        rows += [(f"activities:{kind}", dk, str(n), v) for n, v in names.items() if _is_number(v)]
+            try:
+                await self.store.apply(gid, set=rows)
+                await self.store.rebuild_rollups(gid)
+                scope = self.config.guild_from_id(gid)
+                await scope.ts_migrated.set(True)
+                for group in DAILY_GROUPS + ("activities",):
+                    await getattr(scope, group).clear()
+            except Exception:
+                log.exception("Statistik-Migration für Guild %s fehlgeschlagen", gid)
+                continue
+            if rows:
+                log.info("Statistik-Migration: %d Werte für Guild %s übernommen", len(rows), gid)
+
     # ------------------------------------------------------------------ #
     # Write helpers
     # ------------------------------------------------------------------ #
     async def _bump_day(self, guild: discord.Guild, field: str, amount: float = 1) -> None:
-        key = _daykey()
-        async with self.config.guild(guild).days() as days:
-            d = days.get(key)
-            if not isinstance(d, dict):
-                d = {}
-            d[field] = d.get(field, 0) + amount
-            days[key] = d
+        await self.store.apply(guild.id, add=[("days", _daykey(), field, amount)])
 
     async def _bump_nested(self, guild: discord.Guild, group: str, sub: str, amount: float = 1) -> None:
-        key = _daykey()
-        async with getattr(self.config.guild(guild), group)() as data:
-            day = data.get(key)
-            if not isinstance(day, dict):
-                day = {}
-            day[sub] = day.get(sub, 0) + amount
-            data[key] = day
+        await self.store.apply(guild.id, add=[(group, _daykey(), sub, amount)])
+
+    async def _range(self, guild: discord.Guild, dim: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """``{daykey: {id: value}}`` of one stored dimension for the range ``keys``."""
+        return await self.store.range(guild.id, dim, keys[0], keys[-1])
 
     # ------------------------------------------------------------------ #
     # Listener: messages
@@ -184,95 +261,86 @@ class WebDashboardStats(commands.Cog):
             pass
 
     async def _flush(self) -> None:
-        """Writes buffered message and command counters to the config in a batch."""
-        if not self._msg_buf and not self._cmd_buf:
+        """Writes the buffered message, voice and command counters, one transaction per guild."""
+        if self._rank_day != _daykey():
+            self._rankings.clear()  # windows moved on; old keys are never read again
+            self._rank_day = _daykey()
+        if not self._msg_buf and not self._voice_buf and not self._cmd_buf:
             return
-        buf = self._msg_buf
-        self._msg_buf = {}
-        by_guild: Dict[int, list] = {}
-        for (gid, dk), e in buf.items():
-            by_guild.setdefault(gid, []).append((dk, e))
-        for gid, entries in by_guild.items():
-            guild = self.bot.get_guild(gid)
-            if guild is None:
-                continue
-            try:
-                self._enabled_cache[gid] = bool(await self.config.guild(guild).enabled())
-            except Exception:
-                pass
-            try:
-                async with self.config.guild(guild).days() as days:
-                    for dk, e in entries:
-                        d = days.get(dk) if isinstance(days.get(dk), dict) else {}
-                        d["messages"] = d.get("messages", 0) + e["messages"]
-                        days[dk] = d
-                async with self.config.guild(guild).msg_channels() as mc:
-                    for dk, e in entries:
-                        day = mc.get(dk) if isinstance(mc.get(dk), dict) else {}
-                        for cid, n in e["channels"].items():
-                            day[cid] = day.get(cid, 0) + n
-                        mc[dk] = day
-                async with self.config.guild(guild).msg_members() as mm:
-                    for dk, e in entries:
-                        day = mm.get(dk) if isinstance(mm.get(dk), dict) else {}
-                        for mid, n in e["members"].items():
-                            day[mid] = day.get(mid, 0) + n
-                        mm[dk] = day
-                async with self.config.guild(guild).msg_hourly() as mh:
-                    for dk, e in entries:
-                        day = mh.get(dk) if isinstance(mh.get(dk), dict) else {}
-                        for hr, n in (e.get("hours") or {}).items():
-                            day[hr] = day.get(hr, 0) + n
-                        mh[dk] = day
-            except Exception:
-                log.debug("flush failed for guild %s", gid, exc_info=True)
-
-        # Batch command counters (separate buffer; a guild can have commands without messages).
-        if self._cmd_buf:
-            cbuf = self._cmd_buf
-            self._cmd_buf = {}
-            by_g: Dict[int, list] = {}
-            for (gid, dk), e in cbuf.items():
-                by_g.setdefault(gid, []).append((dk, e))
-            for gid, entries in by_g.items():
+        mbuf, self._msg_buf = self._msg_buf, {}
+        cbuf, self._cmd_buf = self._cmd_buf, {}
+        # Voice minutes stay visible to _live_voice_minutes until they are committed.
+        self._voice_writing, self._voice_buf = self._voice_buf, {}
+        rows_by_guild: Dict[int, list] = defaultdict(list)
+        for (gid, dk), e in mbuf.items():
+            rows = rows_by_guild[gid]
+            rows.append(("days", dk, "messages", e["messages"]))
+            rows += [("msg_channels", dk, cid, n) for cid, n in e["channels"].items()]
+            rows += [("msg_members", dk, mid, n) for mid, n in e["members"].items()]
+            rows += [("msg_hourly", dk, hr, n) for hr, n in (e.get("hours") or {}).items()]
+        for (gid, dk), e in self._voice_writing.items():
+            rows = rows_by_guild[gid]
+            rows.append(("days", dk, "voice_minutes", e["minutes"]))
+            rows += [("voice_channels", dk, cid, n) for cid, n in e["channels"].items()]
+            rows += [("voice_members", dk, mid, n) for mid, n in e["members"].items()]
+            rows += [("voice_hourly", dk, hr, n) for hr, n in e["hours"].items()]
+        # Command counters (a guild can have commands without messages).
+        for (gid, dk), e in cbuf.items():
+            rows = rows_by_guild[gid]
+            rows += [("commands", dk, nm, n) for nm, n in e["cmds"].items()]
+            rows += [("command_errors", dk, nm, n) for nm, n in e["errs"].items()]
+        self._rank_gen += 1
+        try:
+            for gid, rows in rows_by_guild.items():
                 guild = self.bot.get_guild(gid)
                 if guild is None:
                     continue
                 try:
-                    async with self.config.guild(guild).commands() as cmds:
-                        for dk, e in entries:
-                            day = cmds.get(dk) if isinstance(cmds.get(dk), dict) else {}
-                            for nm, n in e["cmds"].items():
-                                day[nm] = day.get(nm, 0) + n
-                            cmds[dk] = day
-                    async with self.config.guild(guild).command_errors() as errs:
-                        for dk, e in entries:
-                            day = errs.get(dk) if isinstance(errs.get(dk), dict) else {}
-                            for nm, n in e["errs"].items():
-                                day[nm] = day.get(nm, 0) + n
-                            errs[dk] = day
+                    self._enabled_cache[gid] = bool(await self.config.guild(guild).enabled())
                 except Exception:
-                    log.debug("cmd flush failed for guild %s", gid, exc_info=True)
+                    pass
+                async with self._voice_lock:
+                    try:
+                        await self.store.apply(gid, add=rows)
+                        self._update_rankings(gid, rows)
+                    except Exception:
+                        log.debug("flush failed for guild %s", gid, exc_info=True)
+                    for key in [k for k in self._voice_writing if k[0] == gid]:
+                        del self._voice_writing[key]
+        finally:
+            self._voice_writing = {}
+            self._rank_gen += 1
+
+    def _update_rankings(self, gid: int, rows: List[tuple]) -> None:
+        """Adds just-written rows to the guild's cached window totals."""
+        cached = [(k, r) for k, r in self._rankings.items() if k[0] == gid]
+        if not cached:
+            return
+        for dim, dk, id_, value in rows:
+            for (_, rdim, first, last), ranking in cached:
+                if rdim == dim and first <= dk <= last:
+                    ranking.add(str(id_), value)
 
     async def _final_flush(self) -> None:
+        # Close the open voice sessions into the buffer first, so a single flush writes everything.
+        for key in list(self._voice.keys()):
+            try:
+                self._end_voice_session(key)
+            except Exception:
+                pass
         try:
             await self._flush()
         except Exception:
             pass
-        for key in list(self._voice.keys()):
-            gid, mid = key
-            guild = self.bot.get_guild(gid)
-            if guild is not None:
-                try:
-                    await self._end_voice_session(guild, mid, key)
-                except Exception:
-                    pass
+        if self.store is not None:
+            await self.store.close()
 
     # ------------------------------------------------------------------ #
     # Listener: members
     # ------------------------------------------------------------------ #
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
+        self.presence.member_update(member)
         if member.bot:
             return
         if not await self.config.guild(member.guild).enabled():
@@ -285,6 +353,8 @@ class WebDashboardStats(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member) -> None:
+        self.presence.member_remove(member)
+        self._forget_name(member.guild.id, "member", member.id)
         if member.bot:
             return
         if not await self.config.guild(member.guild).enabled():
@@ -294,6 +364,46 @@ class WebDashboardStats(commands.Cog):
         except Exception:
             log.debug("on_member_remove stats failed", exc_info=True)
 
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member) -> None:
+        self.presence.member_update(after)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.presence.forget(guild.id)
+        for kind in ("member", "channel"):
+            self._names.pop((guild.id, kind), None)
+
+    # ------------------------------------------------------------------ #
+    # Listener: renames (name cache)
+    # ------------------------------------------------------------------ #
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.display_name != after.display_name:
+            self._forget_name(after.guild.id, "member", after.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        # Global name change: affects the display name in every guild without a nickname.
+        if before.display_name != after.display_name or before.name != after.name:
+            for (gid, kind), names in self._names.items():
+                if kind == "member":
+                    names.pop(str(after.id), None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after) -> None:
+        if getattr(before, "name", None) != getattr(after, "name", None):
+            self._forget_name(after.guild.id, "channel", after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel) -> None:
+        self._forget_name(channel.guild.id, "channel", channel.id)
+
+    def _forget_name(self, guild_id: int, kind: str, id_: int) -> None:
+        names = self._names.get((guild_id, kind))
+        if names is not None:
+            names.pop(str(id_), None)
+
     # ------------------------------------------------------------------ #
     # Listener: voice
     # ------------------------------------------------------------------ #
@@ -303,6 +413,7 @@ class WebDashboardStats(commands.Cog):
     ) -> None:
         if member.bot or member.guild is None:
             return
+        self.presence.voice_update(member, after)
         if not await self.config.guild(member.guild).enabled():
             return
         key = (member.guild.id, member.id)
@@ -313,24 +424,31 @@ class WebDashboardStats(commands.Cog):
                 return
             # End the old session + record it.
             if before_ch is not None and key in self._voice:
-                await self._end_voice_session(member.guild, member.id, key)
+                self._end_voice_session(key)
             # Start the new session.
             if after_ch is not None:
                 self._voice[key] = (after_ch, _utcnow())
         except Exception:
             log.debug("voice stats failed", exc_info=True)
 
-    async def _end_voice_session(self, guild: discord.Guild, member_id: int, key) -> None:
+    def _end_voice_session(self, key: Tuple[int, int]) -> None:
         ch_id, start = self._voice.pop(key, (None, None))
         if ch_id is None or start is None:
             return
-        minutes = max(0.0, (_utcnow() - start).total_seconds() / 60.0)
+        now = _utcnow()
+        self._credit_voice(key, ch_id, (now - start).total_seconds() / 60.0, now)
+
+    def _credit_voice(self, key: Tuple[int, int], ch_id: int, minutes: float, now: datetime) -> None:
+        """Adds voice minutes to the in-memory buffer (written by the next _flush)."""
         if minutes <= 0:
             return
-        await self._bump_day(guild, "voice_minutes", minutes)
-        await self._bump_nested(guild, "voice_channels", str(ch_id), minutes)
-        await self._bump_nested(guild, "voice_members", str(member_id), minutes)
-        await self._bump_nested(guild, "voice_hourly", str(_utcnow().hour), minutes)
+        gid, mid = key
+        entry = self._voice_buf.setdefault(
+            (gid, _daykey(now)), {"minutes": 0.0, "channels": {}, "members": {}, "hours": {}}
+        )
+        entry["minutes"] += minutes
+        for bucket, sub in (("channels", str(ch_id)), ("members", str(mid)), ("hours", str(now.hour))):
+            entry[bucket][sub] = entry[bucket].get(sub, 0.0) + minutes
 
     # ------------------------------------------------------------------ #
     # Listener: invites
@@ -386,11 +504,7 @@ class WebDashboardStats(commands.Cog):
                 }
         if not used_code:
             return
-        key = _daykey()
-        async with self.config.guild(guild).invite_daily() as daily:
-            day = daily.get(key) if isinstance(daily.get(key), dict) else {}
-            day[used_code] = day.get(used_code, 0) + 1
-            daily[key] = day
+        await self._bump_nested(guild, "invite_daily", used_code)
         async with self.config.guild(guild).invite_logs() as logs:
             logs.append({
                 "date": _utcnow().isoformat(),
@@ -409,6 +523,8 @@ class WebDashboardStats(commands.Cog):
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         for guild in self.bot.guilds:
+            # A fresh session rebuilds the member cache: recount on the next read.
+            self.presence.forget(guild.id)
             try:
                 enabled = bool(await self.config.guild(guild).enabled())
                 self._enabled_cache[guild.id] = enabled
@@ -447,96 +563,38 @@ class WebDashboardStats(commands.Cog):
                 if not enabled:
                     continue
                 key = _daykey()
-                # Member count (last value of the day).
-                await self._set_day(guild, "members", guild.member_count or 0)
-                # Status counts + activity by kind.
-                on = idle = dnd = off = 0
-                kinds: Dict[str, Dict[str, int]] = {
-                    "playing": defaultdict(int), "streaming": defaultdict(int),
-                    "listening": defaultdict(int), "watching": defaultdict(int),
-                }
-                for m in guild.members:
-                    if m.bot:
-                        continue
-                    st = getattr(m, "status", discord.Status.offline)
-                    if st == discord.Status.online:
-                        on += 1
-                    elif st == discord.Status.idle:
-                        idle += 1
-                    elif st == discord.Status.dnd:
-                        dnd += 1
-                    else:
-                        off += 1
-                    for act in getattr(m, "activities", []) or []:
-                        atype = getattr(act, "type", None)
-                        nm = getattr(act, "name", None)
-                        if isinstance(act, discord.Game) or atype == discord.ActivityType.playing:
-                            if nm:
-                                kinds["playing"][nm] += 1
-                        elif atype == discord.ActivityType.streaming:
-                            if nm:
-                                kinds["streaming"][nm] += 1
-                        elif atype == discord.ActivityType.listening:
-                            if nm:
-                                kinds["listening"][nm] += 1
-                        elif atype == discord.ActivityType.watching:
-                            if nm:
-                                kinds["watching"][nm] += 1
-                # Current voice concurrency (non-bot members in any voice channel).
-                voice_now = 0
-                for vc in guild.voice_channels:
-                    for vm in vc.members:
-                        if not vm.bot:
-                            voice_now += 1
+                # Status counts, activity by kind and voice concurrency (non-bot
+                # members in any voice channel) from the presence tracker.
+                presence = self.presence.get(guild)
+                counts = presence.counts()
+                on, idle, dnd, off = counts["online"], counts["idle"], counts["dnd"], counts["offline"]
+                voice_now = counts["voice"]
+                kinds = {kind: presence.activities.get(kind, {}) for kind in ACTIVITY_KINDS}
                 async with self.config.guild(guild).status_samples() as samples:
                     samples.append({
                         "t": _utcnow().isoformat(), "on": on, "idle": idle, "dnd": dnd, "off": off,
                     })
                     del samples[:-STATUS_RETENTION]
-                # Peak concurrency per day (max online + max in voice).
-                async with self.config.guild(guild).peaks() as pk:
-                    day = pk.get(key) if isinstance(pk.get(key), dict) else {}
-                    day["on_max"] = max(int(day.get("on_max", 0)), on)
-                    day["voice_max"] = max(int(day.get("voice_max", 0)), voice_now)
-                    pk[key] = day
-                # Activity per kind (each snapshot ≈ SAMPLE_MINUTES per active member).
-                if any(kinds.values()):
-                    async with self.config.guild(guild).activities() as actk:
-                        day = actk.get(key) if isinstance(actk.get(key), dict) else {}
-                        for kind, names in kinds.items():
-                            if not names:
-                                continue
-                            kd = day.get(kind) if isinstance(day.get(kind), dict) else {}
-                            for nm, count in names.items():
-                                kd[nm] = kd.get(nm, 0) + count * SAMPLE_MINUTES
-                            day[kind] = kd
-                        actk[key] = day
-                # Legacy 'activity' store (playing only) – kept for backward compatibility.
-                if kinds["playing"]:
-                    async with self.config.guild(guild).activity() as act_store:
-                        day = act_store.get(key) if isinstance(act_store.get(key), dict) else {}
-                        for nm, count in kinds["playing"].items():
-                            day[nm] = day.get(nm, 0) + count * SAMPLE_MINUTES
-                        act_store[key] = day
+                # Activity per kind (each snapshot ≈ SAMPLE_MINUTES per active member);
+                # the legacy 'activity' dim (playing only) is kept for backward compatibility.
+                added = [(f"activities:{kind}", key, nm, count * SAMPLE_MINUTES)
+                         for kind, names in kinds.items() for nm, count in names.items()]
+                added += [("activity", key, nm, count * SAMPLE_MINUTES)
+                          for nm, count in kinds["playing"].items()]
+                # Member count (last value of the day) + peak concurrency per day
+                # (max online + max in voice), all in one transaction.
+                await self.store.apply(
+                    guild.id,
+                    add=added,
+                    set=[("days", key, "members", guild.member_count or 0)],
+                    max=[("peaks", key, "on_max", on), ("peaks", key, "voice_max", voice_now)],
+                )
                 await self._prune(guild)
             except Exception:
                 log.debug("snapshot failed for guild %s", guild.id, exc_info=True)
 
-    async def _set_day(self, guild: discord.Guild, field: str, value: float) -> None:
-        key = _daykey()
-        async with self.config.guild(guild).days() as days:
-            d = days.get(key) if isinstance(days.get(key), dict) else {}
-            d[field] = value
-            days[key] = d
-
     async def _prune(self, guild: discord.Guild) -> None:
-        cutoff = _daykey(_utcnow() - timedelta(days=RETENTION_DAYS))
-        for group in ("days", "msg_channels", "msg_members", "voice_channels", "voice_members",
-                      "activity", "invite_daily", "commands", "command_errors",
-                      "msg_hourly", "voice_hourly", "peaks", "activities"):
-            async with getattr(self.config.guild(guild), group)() as data:
-                for k in [k for k in data.keys() if k < cutoff]:
-                    data.pop(k, None)
+        await self.store.prune(guild.id, _daykey(_utcnow() - timedelta(days=RETENTION_DAYS)))
 
     @tasks.loop(minutes=SAMPLE_MINUTES)
     async def _snapshot_loop(self) -> None:
@@ -549,42 +607,29 @@ class WebDashboardStats(commands.Cog):
     @tasks.loop(seconds=60)
     async def _flush_loop(self) -> None:
         try:
-            await self._flush()
+            self._tick_voice()
         except Exception:
-            log.debug("flush loop failed", exc_info=True)
+            log.debug("voice tick failed", exc_info=True)
         try:
-            await self._flush_voice()
+            await self._flush()
         except Exception:
-            log.debug("voice tick failed", exc_info=True)
+            log.debug("flush loop failed", exc_info=True)
 
-    async def _flush_voice(self) -> None:
+    def _tick_voice(self) -> None:
         """Credit the elapsed time of OPEN voice sessions incrementally and advance
         their start. Without this, a user's voice time only appears AFTER they leave
         (the session is credited on disconnect) – so people currently in voice would
         be invisible in the stats. Ticking every 60 s makes ongoing sessions show up
         live and also keeps day boundaries accurate (minutes land on the day they
-        actually happened)."""
+        actually happened). The minutes go to the buffer and are written together
+        with the message counters by the following _flush."""
         now = _utcnow()
-        for key in list(self._voice.keys()):
-            ch_id, start = self._voice.get(key, (None, None))
+        for key, (ch_id, start) in list(self._voice.items()):
             if ch_id is None or start is None:
                 continue
-            minutes = (now - start).total_seconds() / 60.0
-            if minutes <= 0:
-                continue
-            gid, mid = key
-            guild = self.bot.get_guild(gid)
-            if guild is None:
-                continue
-            # Advance the session start first so we never double-count this slice.
+            # Advance the session start so this slice is never counted twice.
             self._voice[key] = (ch_id, now)
-            try:
-                await self._bump_day(guild, "voice_minutes", minutes)
-                await self._bump_nested(guild, "voice_channels", str(ch_id), minutes)
-                await self._bump_nested(guild, "voice_members", str(mid), minutes)
-                await self._bump_nested(guild, "voice_hourly", str(now.hour), minutes)
-            except Exception:
-                log.debug("voice tick failed for %s", key, exc_info=True)
+            self._credit_voice(key, ch_id, (now - start).total_seconds() / 60.0, now)
 
     @_flush_loop.before_loop
     async def _before_flush(self) -> None:
@@ -598,28 +643,50 @@ class WebDashboardStats(commands.Cog):
         today = _utcnow().date()
         return [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days - 1, -1, -1)]
 
-    def _top(self, guild: discord.Guild, totals: Dict[str, float], kind: str, limit: int = 10) -> List[Dict[str, Any]]:
-        items = sorted(totals.items(), key=lambda x: x[1], reverse=True)[:limit]
+    def _name(self, guild: discord.Guild, kind: str, id_str: str) -> str:
+        """Display name of a member/channel id (cached), the id itself if unknown."""
+        names = self._names.setdefault((guild.id, kind), {})
+        name = names.get(id_str)
+        if name is not None:
+            return name
+        try:
+            if kind == "member":
+                m = guild.get_member(int(id_str))
+                name = m.display_name if m else None
+            else:
+                c = guild.get_channel(int(id_str))
+                name = c.name if c else None
+        except Exception:
+            name = None
+        if name is None:
+            return str(id_str)  # not cached: the member may join / the channel may appear
+        names[id_str] = name
+        return name
+
+    async def _ranking(self, guild: discord.Guild, dim: str, keys: List[str]) -> Ranking:
+        """Totals of ``dim`` over ``keys``; the 7/30-day windows are cached (see _flush)."""
+        cache_key = (guild.id, dim, keys[0], keys[-1])
+        cacheable = len(keys) in RANK_WINDOWS and dim in RANKED_DIMS
+        if cacheable and cache_key in self._rankings:
+            return self._rankings[cache_key]
+        gen = self._rank_gen
+        ranking = Ranking(await self.store.totals(guild.id, dim, keys[0], keys[-1]))
+        if cacheable and gen == self._rank_gen:
+            self._rankings[cache_key] = ranking
+        return ranking
+
+    def _top(self, guild: discord.Guild, totals: Union[Dict[str, float], Ranking], kind: str,
+             limit: int = 10) -> List[Dict[str, Any]]:
+        items = totals.top(limit) if isinstance(totals, Ranking) else top_items(totals, limit)
         out = []
         for id_str, val in items:
-            name = str(id_str)
-            try:
-                if kind == "member":
-                    m = guild.get_member(int(id_str))
-                    name = m.display_name if m else str(id_str)
-                else:
-                    c = guild.get_channel(int(id_str))
-                    name = c.name if c else str(id_str)
-            except Exception:
-                name = str(id_str)
-            out.append({"id": str(id_str), "name": name,
+            out.append({"id": str(id_str), "name": self._name(guild, kind, str(id_str)),
                         "value": round(val, 2) if isinstance(val, float) else val})
         return out
 
     async def stats_overview(self, guild: discord.Guild, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        daysd = await self.config.guild(guild).days()
-        daysd = daysd if isinstance(daysd, dict) else {}
+        daysd = await self._range(guild, "days", keys)
 
         def day(k):
             d = daysd.get(k, {})
@@ -630,8 +697,7 @@ class WebDashboardStats(commands.Cog):
         leaves = [int(day(k).get("leaves", 0)) for k in keys]
         net = [j - l for j, l in zip(joins, leaves)]
         last7 = keys[-7:]
-        pk = await self.config.guild(guild).peaks()
-        pk = pk if isinstance(pk, dict) else {}
+        pk = await self._range(guild, "peaks", keys)
         joins_7d = sum(int(day(k).get("joins", 0)) for k in last7)
         leaves_7d = sum(int(day(k).get("leaves", 0)) for k in last7)
         return {
@@ -654,68 +720,76 @@ class WebDashboardStats(commands.Cog):
 
     async def stats_messages(self, guild: discord.Guild, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        daysd = await self.config.guild(guild).days()
-        ch = await self.config.guild(guild).msg_channels()
-        mem = await self.config.guild(guild).msg_members()
+        daysd = await self._range(guild, "days", keys)
         series = [int((daysd.get(k, {}) or {}).get("messages", 0)) for k in keys]
-        ch_tot: Dict[str, float] = defaultdict(int)
-        mem_tot: Dict[str, float] = defaultdict(int)
-        uniq_ch, uniq_mem = set(), set()
-        for k in keys:
-            for cid, c in (ch.get(k, {}) or {}).items():
-                ch_tot[cid] += c
-                uniq_ch.add(cid)
-            for mid, c in (mem.get(k, {}) or {}).items():
-                mem_tot[mid] += c
-                uniq_mem.add(mid)
+        ch_tot = await self._ranking(guild, "msg_channels", keys)
+        mem_tot = await self._ranking(guild, "msg_members", keys)
         return {
             "labels": keys, "values": series, "total": sum(series),
-            "unique_members": len(uniq_mem), "unique_channels": len(uniq_ch),
+            "unique_members": len(mem_tot), "unique_channels": len(ch_tot),
             "top_members": self._top(guild, mem_tot, "member"),
             "top_channels": self._top(guild, ch_tot, "channel"),
         }
 
-    def _live_voice_minutes(self, guild: discord.Guild) -> List[Tuple[str, str, float]]:
-        """Elapsed minutes of currently OPEN voice sessions since their last credit.
-        Lets the read API show voice time live, without waiting for the 60 s tick."""
+    def _live_voice_minutes(self, guild: discord.Guild) -> Dict[str, Dict[str, Any]]:
+        """Voice minutes not yet in the store, per day: ``{daykey: {"minutes",
+        "channels": {cid: min}, "members": {mid: min}}}``. Covers buffered (credited,
+        not yet flushed) minutes plus the elapsed time of currently OPEN sessions
+        since their last credit, so the read API shows voice time live, without
+        waiting for the 60 s tick and flush."""
+        out: Dict[str, Dict[str, Any]] = {}
+
+        def day(dk: str) -> Dict[str, Any]:
+            return out.setdefault(dk, {"minutes": 0.0, "channels": defaultdict(float),
+                                       "members": defaultdict(float)})
+
+        for buf in (self._voice_writing, self._voice_buf):
+            for (gid, dk), e in list(buf.items()):
+                if gid != guild.id:
+                    continue
+                d = day(dk)
+                d["minutes"] += e["minutes"]
+                for cid, mins in e["channels"].items():
+                    d["channels"][cid] += mins
+                for mid, mins in e["members"].items():
+                    d["members"][mid] += mins
         now = _utcnow()
-        out: List[Tuple[str, str, float]] = []
         for (gid, mid), (ch_id, start) in list(self._voice.items()):
             if gid != guild.id or ch_id is None or start is None:
                 continue
             mins = (now - start).total_seconds() / 60.0
             if mins > 0:
-                out.append((str(ch_id), str(mid), mins))
+                d = day(_daykey(now))
+                d["minutes"] += mins
+                d["channels"][str(ch_id)] += mins
+                d["members"][str(mid)] += mins
         return out
 
     async def stats_voice(self, guild: discord.Guild, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        daysd = await self.config.guild(guild).days()
-        ch = await self.config.guild(guild).voice_channels()
-        mem = await self.config.guild(guild).voice_members()
+        # Store reads and the live snapshot under one lock with _flush: no batch is
+        # both in the store and still in _voice_writing, or in neither.
+        async with self._voice_lock:
+            daysd = await self._range(guild, "days", keys)
+            ch_rank = await self._ranking(guild, "voice_channels", keys)
+            mem_rank = await self._ranking(guild, "voice_members", keys)
+            live = self._live_voice_minutes(guild)
         series = [round(float((daysd.get(k, {}) or {}).get("voice_minutes", 0)) / 60.0, 2) for k in keys]
-        ch_tot: Dict[str, float] = defaultdict(float)
-        mem_tot: Dict[str, float] = defaultdict(float)
-        uniq_ch, uniq_mem = set(), set()
-        for k in keys:
-            for cid, c in (ch.get(k, {}) or {}).items():
-                ch_tot[cid] += c / 60.0
+        ch_tot: Dict[str, float] = defaultdict(float, {cid: c / 60.0 for cid, c in ch_rank.totals.items()})
+        mem_tot: Dict[str, float] = defaultdict(float, {mid: c / 60.0 for mid, c in mem_rank.totals.items()})
+        uniq_ch, uniq_mem = set(ch_tot), set(mem_tot)
+        # Live: add unflushed minutes (buffer + open sessions) to their day buckets.
+        index = {k: i for i, k in enumerate(keys)}
+        for dk, e in live.items():
+            if dk not in index:
+                continue
+            series[index[dk]] = round(series[index[dk]] + e["minutes"] / 60.0, 2)
+            for cid, mins in e["channels"].items():
+                ch_tot[cid] += mins / 60.0
                 uniq_ch.add(cid)
-            for mid, c in (mem.get(k, {}) or {}).items():
-                mem_tot[mid] += c / 60.0
+            for mid, mins in e["members"].items():
+                mem_tot[mid] += mins / 60.0
                 uniq_mem.add(mid)
-        # Live: add the elapsed time of currently open sessions to today's bucket.
-        today = _daykey()
-        live_h = 0.0
-        for cid, mid, mins in self._live_voice_minutes(guild):
-            h = mins / 60.0
-            live_h += h
-            ch_tot[cid] += h
-            mem_tot[mid] += h
-            uniq_ch.add(cid)
-            uniq_mem.add(mid)
-        if live_h and keys and keys[-1] == today:
-            series[-1] = round(series[-1] + live_h, 2)
         return {
             "labels": keys, "values": series, "total": round(sum(series), 2),
             "unique_members": len(uniq_mem), "unique_channels": len(uniq_ch),
@@ -731,7 +805,7 @@ class WebDashboardStats(commands.Cog):
 
     async def stats_invites(self, guild: discord.Guild, days: int = 14) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        daily = await self.config.guild(guild).invite_daily()
+        daily = await self._range(guild, "invite_daily", keys)
         logs = await self.config.guild(guild).invite_logs()
         inv_members = await self.config.guild(guild).invite_members()
         codes = set()
@@ -739,7 +813,7 @@ class WebDashboardStats(commands.Cog):
             for code in (daily.get(k, {}) or {}).keys():
                 codes.add(code)
         series = {code: [int((daily.get(k, {}) or {}).get(code, 0)) for k in keys] for code in codes}
-        top = sorted(((code, sum(series[code])) for code in codes), key=lambda x: x[1], reverse=True)[:10]
+        top = top_items({code: sum(series[code]) for code in codes}, 10)
         return {
             "labels": keys,
             "series": series,
@@ -750,36 +824,19 @@ class WebDashboardStats(commands.Cog):
 
     async def stats_activity(self, guild: discord.Guild, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        act = await self.config.guild(guild).activity()       # legacy (playing)
-        actk = await self.config.guild(guild).activities()    # per kind
-        actk = actk if isinstance(actk, dict) else {}
-
         # Legacy top games (playing) – kept for backward compatibility.
-        tot: Dict[str, float] = defaultdict(float)
-        for k in keys:
-            for name, mins in (act.get(k, {}) or {}).items():
-                tot[name] += mins
-
-        # Per-kind aggregation from the new store.
+        tot = await self.store.totals(guild.id, "activity", keys[0], keys[-1])
+        # Per-kind aggregation.
         kinds: Dict[str, Dict[str, float]] = {
-            "playing": defaultdict(float), "streaming": defaultdict(float),
-            "listening": defaultdict(float), "watching": defaultdict(float),
+            kind: await self.store.totals(guild.id, f"activities:{kind}", keys[0], keys[-1])
+            for kind in ACTIVITY_KINDS
         }
-        for k in keys:
-            day = actk.get(k)
-            if not isinstance(day, dict):
-                continue
-            for kind, names in day.items():
-                if kind not in kinds or not isinstance(names, dict):
-                    continue
-                for name, mins in names.items():
-                    kinds[kind][name] += mins
         # If the new store has playing data, prefer it for top_games (more complete).
         playing_src = kinds["playing"] if kinds["playing"] else tot
 
         def top(d: Dict[str, float], n: int = 15):
             return [{"name": nm, "minutes": round(mn)} for nm, mn in
-                    sorted(d.items(), key=lambda x: x[1], reverse=True)[:n]]
+                    top_items(d, n)]
 
         return {
             "top_games": top(playing_src),
@@ -789,31 +846,15 @@ class WebDashboardStats(commands.Cog):
     async def _entity_options(self, guild: discord.Guild, groups, kind: str) -> List[Dict[str, str]]:
         # `groups` may be a single store name or several – members/channels with
         # only VOICE activity (no messages) should also appear in the dropdown.
-        if isinstance(groups, str):
-            groups = (groups,)
-        tot: Dict[str, float] = defaultdict(float)
-        for group in groups:
-            data = await getattr(self.config.guild(guild), group)()
-            for day in (data or {}).values():
-                for _id, c in (day or {}).items():
-                    tot[_id] += c
+        tot = await self.store.totals(guild.id, groups)
         return [{"id": e["id"], "name": e["name"]} for e in self._top(guild, tot, kind, limit=200)]
 
     async def stats_commands(self, guild: discord.Guild, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        cmds = await self.config.guild(guild).commands()
-        errs = await self.config.guild(guild).command_errors()
-        cmds = cmds if isinstance(cmds, dict) else {}
-        errs = errs if isinstance(errs, dict) else {}
+        cmds = await self._range(guild, "commands", keys)
         series = [sum(int(v) for v in (cmds.get(k, {}) or {}).values()) for k in keys]
-        tot: Dict[str, int] = defaultdict(int)
-        etot: Dict[str, int] = defaultdict(int)
-        for k in keys:
-            for nm, n in (cmds.get(k, {}) or {}).items():
-                tot[nm] += int(n)
-            for nm, n in (errs.get(k, {}) or {}).items():
-                etot[nm] += int(n)
-        top = sorted(tot.items(), key=lambda x: x[1], reverse=True)[:20]
+        tot = await self._ranking(guild, "commands", keys)
+        etot = (await self._ranking(guild, "command_errors", keys)).totals
         return {
             "labels": keys,
             "values": series,
@@ -821,38 +862,31 @@ class WebDashboardStats(commands.Cog):
             "total_errors": sum(etot.values()),
             "unique_commands": len(tot),
             "top_commands": [
-                {"name": nm, "count": c, "errors": int(etot.get(nm, 0))} for nm, c in top
+                {"name": nm, "count": c, "errors": int(etot.get(nm, 0))} for nm, c in tot.top(20)
             ],
         }
 
     @staticmethod
-    def _rank_share(totals: Dict[str, float], target: str) -> Dict[str, Any]:
-        """Rank (1-based) and percentage share of `target` within `totals`."""
-        ordered = sorted(totals.items(), key=lambda x: x[1], reverse=True)
-        total_sum = sum(totals.values()) or 0
-        rank = next((i + 1 for i, (k, _) in enumerate(ordered) if k == target), None)
-        val = totals.get(target, 0)
+    def _rank_share(ranking: Ranking, target: str) -> Dict[str, Any]:
+        """Rank (1-based, ties share a rank) and percentage share of `target` within `ranking`."""
+        total_sum = ranking.total or 0
+        val = ranking.totals.get(target, 0)
         share = round((val / total_sum) * 100, 1) if total_sum else 0
-        return {"rank": rank, "of": len(ordered), "share": share}
+        return {"rank": ranking.rank(target), "of": len(ranking), "share": share}
 
     async def stats_member_drilldown(self, guild: discord.Guild, member_id: int, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        mem = await self.config.guild(guild).msg_members()
-        vmem = await self.config.guild(guild).voice_members()
         options = await self._entity_options(guild, ("msg_members", "voice_members"), "member")
         if not member_id and options:
             member_id = int(options[0]["id"])
         mid = str(member_id)
-        msgs = [int((mem.get(k, {}) or {}).get(mid, 0)) for k in keys]
-        voice = [round(float((vmem.get(k, {}) or {}).get(mid, 0)) / 60.0, 2) for k in keys]
+        mem = await self.store.series(guild.id, "msg_members", mid, keys[0], keys[-1])
+        vmem = await self.store.series(guild.id, "voice_members", mid, keys[0], keys[-1])
+        msgs = [int(mem.get(k, 0)) for k in keys]
+        voice = [round(float(vmem.get(k, 0)) / 60.0, 2) for k in keys]
         # Totals over the range for ranking.
-        msg_tot: Dict[str, float] = defaultdict(float)
-        voice_tot: Dict[str, float] = defaultdict(float)
-        for k in keys:
-            for _id, c in (mem.get(k, {}) or {}).items():
-                msg_tot[_id] += c
-            for _id, c in (vmem.get(k, {}) or {}).items():
-                voice_tot[_id] += c
+        msg_tot = await self._ranking(guild, "msg_members", keys)
+        voice_tot = await self._ranking(guild, "voice_members", keys)
         m = guild.get_member(int(member_id)) if member_id else None
         meta: Dict[str, Any] = {}
         if m is not None:
@@ -878,18 +912,15 @@ class WebDashboardStats(commands.Cog):
 
     async def stats_channel_drilldown(self, guild: discord.Guild, channel_id: int, days: int = 30) -> Dict[str, Any]:
         keys = self._range_keys(days)
-        ch = await self.config.guild(guild).msg_channels()
-        vch = await self.config.guild(guild).voice_channels()
         options = await self._entity_options(guild, ("msg_channels", "voice_channels"), "channel")
         if not channel_id and options:
             channel_id = int(options[0]["id"])
         cid = str(channel_id)
-        msgs = [int((ch.get(k, {}) or {}).get(cid, 0)) for k in keys]
-        voice = [round(float((vch.get(k, {}) or {}).get(cid, 0)) / 60.0, 2) for k in keys]
-        msg_tot: Dict[str, float] = defaultdict(float)
-        for k in keys:
-            for _id, n in (ch.get(k, {}) or {}).items():
-                msg_tot[_id] += n
+        ch = await self.store.series(guild.id, "msg_channels", cid, keys[0], keys[-1])
+        vch = await self.store.series(guild.id, "voice_channels", cid, keys[0], keys[-1])
+        msgs = [int(ch.get(k, 0)) for k in keys]
+        voice = [round(float(vch.get(k, 0)) / 60.0, 2) for k in keys]
+        msg_tot = await self._ranking(guild, "msg_channels", keys)
         c = guild.get_channel(int(channel_id)) if channel_id else None
         return {
             "labels": keys, "messages": msgs, "voice_hours": voice,
@@ -904,8 +935,7 @@ class WebDashboardStats(commands.Cog):
         """7×24 grid (weekday × hour-of-day, UTC) of message or voice activity."""
         keys = self._range_keys(days)
         field = "voice_hourly" if metric == "voice" else "msg_hourly"
-        data = await getattr(self.config.guild(guild), field)()
-        data = data if isinstance(data, dict) else {}
+        data = await self._range(guild, field, keys)
         # grid[weekday 0..6 (Mon=0)][hour 0..23]
         grid = [[0.0 for _ in range(24)] for _ in range(7)]
         for k in keys:
@@ -933,8 +963,7 @@ class WebDashboardStats(commands.Cog):
     async def stats_peaks(self, guild: discord.Guild, days: int = 30) -> Dict[str, Any]:
         """Daily peak concurrency (max online + max in voice)."""
         keys = self._range_keys(days)
-        pk = await self.config.guild(guild).peaks()
-        pk = pk if isinstance(pk, dict) else {}
+        pk = await self._range(guild, "peaks", keys)
         on_series = [int((pk.get(k, {}) or {}).get("on_max", 0)) for k in keys]
         voice_series = [int((pk.get(k, {}) or {}).get("voice_max", 0)) for k in keys]
         return {
@@ -947,31 +976,16 @@ class WebDashboardStats(commands.Cog):
 
     async def stats_now(self, guild: discord.Guild) -> Dict[str, Any]:
         """Live snapshot: current online counts, who is in voice, what is being played."""
-        on = idle = dnd = off = 0
-        playing: Dict[str, int] = defaultdict(int)
-        for m in guild.members:
-            if m.bot:
-                continue
-            st = getattr(m, "status", discord.Status.offline)
-            if st == discord.Status.online:
-                on += 1
-            elif st == discord.Status.idle:
-                idle += 1
-            elif st == discord.Status.dnd:
-                dnd += 1
-            else:
-                off += 1
-            for act in getattr(m, "activities", []) or []:
-                if isinstance(act, discord.Game) or getattr(act, "type", None) == discord.ActivityType.playing:
-                    nm = getattr(act, "name", None)
-                    if nm:
-                        playing[nm] += 1
+        presence = self.presence.get(guild)
+        counts = presence.counts()
+        on, idle, dnd, off = counts["online"], counts["idle"], counts["dnd"], counts["offline"]
+        playing = presence.activities.get("playing", {})
         voice_members = []
         for vc in guild.voice_channels:
             for vm in vc.members:
                 if not vm.bot:
                     voice_members.append({"name": vm.display_name, "channel": vc.name})
-        top_playing = sorted(playing.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_playing = top_items(playing, 10)
         return {
             "online": on, "idle": idle, "dnd": dnd, "offline": off,
             "in_voice": voice_members,
@@ -983,37 +997,25 @@ class WebDashboardStats(commands.Cog):
         """Top members this week (last 7 days) with rank change vs the previous week."""
         all_keys = self._range_keys(14)
         this_keys, prev_keys = all_keys[-7:], all_keys[:7]
-        mem = await self.config.guild(guild).msg_members()
-        vmem = await self.config.guild(guild).voice_members()
-
-        def totals(store, ks):
-            tot: Dict[str, float] = defaultdict(float)
-            for k in ks:
-                for _id, c in (store.get(k, {}) or {}).items():
-                    tot[_id] += c
-            return tot
-
-        def board(store, ks_now, ks_prev, divide=1.0):
-            now = totals(store, ks_now)
-            prev = totals(store, ks_prev)
-            prev_rank = {k: i + 1 for i, (k, _) in enumerate(sorted(prev.items(), key=lambda x: x[1], reverse=True))}
-            ordered = sorted(now.items(), key=lambda x: x[1], reverse=True)[:10]
+
+        async def board(dim, ks_now, ks_prev, divide=1.0):
+            now = await self._ranking(guild, dim, ks_now)
+            prev = await self._ranking(guild, dim, ks_prev)
             rows = []
-            for i, (mid, val) in enumerate(ordered):
-                m = guild.get_member(int(mid)) if mid.isdigit() else None
-                pr = prev_rank.get(mid)
+            for i, (mid, val) in enumerate(now.top(10)):
+                pr = prev.rank(mid)
                 rows.append({
                     "rank": i + 1,
                     "id": mid,
-                    "name": m.display_name if m else mid,
+                    "name": self._name(guild, "member", mid) if mid.isdigit() else mid,
                     "value": round(val / divide, 2) if divide != 1 else int(val),
                     "change": (pr - (i + 1)) if pr else None,  # +N = moved up, None = new
                 })
             return rows
 
         return {
-            "messages": board(mem, this_keys, prev_keys),
-            "voice": board(vmem, this_keys, prev_keys, divide=60.0),
+            "messages": await board("msg_members", this_keys, prev_keys),
+            "voice": await board("voice_members", this_keys, prev_keys, divide=60.0),
         }
 
     async def stats_retention(self, guild: discord.Guild) -> Dict[str, Any]:
@@ -1044,3 +1046,7 @@ class WebDashboardStats(commands.Cog):
 
         return {"d7": bucket(7), "d30": bucket(30),
                 "note": "Basiert auf den letzten 500 erfassten Beitritten."}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)